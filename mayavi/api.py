@@ -1,4 +1,13 @@
+import sys
+
+from tvtk.common import LazyModule as _LazyModule
+
 from mayavi.version import version, version as __version__
-from mayavi.core.engine import Engine
-from mayavi.core.off_screen_engine import OffScreenEngine
-from mayavi.tests.runtests import m2_tests as test
+
+# The engines and the tests are imported when first used.
+sys.modules[__name__] = _LazyModule(__name__, [
+    ('mayavi.core.engine', ['Engine']),
+    ('mayavi.core.off_screen_engine', ['OffScreenEngine']),
+    ('mayavi.core.render_farm', ['RenderFarm']),
+    ('mayavi.tests.runtests', [('test', 'm2_tests')]),
+    ], globals())
@@ -5,6 +5,15 @@ minimum and maximum value or explicitly specify the contours.  This
 component may be used for any input data.  The component also provides
 a convenient option to create "filled contours".
 
+Contours may optionally be computed progressively: a coarse subset of
+the levels is extracted first and the remaining levels are filled in
+over later iterations of the event loop.  A pending computation is
+abandoned as soon as the contour parameters change again.  For
+structured data a span space index may be used so that only the parts
+of the data spanning a contour value are contoured.  In both cases the
+extracted iso-surfaces of recently used levels are cached until the
+input data is modified.
+
 """
 # Author: Prabhu Ramachandran <prabhu_r@users.sf.net>
 # Copyright (c) 2005, Enthought, Inc.
@@ -15,14 +24,17 @@ import numpy
 
 # Enthought library imports.
 from traits.api import Instance, List, Tuple, Bool, Range, \
-                                 Float, Property
+                                 Float, Property, Int, Any
 from tvtk.api import tvtk
 
 # Local imports.
 from mayavi.core.component import Component
-from mayavi.core.common import error
+from mayavi.core.common import error, invoke_later
+from mayavi.core.lru_cache import LRUCache
+from mayavi.core.array_stats import get_array_stats
 from mayavi.components.common \
      import get_module_source, convert_to_poly_data
+from mayavi.components.span_space import SpanSpaceIndex
 
 
 ######################################################################
@@ -89,6 +101,31 @@ class Contour(Component):
     auto_update_range = Bool(True,
                              desc='if the contour range is updated automatically')
 
+    # Compute contours progressively, coarse levels first.  This keeps
+    # the UI responsive when many contours are requested on large
+    # data.  It does not apply to filled contours.
+    progressive = Bool(False, desc='if contours are computed '\
+                       'progressively, coarse levels first')
+
+    # Only contour the blocks of structured data whose range spans each
+    # contour value.  This speeds up contouring data with sparse
+    # features considerably.  It does not apply to filled contours.
+    span_space = Bool(False, desc='if only the parts of structured data '\
+                      'spanning a contour value are contoured')
+
+    # The number of cells along each axis of the blocks used when
+    # `span_space` is on.
+    span_space_block_size = Range(2, 256, 16, enter_set=True,
+                                  auto_set=False,
+                                  desc='the size of the blocks of the '\
+                                  'span space index')
+
+    # The number of contour levels extracted per iteration of the event
+    # loop when `progressive` is on.
+    contours_per_step = Range(1, 1000, 8, enter_set=True, auto_set=False,
+                              desc='the number of contours computed per '\
+                              'progressive step')
+
     ########################################
     # The component's view
 
@@ -142,13 +179,45 @@ class Contour(Component):
     _fill_cont_filt = Instance(tvtk.BandedPolyDataContourFilter, args=(),
                                kw={'clipping': 1, 'scalar_mode':'value'})
 
+    # The filter used to extract one level at a time for progressive
+    # or span space contours.
+    _level_filt = Instance(tvtk.ContourFilter, args=())
+
+    # Collects the extracted levels into the output for progressive
+    # or span space contours.
+    _append = Instance(tvtk.AppendPolyData, args=())
+
+    # The recently extracted iso-surfaces keyed on the contour value.
+    _level_cache = Instance(LRUCache, kw={'max_size': 1000})
+
+    # The input modification time and filter settings for which
+    # `_level_cache` is valid.
+    _level_cache_key = Any
+
+    # The span space index of the input.
+    _span_index = Instance(SpanSpaceIndex, args=())
+
+    # The contour values still to be extracted.
+    _pending_levels = List
+
+    # Are the extracted levels cached.  They are not when more levels
+    # are asked for than the cache holds, as they would only push each
+    # other out of it.
+    _cache_levels = Bool(True)
+
+    # Incremented every time a progressive computation is started or
+    # abandoned.  A pending computation stops once this changes.
+    _generation = Int(0)
+
     ######################################################################
     # `object` interface
     ######################################################################
     def __get_pure_state__(self):
         d = super(Contour, self).__get_pure_state__()
         # These traits are dynamically created.
-        for name in ('_data_min', '_data_max', '_default_contour'):
+        for name in ('_data_min', '_data_max', '_default_contour',
+                     '_level_cache', '_level_cache_key', '_pending_levels',
+                     '_generation', '_cache_levels'):
             d.pop(name, None)
 
         return d
@@ -176,7 +245,7 @@ class Contour(Component):
             self.contours = [(cr[0] + cr[1])/2]
             self.minimum_contour = cr[0]
             self.maximum_contour = cr[1]
-        self.outputs = [cf.output]
+        self.outputs = [self._get_output()]
 
     def update_data(self):
         """Override this method to do what is necessary when upstream
@@ -186,15 +255,32 @@ class Contour(Component):
         sends a `data_changed` event.
         """
         self._update_ranges()
+        if self._use_levels() and \
+               self._level_cache_key != self._get_level_cache_key():
+            # The cached levels are stale, recompute them.
+            self._auto_contours_changed(self.auto_contours)
         # Propagage the data changed event.
         self.data_changed = True
 
+    ######################################################################
+    # `Contour` interface
+    ######################################################################
+    def finish_contours(self):
+        """Synchronously compute any pending progressive contour
+        levels.  This is useful in scripts that need the complete
+        output before the event loop gets a chance to run.
+        """
+        self._progressive_step(self._generation, len(self._pending_levels))
+
     ######################################################################
     # Non-public methods.
     ######################################################################
     def _contours_items_changed(self, list_event):
         if self.auto_contours or not self._has_input():
             return
+        if self._use_levels():
+            self._start_levels(self.contours)
+            return
         cf = self.contour_filter
         added, removed, index = (list_event.added, list_event.removed,
                                  list_event.index)
@@ -208,6 +294,11 @@ class Contour(Component):
     def _contours_changed(self, values):
         if self.auto_contours or not self._has_input():
             return
+        if self._use_levels():
+            self._start_levels(values)
+            return
+        # Abandon any pending progressive computation.
+        self._generation += 1
         cf = self.contour_filter
         cf.number_of_contours = len(values)
         for i, x in enumerate(values):
@@ -223,13 +314,7 @@ class Contour(Component):
         src = get_module_source(self.inputs[0])
         sc = src.outputs[0].point_data.scalars
         if sc is not None:
-            sc_array = sc.to_array()
-            has_nan = numpy.isnan(sc_array).any()
-            if has_nan:
-                rng = (float(numpy.nanmin(sc_array)),
-                       float(numpy.nanmax(sc_array)))
-            else:
-                rng = sc.range
+            rng = tuple(get_array_stats(sc).range) or (0.0, 1.0)
         else:
             error('Cannot contour: No scalars in input data!')
             rng = (0.0, 1.0)
@@ -254,6 +339,17 @@ class Contour(Component):
         else:
             self._contours_changed(self.contours)
 
+    def _progressive_changed(self, value):
+        self._filled_contours_changed(self.filled_contours)
+
+    def _span_space_changed(self, value):
+        self._filled_contours_changed(self.filled_contours)
+
+    def _span_space_block_size_changed(self, value):
+        self._span_index.block_size = value
+        if self.span_space:
+            self._filled_contours_changed(self.filled_contours)
+
     def _auto_update_range_changed(self, value):
         if value:
             rng = self._data_min, self._data_max
@@ -270,18 +366,126 @@ class Contour(Component):
             return
         if self.auto_contours:
             minc, maxc = self.minimum_contour, self.maximum_contour
+            if self._use_levels():
+                levels = numpy.linspace(min(minc, maxc), max(minc, maxc),
+                                        self.number_of_contours)
+                self._start_levels(levels)
+                return
+            # Abandon any pending progressive computation.
+            self._generation += 1
             self.contour_filter.generate_values(self.number_of_contours,
                                                 min(minc, maxc),
                                                 max(minc, maxc))
             self.data_changed = True
 
+    def _use_levels(self):
+        """Returns if the contours are currently extracted one level at
+        a time.
+        """
+        return (self.progressive or self.span_space) and \
+               not self.filled_contours
+
+    def _get_output(self):
+        """Returns the output dataset of this component."""
+        if self._use_levels():
+            return self._append.output
+        else:
+            return self.contour_filter.output
+
+    def _get_level_cache_key(self):
+        """Returns the key for which the cached levels are valid."""
+        cf = self._cont_filt
+        return (self.inputs[0].outputs[0].m_time, cf.compute_scalars,
+                cf.compute_normals, cf.compute_gradients, self.span_space,
+                self.span_space_block_size)
+
+    def _start_levels(self, levels):
+        """Starts computing the given contour levels, abandoning any
+        computation that is still pending.  Unless `progressive` is on
+        all the levels are computed right away.
+        """
+        self._generation += 1
+        generation = self._generation
+
+        key = self._get_level_cache_key()
+        cache = self._level_cache
+        if key != self._level_cache_key:
+            cache.clear()
+            self._level_cache_key = key
+            cf, lf = self._cont_filt, self._level_filt
+            lf.set(compute_scalars=cf.compute_scalars,
+                   compute_normals=cf.compute_normals,
+                   compute_gradients=cf.compute_gradients)
+        values = [float(levels[i]) for i in progressive_order(len(levels))]
+        self._cache_levels = len(values) <= cache.max_size
+
+        self._pending_levels = values
+        append = self._append
+        append.remove_all_inputs()
+        if len(values) == 0:
+            append.add_input(tvtk.PolyData())
+            append.update()
+            self.data_changed = True
+        elif not self.progressive:
+            self.finish_contours()
+        elif self._progressive_step(generation):
+            # The coarsest levels are computed right away so the output
+            # is never empty, the rest are done later.
+            invoke_later(self._progressive_tick, generation)
+
+    def _progressive_tick(self, generation):
+        if self._progressive_step(generation):
+            invoke_later(self._progressive_tick, generation)
+
+    def _progressive_step(self, generation, count=None):
+        """Extracts the next `count` (by default `contours_per_step`)
+        pending levels and adds them to the output.  Returns True if
+        more levels remain to be computed.
+        """
+        if generation != self._generation or not self._has_input() \
+               or len(self._pending_levels) == 0:
+            return False
+        n = count or self.contours_per_step
+        values = self._pending_levels[:n]
+        self._pending_levels = self._pending_levels[n:]
+        append = self._append
+        for value in values:
+            append.add_input(self._get_level_surface(value))
+        append.update()
+        self.data_changed = True
+        return len(self._pending_levels) > 0
+
+    def _get_level_surface(self, value):
+        """Returns the (cached) iso-surface for the given contour
+        value.
+        """
+        cache = self._level_cache
+        pd = cache.get(value)
+        if pd is None:
+            lf = self._level_filt
+            inp = self.inputs[0].outputs[0]
+            if self.span_space and self._span_index.supports(inp):
+                pd = self._span_index.contour(inp, value, lf)
+            else:
+                lf.number_of_contours = 1
+                lf.set_value(0, value)
+                lf.update()
+                # The contour filter allocates fresh points and cells
+                # every time it executes, so a shallow copy is safe to
+                # keep.
+                pd = tvtk.PolyData()
+                pd.shallow_copy(lf.output)
+            if self._cache_levels:
+                cache[value] = pd
+        return pd
+
     def _filled_contours_changed(self, val):
         if not self._has_input():
             return
-        cf = self._set_contour_input()
+        self._set_contour_input()
         # This will trigger a change.
         self._auto_contours_changed(self.auto_contours)
-        self.outputs = [cf.output]
+        self.outputs = [self._get_output()]
 
     def _get_contour_filter(self):
         if self.filled_contours:
@@ -295,6 +499,7 @@ class Contour(Component):
         """
         inp = self.inputs[0].outputs[0]
         cf = self.contour_filter
+        self._level_filt.input = inp
         if self.filled_contours:
             inp = convert_to_poly_data(inp)
         cf.input = inp
@@ -326,3 +531,26 @@ class Contour(Component):
     def _get__default_contour(self):
         return (self._data_min + self._data_max)*0.5
 
+
+
+def progressive_order(n):
+    """Returns the indices `0 ... n-1` ordered from coarse to fine, i.e.
+    the end points first followed by successive bisections of the
+    range.  Any prefix of the result is therefore spread evenly over
+    the whole range.
+    """
+    seen = numpy.zeros(n, dtype=bool)
+    order = []
+    step = 1
+    while step < n:
+        step *= 2
+    first = numpy.unique(numpy.array([0, n - 1]))[:n]
+    seen[first] = True
+    order.append(first)
+    while step >= 1:
+        idx = numpy.arange(0, n, step)
+        idx = idx[~seen[idx]]
+        seen[idx] = True
+        order.append(idx)
+        step //= 2
+    return numpy.concatenate(order)
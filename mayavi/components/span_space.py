@@ -0,0 +1,196 @@
+"""A span space index for contouring structured data.
+
+The scalars of a structured dataset (image data, rectilinear or
+structured grids) are split into blocks of cells and the range of the
+scalars in each block is recorded.  To extract an iso-surface only the
+blocks whose range spans the contour value are contoured.  For sparse
+features this touches a small fraction of the data.  The index is
+rebuilt only when the dataset is modified.
+
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import numpy
+
+# Enthought library imports.
+from traits.api import HasTraits, Int, Float, Any, Instance
+from tvtk.api import tvtk
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def block_reduce(data, block_size, func):
+    """Reduces the 3D array `data` of point values over blocks of
+    `block_size` cells along each axis with the ufunc `func` (for
+    example `numpy.fmin`).  Neighbouring blocks share their boundary
+    points, so the reduction includes them in both blocks.
+    """
+    result = data
+    for axis in range(3):
+        n = result.shape[axis]
+        starts = numpy.arange(0, max(n - 1, 1), block_size)
+        reduced = func.reduceat(result, starts, axis=axis)
+        if len(starts) > 1:
+            # Fold in the first point plane of the next block.
+            boundary = numpy.take(result, starts[1:], axis=axis)
+            index = [slice(None)]*3
+            index[axis] = slice(0, len(starts) - 1)
+            index = tuple(index)
+            reduced[index] = func(reduced[index], boundary)
+        result = reduced
+    return result
+
+
+def get_active_runs(active):
+    """Given a 3D boolean array of active blocks ordered as (k, j, i),
+    returns an array of (k, j, i_start, i_end) rows, one for every run
+    of consecutive active blocks along the i axis.  `i_end` is
+    exclusive.
+    """
+    nk, nj, ni = active.shape
+    rows = numpy.zeros((nk*nj, ni + 2), dtype=numpy.int8)
+    rows[:, 1:-1] = active.reshape(nk*nj, ni)
+    edges = numpy.diff(rows, axis=1)
+    starts = numpy.argwhere(edges == 1)
+    ends = numpy.argwhere(edges == -1)
+    k, j = divmod(starts[:, 0], nj)
+    return numpy.column_stack((k, j, starts[:, 1], ends[:, 1]))
+
+
+######################################################################
+# `SpanSpaceIndex` class.
+######################################################################
+class SpanSpaceIndex(HasTraits):
+
+    # The number of cells along each axis of a block.
+    block_size = Int(16)
+
+    # When more than this fraction of the blocks spans a contour value
+    # the whole dataset is contoured in one go instead.
+    max_active_fraction = Float(0.25)
+
+    # The number of blocks spanning the contour value of the last
+    # lookup.  This is -1 if the whole dataset had to be contoured.
+    active_blocks = Int(-1)
+
+    ########################################
+    # Private traits.
+
+    # The minimum and maximum of the scalars in each block.
+    _block_min = Any
+    _block_max = Any
+
+    # The dataset modification time and block size the index was built
+    # for.
+    _key = Any
+
+    # The filter used to extract blocks from the dataset.
+    _extract = Instance(tvtk.Object)
+
+    # Joins the contours of the blocks.
+    _append = Instance(tvtk.AppendPolyData, args=())
+
+    ######################################################################
+    # `SpanSpaceIndex` interface
+    ######################################################################
+    def supports(self, dataset):
+        """Returns if the dataset can be indexed."""
+        return isinstance(dataset, (tvtk.ImageData, tvtk.StructuredGrid,
+                                    tvtk.RectilinearGrid)) and \
+               dataset.point_data.scalars is not None
+
+    def update(self, dataset):
+        """(Re)builds the index if the dataset has been modified since
+        the index was last built.
+        """
+        key = (dataset.m_time, self.block_size)
+        if key == self._key:
+            return
+        scalars = dataset.point_data.scalars.to_array()
+        if scalars.ndim > 1:
+            scalars = scalars[:, 0]
+        dims = dataset.dimensions
+        data = scalars.reshape(dims[2], dims[1], dims[0])
+        bs = self.block_size
+        self._block_min = block_reduce(data, bs, numpy.fmin)
+        self._block_max = block_reduce(data, bs, numpy.fmax)
+        self._key = key
+
+    def get_active_extents(self, dataset, value):
+        """Returns a list of VOI extents covering the blocks whose
+        range spans `value`.  Returns None if too many blocks span the
+        value for the index to be useful.
+        """
+        self.update(dataset)
+        active = (self._block_min <= value) & (self._block_max >= value)
+        n_active = active.sum()
+        if n_active > self.max_active_fraction*active.size:
+            return None
+        self.active_blocks = int(n_active)
+        if n_active == 0:
+            return []
+        bs = self.block_size
+        dims = dataset.dimensions
+        e = dataset.extent
+        extents = []
+        for k, j, i0, i1 in get_active_runs(active):
+            extents.append((e[0] + i0*bs, e[0] + min(i1*bs, dims[0] - 1),
+                            e[2] + j*bs, e[2] + min((j + 1)*bs, dims[1] - 1),
+                            e[4] + k*bs, e[4] + min((k + 1)*bs, dims[2] - 1)))
+        return extents
+
+    def contour(self, dataset, value, contour_filter):
+        """Contours `dataset` at `value` using the given contour filter
+        on the blocks that span the value and returns the resulting
+        poly data.  The input of the contour filter is reset to
+        `dataset` once done.
+        """
+        extents = self.get_active_extents(dataset, value)
+        contour_filter.number_of_contours = 1
+        contour_filter.set_value(0, value)
+        if extents is None:
+            self.active_blocks = -1
+            contour_filter.input = dataset
+            contour_filter.update()
+            return self._copy(contour_filter.output)
+
+        output = tvtk.PolyData()
+        if len(extents) > 0:
+            extract = self._get_extractor(dataset)
+            extract.input = dataset
+            append = self._append
+            append.remove_all_inputs()
+            contour_filter.input = extract.output
+            for voi in extents:
+                extract.voi = voi
+                contour_filter.update()
+                append.add_input(self._copy(contour_filter.output))
+            append.update()
+            output.shallow_copy(append.output)
+            append.remove_all_inputs()
+        contour_filter.input = dataset
+        return output
+
+    ######################################################################
+    # Non-public interface
+    ######################################################################
+    def _copy(self, data):
+        # Filters allocate fresh points and cells every time they
+        # execute, so a shallow copy is safe to keep.
+        pd = tvtk.PolyData()
+        pd.shallow_copy(data)
+        return pd
+
+    def _get_extractor(self, dataset):
+        if isinstance(dataset, tvtk.ImageData):
+            klass = tvtk.ExtractVOI
+        elif isinstance(dataset, tvtk.RectilinearGrid):
+            klass = tvtk.ExtractRectilinearGrid
+        else:
+            klass = tvtk.ExtractGrid
+        if not isinstance(self._extract, klass):
+            self._extract = klass()
+        return self._extract
@@ -31,6 +31,15 @@ view = View(Group(Item(name='filled_contours',
                       Item(name='maximum_contour'),
                       visible_when='auto_contours',
                   ),
+                  Group(
+                      Item(name='progressive'),
+                      Item(name='contours_per_step',
+                           enabled_when='progressive'),
+                      Item(name='span_space'),
+                      Item(name='span_space_block_size',
+                           enabled_when='span_space'),
+                      visible_when='not filled_contours',
+                  ),
 
                   Item(name='auto_update_range'),
                   Group(
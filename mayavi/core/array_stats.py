@@ -0,0 +1,121 @@
+"""A cache of reductions (range, NaN count and histograms) of the data
+arrays of datasets.
+
+Several objects need the range of the same array: the module manager
+sets up its lookup tables with it, and the threshold filter and the
+contour component use it to limit their values.  Arrays holding NaNs
+have to be scanned with NumPy to find their range.  The results are
+cached here, keyed on the array and its modification time, so an array
+is only scanned again when it has changed.
+
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import numpy
+
+# Enthought library imports.
+from tvtk.api import tvtk
+
+# Local imports.
+from mayavi.core.lru_cache import LRUCache
+
+# The cached statistics, keyed on the array, its modification time and
+# whether the magnitudes of the tuples are used.
+_cache = LRUCache(max_size=64)
+
+
+######################################################################
+# `ArrayStats` class.
+######################################################################
+class ArrayStats(object):
+    """The reductions of a data array.  `min` and `max` ignore NaNs and
+    are None for an empty array or one holding only NaNs.
+    """
+
+    def __init__(self, min, max, n_nan, size):
+        self.min = min
+        self.max = max
+        self.n_nan = n_nan
+        self.size = size
+        # The histograms computed so far, keyed on the number of bins.
+        self.histograms = {}
+
+    def _get_range(self):
+        if self.min is None:
+            return []
+        return [self.min, self.max]
+
+    range = property(_get_range, None, None,
+                     "The range as a list, empty if there is no data.")
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def _get_values(array, magnitude):
+    """Returns the values of `array` the statistics are computed on."""
+    values = array.to_array()
+    if magnitude and values.ndim > 1:
+        values = numpy.sqrt((values*values).sum(axis=1))
+    return values
+
+def _compute_stats(array, magnitude):
+    values = _get_values(array, magnitude)
+    n_nan = 0
+    if values.dtype.kind in 'fc':
+        n_nan = int(numpy.isnan(values).sum())
+    if values.size == n_nan:
+        return ArrayStats(None, None, n_nan, values.size)
+    if n_nan > 0:
+        rng = float(numpy.nanmin(values)), float(numpy.nanmax(values))
+    elif magnitude:
+        rng = float(values.min()), float(values.max())
+    else:
+        # VTK caches the range of the array, no need to scan it.
+        rng = tuple(array.range)
+    return ArrayStats(rng[0], rng[1], n_nan, values.size)
+
+def _get_key(array, magnitude):
+    vtk_array = tvtk.to_vtk(array)
+    return (vtk_array.GetAddressAsString('vtkObject'),
+            vtk_array.GetMTime(), magnitude)
+
+def get_array_stats(array, magnitude=False):
+    """Returns the `ArrayStats` of a tvtk data array.  If `magnitude`
+    is True, the statistics are of the magnitudes of the tuples.
+
+    The statistics are cached until the array is modified, so calling
+    this repeatedly does not scan the array again.
+    """
+    key = _get_key(array, magnitude)
+    stats = _cache.get(key)
+    if stats is None:
+        stats = _compute_stats(array, magnitude)
+        _cache[key] = stats
+    return stats
+
+def get_histogram(array, bins=64, magnitude=False):
+    """Returns the histogram of the (finite) values of a tvtk data
+    array over its range, as a tuple of the counts and the bin edges
+    (see `numpy.histogram`).  The histogram is cached along with the
+    statistics of the array.
+    """
+    stats = get_array_stats(array, magnitude)
+    hist = stats.histograms.get(bins)
+    if hist is None:
+        values = _get_values(array, magnitude).ravel()
+        if stats.n_nan > 0:
+            values = values[~numpy.isnan(values)]
+        if stats.min is None:
+            hist = numpy.histogram(values, bins, range=(0.0, 1.0))
+        else:
+            hist = numpy.histogram(values, bins,
+                                   range=(stats.min, stats.max))
+        stats.histograms[bins] = hist
+    return hist
+
+def clear_cache():
+    """Discards all the cached statistics."""
+    _cache.clear()
@@ -0,0 +1,199 @@
+"""Runs the update of a VTK algorithm on a worker thread, reporting its
+progress and allowing it to be cancelled.
+
+The algorithm is given a detached shallow copy of its input, so the
+rest of the pipeline is not executed on the worker thread.  When the
+update is done, a detached copy of the output is handed to a callback
+on the UI thread.  VTK holds the Python global interpreter lock while
+an algorithm executes, so the worker briefly releases it on every
+progress event to let the UI process its events.
+
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import threading
+import time
+import traceback
+
+# Enthought library imports.
+from traits.api import HasTraits, Range, Bool, Button, Any, Str, Int
+from traitsui.api import View, Group, Item
+
+# Local imports.
+from mayavi.core import common
+from mayavi.core.common import invoke_later, error
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def detached_copy(dataset):
+    """Returns a shallow copy of the tvtk `dataset` that is not
+    connected to the pipeline that produced it.
+    """
+    copy = dataset.new_instance()
+    copy.shallow_copy(dataset)
+    return copy
+
+
+######################################################################
+# `BackgroundExecution` class.
+######################################################################
+class BackgroundExecution(HasTraits):
+    """Updates a VTK algorithm on a worker thread.
+
+    Without a UI the algorithm is simply updated right away.
+    """
+
+    # The progress of the current execution.
+    progress = Range(0.0, 1.0, 0.0)
+
+    # The text of the algorithm's progress, if any.
+    progress_text = Str
+
+    # Is an execution running.
+    executing = Bool(False)
+
+    # Cancels the current execution.
+    cancel = Button('Cancel')
+
+    view = View(Group(Item(name='progress', style='readonly'),
+                      Item(name='progress_text', style='readonly',
+                           show_label=False),
+                      Item(name='cancel', show_label=False,
+                           enabled_when='executing')))
+
+    ########################################
+    # Private traits.
+
+    # The algorithm of the current execution.
+    _algorithm = Any
+
+    # The (algorithm, input, callback) of an execution requested while
+    # another one was running.
+    _pending = Any
+
+    # The execution requests are numbered so that results of cancelled
+    # executions are ignored.
+    _generation = Int(0)
+
+    # Called once a cancelled execution has stopped, see `stop`.
+    _when_stopped = Any
+
+    ######################################################################
+    # `BackgroundExecution` interface
+    ######################################################################
+    def execute(self, algorithm, input, callback):
+        """Sets the input of `algorithm` to a copy of the dataset
+        `input`, updates it and calls `callback` with a copy of its
+        output.  The callback is called on the UI thread.  If an
+        execution is running it is aborted and this one starts once it
+        has stopped.
+        """
+        if hasattr(input, 'update'):
+            input.update()
+        copy = detached_copy(input)
+        if common.pyface is None:
+            self._set_input(algorithm, copy)
+            algorithm.update()
+            callback(detached_copy(algorithm.output))
+            return
+        self._generation += 1
+        self._when_stopped = None
+        if self.executing:
+            self._pending = (algorithm, copy, callback)
+            self._abort()
+            return
+        self._start(algorithm, copy, callback)
+
+    def stop(self, callback):
+        """Cancels the current execution and calls `callback` on the UI
+        thread once the worker is done with the algorithm, right away if
+        no execution is running.
+        """
+        if not self.executing:
+            callback()
+            return
+        self._cancel_fired()
+        self._when_stopped = callback
+
+    ######################################################################
+    # Non-public interface
+    ######################################################################
+    def _cancel_fired(self):
+        self._generation += 1
+        self._pending = None
+        self._abort()
+
+    def _abort(self):
+        algorithm = self._algorithm
+        if algorithm is not None:
+            algorithm._vtk_obj.SetAbortExecute(1)
+
+    def _set_input(self, algorithm, input):
+        # The VTK object is used so that listeners of the algorithm's
+        # traits are not notified: the input is only a copy.
+        algorithm._vtk_obj.SetInput(input._vtk_obj)
+
+    def _start(self, algorithm, input, callback):
+        self._algorithm = algorithm
+        algorithm._vtk_obj.SetAbortExecute(0)
+        self._set_input(algorithm, input)
+        self.set(progress=0.0, progress_text='', executing=True)
+        thread = threading.Thread(target=self._run,
+                                  args=(algorithm, callback,
+                                        self._generation))
+        thread.daemon = True
+        thread.start()
+
+    def _run(self, algorithm, callback, generation):
+        """Runs on the worker thread."""
+        vtk_obj = algorithm._vtk_obj
+        def on_progress(obj, event):
+            invoke_later(self._set_progress, obj.GetProgress(),
+                         obj.GetProgressText() or '', generation)
+            # Let the UI thread run.
+            time.sleep(0)
+        tag = vtk_obj.AddObserver('ProgressEvent', on_progress)
+        output = message = None
+        try:
+            try:
+                vtk_obj.Update()
+                if not vtk_obj.GetAbortExecute():
+                    output = detached_copy(algorithm.output)
+            except Exception:
+                message = 'Error executing %s in the background:\n%s'%\
+                          (vtk_obj.GetClassName(), traceback.format_exc())
+        finally:
+            vtk_obj.RemoveObserver(tag)
+        invoke_later(self._finished, callback, output, message, generation)
+
+    def _set_progress(self, progress, text, generation):
+        if generation == self._generation:
+            self.set(progress=min(max(progress, 0.0), 1.0),
+                     progress_text=text)
+
+    def _finished(self, callback, output, message, generation):
+        """Called on the UI thread when an execution is done."""
+        self._algorithm._vtk_obj.SetAbortExecute(0)
+        self._algorithm = None
+        self.executing = False
+        pending = self._pending
+        if pending is not None:
+            self._pending = None
+            self._start(*pending)
+            return
+        when_stopped = self._when_stopped
+        if when_stopped is not None:
+            self._when_stopped = None
+            when_stopped()
+            return
+        if generation != self._generation:
+            return
+        if message is not None:
+            error(message)
+        elif output is not None:
+            self.progress = 1.0
+            callback(output)
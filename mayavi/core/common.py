@@ -73,6 +73,34 @@ def process_ui_events():
     if pyface is not None:
         pyface.GUI.process_events()
 
+# Calls deferred by `invoke_later` when no UI is running.
+_later_calls = []
+_draining_later_calls = False
+
+def invoke_later(callable, *args, **kw):
+    """Invoke the callable on a later iteration of the GUI event loop.
+
+    When no UI is running the call is made right away.  Calls that are
+    deferred while another deferred call is running are queued and
+    made once it returns, so a callable may safely reschedule itself
+    without growing the stack.
+    """
+    global _draining_later_calls
+    if pyface is not None:
+        pyface.GUI.invoke_later(callable, *args, **kw)
+        return
+    _later_calls.append((callable, args, kw))
+    if _draining_later_calls:
+        return
+    _draining_later_calls = True
+    try:
+        while len(_later_calls) > 0:
+            func, a, k = _later_calls.pop(0)
+            func(*a, **k)
+    finally:
+        _draining_later_calls = False
+        del _later_calls[:]
+
 def get_engine(obj):
     """Try and return the engine given an object in the mayavi
     pipeline.  This basically walks up the parent's of the object till
@@ -10,6 +10,7 @@ from traits.api import List
 
 # Local imports.
 from mayavi.core.pipeline_base import PipelineBase
+from mayavi.core.propagation import propagator
 
 
 ######################################################################
@@ -146,10 +147,6 @@ class Component(PipelineBase):
 
     def _setup_events(self, removed, added):
         for object in removed:
-            object.on_trait_event(self.update_pipeline, 'pipeline_changed',
-                                  remove=True)
-            object.on_trait_event(self.update_data, 'data_changed',
-                                  remove=True)
+            propagator.disconnect(object, self)
         for object in added:
-            object.on_trait_event(self.update_pipeline, 'pipeline_changed')
-            object.on_trait_event(self.update_data, 'data_changed')
+            propagator.connect(object, self)
@@ -27,6 +27,8 @@ from apptools.scripting.api import Recorder, recordable
 from mayavi.core.base import Base
 from mayavi.core.scene import Scene
 from mayavi.core.common import error, process_ui_events
+from mayavi.core.profiler import Profiler
+from mayavi.core import session
 from mayavi.core.registry import registry
 from mayavi.core.adder_node import AdderNode, SceneAdderNode
 from mayavi.preferences.api import preference_manager
@@ -103,6 +105,14 @@ class Engine(HasStrictTraits):
     # The recorder for script recording.
     recorder = Instance(Recorder, record=False)
 
+    # Record the time spent updating the pipeline, executing VTK
+    # filters, converting arrays and rendering.  The results are
+    # available from `profiler`.
+    profiling = Bool(False, record=False)
+
+    # The profiler used when `profiling` is on.
+    profiler = Instance(Profiler, (), record=False)
+
     ########################################
     # Private traits.
 
@@ -137,7 +147,7 @@ class Engine(HasStrictTraits):
         d = self.__dict__.copy()
         for x in ['_current_scene', '_current_object',
                   '__sync_trait__', '_viewer_ref',
-                  '__traits_listener__']:
+                  '__traits_listener__', 'profiling', 'profiler']:
             d.pop(x, None)
         return d
 
@@ -177,6 +187,7 @@ class Engine(HasStrictTraits):
 
     def stop(self):
         registry.unregister_engine(self)
+        self.profiling = False
         self.running = False
 
     @recordable
@@ -282,6 +293,29 @@ class Engine(HasStrictTraits):
             # Reset the warning state.
             o.SetGlobalWarningDisplay(w)
 
+    @recordable
+    def save_session(self, dirname):
+        """Saves the current visualization to the session directory
+        `dirname`.  The data of the sources is saved as separate
+        arrays, only the arrays that changed since the session was
+        last saved are written.
+        """
+        o = vtk.vtkObject
+        w = o.GetGlobalWarningDisplay()
+        o.SetGlobalWarningDisplay(0) # Turn it off.
+        try:
+            session.save_session(self, dirname)
+        finally:
+            # Reset the warning state.
+            o.SetGlobalWarningDisplay(w)
+
+    @recordable
+    def load_session(self, dirname):
+        """Loads the visualization saved in the session directory
+        `dirname`.  The arrays of the data are memory mapped.
+        """
+        session.load_session(self, dirname)
+
     @recordable
     def open(self, filename, scene=None):
         """Open a file given a filename if possible in either the
@@ -569,6 +603,12 @@ class Engine(HasStrictTraits):
         """
         self.trait_property_changed('children_ui_list', old, new)
 
+    def _profiling_changed(self, value):
+        if value:
+            self.profiler.start(self)
+        else:
+            self.profiler.stop()
+
     def _recorder_changed(self, old, new):
         if new is not None:
             new.record('# Recorded script from Mayavi2')
@@ -0,0 +1,134 @@
+"""Detection of the format of data files from their contents, and a
+cache of the readers of file data sources.
+
+`sniff_format` looks at the first bytes of a file for the signature of
+a format the file sources read, so files without (or with a misleading)
+extension can still be opened.  `ReaderCache` only makes the tvtk
+readers a source actually uses, instead of one of every kind up front.
+
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import struct
+from os.path import getsize
+
+# Enthought library imports.
+from tvtk.api import tvtk
+
+# The number of bytes read from the start of a file to sniff its format.
+HEADER_SIZE = 512
+
+# The signatures of the formats as (offset, magic bytes, format) tuples.
+# The formats are named by the file extension of the format.
+SIGNATURES = [(0, '\x89PNG\r\n\x1a\n', 'png'),
+              (0, '\xff\xd8\xff', 'jpg'),
+              (0, 'II*\x00', 'tiff'),
+              (0, 'MM\x00*', 'tiff'),
+              (128, 'DICM', 'dcm'),
+              (0, 'IMGF', 'ximg'),
+              (0, 'ply\n', 'ply'),
+              (0, 'ply\r\n', 'ply'),
+              (0, '# vtk DataFile', 'vtk'),
+              (0, '#VRML V2.0', 'wrl'),
+              (0, 'BM', 'bmp'),
+             ]
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def is_binary_stl(header, size):
+    """Binary STL files have an 80 byte header, a triangle count and
+    50 bytes per triangle.
+    """
+    if len(header) < 84:
+        return False
+    n = struct.unpack('<I', header[80:84])[0]
+    return size == 84 + 50*n
+
+def sniff_format(filename):
+    """Returns the format of the file `filename` found from its first
+    bytes, as the usual extension of the format (for example 'png' or
+    'vtk'), or None if the format is not recognized or the file cannot
+    be read.
+    """
+    try:
+        f = open(filename, 'rb')
+        try:
+            header = f.read(HEADER_SIZE)
+        finally:
+            f.close()
+        size = getsize(filename)
+    except (IOError, OSError):
+        return None
+
+    for offset, magic, format in SIGNATURES:
+        if header[offset:offset + len(magic)] == magic:
+            return format
+    if is_binary_stl(header, size):
+        return 'stl'
+    text = header.lstrip()
+    if text.startswith('solid') and 'facet' in text:
+        return 'stl'
+    if text.startswith('<') and '<VTKFile' in text:
+        return 'xml'
+    if text.startswith('ObjectType') or text.startswith('NDims'):
+        return 'mha'
+    if header[:1] == 'P' and header[1:2] in '123456' and \
+       header[2:3].isspace():
+        return 'pnm'
+    return None
+
+
+######################################################################
+# `ReaderCache` class.
+######################################################################
+class ReaderCache(object):
+    """Makes the readers of a file data source on demand.
+
+    `classes` maps file formats (extensions) to the reader classes
+    reading them, given as classes or as the names of tvtk classes.  A
+    reader is only made the first time a file of its format is read and
+    is then reused, one per reader class, so formats read by the same
+    class share a reader.
+    """
+
+    def __init__(self, classes):
+        self.classes = dict(classes)
+        self._readers = {}
+
+    def __contains__(self, format):
+        return self.get_class(format) is not None
+
+    def get_class(self, format):
+        """Returns the class reading `format`, or None if there is none
+        or it is not available in this VTK.
+        """
+        klass = self.classes.get(format)
+        if isinstance(klass, basestring):
+            klass = getattr(tvtk, klass, None)
+        return klass
+
+    def get(self, format):
+        """Returns the reader of `format`, or None."""
+        klass = self.get_class(format)
+        if klass is None:
+            return None
+        reader = self._readers.get(klass)
+        if reader is None:
+            reader = klass()
+            self._readers[klass] = reader
+        return reader
+
+    def get_reader(self, filename):
+        """Returns the reader of `filename` chosen by its extension or,
+        failing that, by its contents, or None.
+        """
+        extension = filename.strip().split('.')[-1].lower()
+        if extension not in self:
+            format = sniff_format(filename.strip())
+            if format is not None:
+                extension = format
+        return self.get(extension)
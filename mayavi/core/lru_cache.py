@@ -0,0 +1,61 @@
+"""A simple least recently used (LRU) cache.
+
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+from collections import OrderedDict
+
+
+######################################################################
+# `LRUCache` class.
+######################################################################
+class LRUCache(object):
+    """A mapping that holds at most `max_size` items.  When full, the
+    least recently used item is discarded to make room for a new one.
+    Both looking up and storing an item count as a use.
+    """
+
+    def __init__(self, max_size=100):
+        self.max_size = max_size
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __getitem__(self, key):
+        value = self._data.pop(key)
+        self._data[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        data = self._data
+        data.pop(key, None)
+        data[key] = value
+        while len(data) > self.max_size:
+            data.popitem(last=False)
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def get(self, key, default=None):
+        """Returns the value for `key` (marking it as used) or
+        `default` if it is not cached.
+        """
+        if key in self._data:
+            return self[key]
+        return default
+
+    def keys(self):
+        """Returns the keys from the least to the most recently
+        used.
+        """
+        return self._data.keys()
+
+    def clear(self):
+        """Removes all the items."""
+        self._data.clear()
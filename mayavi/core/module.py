@@ -12,6 +12,7 @@ from traits.api import List, Instance, Str
 from mayavi.core.pipeline_base import PipelineBase
 from mayavi.core.pipeline_info import PipelineInfo
 from mayavi.core.common import exception
+from mayavi.core.propagation import propagator
 
 
 ######################################################################
@@ -197,18 +198,14 @@ class Module(PipelineBase):
         mm = self.module_manager
         src = mm.source
         mm.on_trait_change(self.update_pipeline, 'source')
-        src.on_trait_event(self.update_pipeline, 'pipeline_changed')
-        src.on_trait_event(self.update_data, 'data_changed')
+        propagator.connect(src, self)
 
     def _teardown_event_handlers(self):
         mm = self.module_manager
         src = mm.source
         mm.on_trait_change(self.update_pipeline, 'source',
                            remove=True)
-        src.on_trait_event(self.update_pipeline, 'pipeline_changed',
-                           remove=True)
-        src.on_trait_event(self.update_data, 'data_changed',
-                           remove=True)
+        propagator.disconnect(src, self)
 
     def _scene_changed(self, old_scene, new_scene):
         for component in self.components:
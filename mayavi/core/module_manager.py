@@ -6,8 +6,6 @@ tables.
 # Copyright (c) 2005-2008,  Enthought, Inc.
 # License: BSD Style.
 
-import numpy
-
 # Enthought library imports.
 from traits.api import List, Instance, Trait, TraitPrefixList, \
                                  HasTraits, Str
@@ -19,6 +17,11 @@ from mayavi.core.module import Module
 from mayavi.core.lut_manager import LUTManager
 from mayavi.core.common import handle_children_state, exception
 from mayavi.core.pipeline_info import PipelineInfo
+from mayavi.core.propagation import propagator
+from mayavi.core.array_stats import get_array_stats
+
+# The methods called when the source fires its pipeline events.
+UPDATE_METHODS = {'pipeline_changed': 'update', 'data_changed': 'update'}
 
 
 ######################################################################
@@ -37,11 +40,6 @@ class DataAttributes(HasTraits):
     # The range of the data array.
     range = List
 
-    def _get_np_arr(self, arr):
-        data_array = arr.to_array()
-        data_has_nan = numpy.isnan(data_array).any()
-        return data_array, data_has_nan
-
     def compute_scalar(self, data, mode='point'):
         """Compute the scalar range from given VTK data array.  Mode
         can be 'point' or 'cell'."""
@@ -49,12 +47,7 @@ class DataAttributes(HasTraits):
             if data.name is None or len(data.name) == 0:
                 data.name = mode + '_scalars'
             self.name = data.name
-            data_array, data_has_nan = self._get_np_arr(data)
-            if data_has_nan:
-                self.range = [float(numpy.nanmin(data_array)),
-                              float(numpy.nanmax(data_array))]
-            else:
-                self.range = list(data.range)
+            self.range = get_array_stats(data).range
 
     def compute_vector(self, data, mode='point'):
         """Compute the vector range from given VTK data array.  Mode
@@ -63,11 +56,9 @@ class DataAttributes(HasTraits):
             if data.name is None or len(data.name) == 0:
                 data.name = mode + '_vectors'
             self.name = data.name
-            data_array, data_has_nan = self._get_np_arr(data)
-            if data_has_nan:
-                d_mag = numpy.sqrt((data_array*data_array).sum(axis=1))
-                self.range = [float(numpy.nanmin(d_mag)),
-                              float(numpy.nanmax(d_mag))]
+            stats = get_array_stats(data, magnitude=True)
+            if stats.n_nan > 0:
+                self.range = stats.range
             else:
                 self.range = [0.0, data.max_norm]
 
@@ -268,14 +259,10 @@ class ModuleManager(Base):
         self.update()
 
     def _setup_event_handlers(self):
-        src = self.source
-        src.on_trait_event(self.update, 'pipeline_changed')
-        src.on_trait_event(self.update, 'data_changed')
+        propagator.connect(self.source, self, UPDATE_METHODS)
 
     def _teardown_event_handlers(self):
-        src = self.source
-        src.on_trait_event(self.update, 'pipeline_changed', remove=True)
-        src.on_trait_event(self.update, 'data_changed', remove=True)
+        propagator.disconnect(self.source, self, UPDATE_METHODS)
 
     def _scene_changed(self, value):
         for obj in self.children:
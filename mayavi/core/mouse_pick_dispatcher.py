@@ -1,6 +1,10 @@
 """
 An object to register callbacks and dispatch event wiring mouse clicks
 on a scene to picking.
+
+Callbacks registered for the 'Move' button are called while the mouse
+hovers over the scene.  Hover picks use cell locators cached by the
+scene's picker so that they remain fast on large datasets.
 """
 
 # ETS imports
@@ -34,11 +38,12 @@ class MousePickDispatcher(HasTraits):
     callbacks = List(Tuple(
                         Callable,
                         Enum('cell', 'point', 'world'),
-                        Enum('Left', 'Middle', 'Right'),
+                        Enum('Left', 'Middle', 'Right', 'Move'),
                         ),
                     help="The list of callbacks, with the picker type they "
                          "should be using, and the mouse button that "
-                         "triggers them. The callback is passed "
+                         "triggers them ('Move' triggers them while the "
+                         "mouse hovers). The callback is passed "
                          "as an argument the tvtk picker."
                     )
 
@@ -50,7 +55,7 @@ class MousePickDispatcher(HasTraits):
     _mouse_no_mvt = Int
 
     # The button that has been pressed
-    _current_button = Enum('Left', 'Middle', 'Right')
+    _current_button = Enum('Left', 'Middle', 'Right', 'Move')
 
     # The various picker that are used when the mouse is pressed
     _active_pickers = Dict
@@ -67,6 +72,9 @@ class MousePickDispatcher(HasTraits):
     # The VTK callback numbers corresponding to mouse release
     _mouse_release_callback_nbs = Dict
 
+    # The VTK callback number corresponding to hovering
+    _hover_callback_nb = Int
+
     #--------------------------------------------------------------------------
     # Callbacks management
     #--------------------------------------------------------------------------
@@ -101,6 +109,12 @@ class MousePickDispatcher(HasTraits):
             self._mouse_mvt_callback_nb = \
                 self.scene.scene.interactor.add_observer(move_event,
                                                 self.on_mouse_move)
+        if button == 'Move':
+            if not self._hover_callback_nb:
+                self._hover_callback_nb = \
+                    self.scene.scene.interactor.add_observer(
+                                        'MouseMoveEvent', self.on_hover)
+            return
         if not button in self._mouse_press_callback_nbs:
             self._mouse_press_callback_nbs[button] = \
                 self.scene.scene.interactor.add_observer(
@@ -131,10 +145,15 @@ class MousePickDispatcher(HasTraits):
         # If there are no longer callbacks on the button, clean up
         # the corresponding observers.
         if not [b for c, t, b in self.callbacks if b == button]:
-            self.scene.scene.interactor.remove_observer(
-                    self._mouse_press_callback_nbs[button])
-            self.scene.scene.interactor.remove_observer(
-                    self._mouse_release_callback_nbs[button])
+            if button == 'Move':
+                self.scene.scene.interactor.remove_observer(
+                        self._hover_callback_nb)
+                self._hover_callback_nb = 0
+            else:
+                self.scene.scene.interactor.remove_observer(
+                        self._mouse_press_callback_nbs.pop(button))
+                self.scene.scene.interactor.remove_observer(
+                        self._mouse_release_callback_nbs.pop(button))
         if len(self.callbacks) == 0 and self._mouse_mvt_callback_nb:
             self.scene.scene.interactor.remove_observer(
                             self._mouse_mvt_callback_nb)
@@ -164,11 +183,33 @@ class MousePickDispatcher(HasTraits):
         """
         if self._mouse_no_mvt:
             x, y = vtk_picker.GetEventPosition()
+            scene_picker = self.scene.scene.picker
+            if scene_picker.use_locators:
+                scene_picker.update_locators()
             for picker in self._active_pickers.values():
                 picker.pick((x, y, 0), self.scene.scene.renderer)
         self._mouse_no_mvt = 0
 
 
+    def on_hover(self, vtk_picker, event):
+        """ Pick with the pickers of the hover callbacks.
+        """
+        x, y = vtk_picker.GetEventPosition()
+        types = set([t for c, t, b in self.callbacks if b == 'Move'])
+        if 'cell' in types:
+            # Locators make picking fast enough to be done on every
+            # mouse move.
+            self.scene.scene.picker.update_locators()
+        button = self._current_button
+        self._current_button = 'Move'
+        try:
+            for type in types:
+                self._active_pickers[type].pick((x, y, 0),
+                                                self.scene.scene.renderer)
+        finally:
+            self._current_button = button
+
+
     def on_pick(self, vtk_picker, event):
         """ Dispatch the pick to the callback associated with the
             corresponding mouse button.
@@ -180,7 +221,7 @@ class MousePickDispatcher(HasTraits):
                     if ( type == event_type
                                     and button == self._current_button):
                         callback(picker)
-            break
+                break
 
     #--------------------------------------------------------------------------
     # Private methods
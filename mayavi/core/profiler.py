@@ -0,0 +1,315 @@
+"""An opt-in profiler for the Mayavi pipeline.
+
+While a `Profiler` is running it records how long every pipeline
+object spends in `update_pipeline` and `update_data`, the execution
+time of the VTK algorithms in the pipeline, the number of bytes moved
+by the numpy/VTK array conversions of `tvtk.array_handler` and the
+time taken by every render.  The results can be summarized as a table
+or saved as a Chrome trace file (open it with chrome://tracing).
+
+The instrumentation is only installed while a profiler is running,
+so there is no overhead otherwise.  The usual way to use this is via
+the `profiling` trait of the engine::
+
+    engine.profiling = True
+    # ... do some work ...
+    engine.profiling = False
+    print engine.profiler.summary()
+    engine.profiler.save_trace('trace.json')
+
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import json
+import thread
+from timeit import default_timer as clock
+
+# Enthought library imports.
+from traits.api import HasTraits, Bool, Any, Dict
+from tvtk.api import tvtk
+from tvtk import array_handler
+
+# Local imports.
+from mayavi.core.pipeline_base import PipelineBase
+from mayavi.core.module_manager import ModuleManager
+
+
+# The methods timed for instances of these classes and their
+# subclasses.
+TIMED_METHODS = [(PipelineBase, ('update_pipeline', 'update_data')),
+                 (ModuleManager, ('update',))]
+
+# The running profilers.
+_profilers = []
+
+# The patched methods as (class, name, original function) tuples.
+_patched = []
+
+# The (object id, method name) of the timed calls in progress.  A
+# call made via `super` from a timed call is not timed again.
+_active_calls = set()
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def get_label(obj):
+    """Returns a label for a pipeline object."""
+    name = getattr(obj, 'name', '')
+    klass = obj.__class__.__name__
+    if len(name) > 0 and name != klass:
+        return '%s (%s)'%(name, klass)
+    return klass
+
+def _get_subclasses(klass):
+    result = [klass]
+    for sub in klass.__subclasses__():
+        for k in _get_subclasses(sub):
+            if k not in result:
+                result.append(k)
+    return result
+
+def _make_timer(func, method):
+    def timed(self, *args, **kw):
+        key = (id(self), method)
+        if key in _active_calls:
+            return func(self, *args, **kw)
+        _active_calls.add(key)
+        start = clock()
+        try:
+            return func(self, *args, **kw)
+        finally:
+            end = clock()
+            _active_calls.discard(key)
+            for profiler in _profilers:
+                profiler.record_call(self, method, start, end)
+    timed.__name__ = func.__name__
+    timed.__doc__ = func.__doc__
+    timed.original_function = func
+    return timed
+
+def _record_conversion(name, nbytes):
+    now = clock()
+    for profiler in _profilers:
+        profiler.record_conversion(name, nbytes, now)
+
+def _install():
+    """Wraps the timed methods of all the loaded pipeline classes and
+    hooks into the array conversions.
+    """
+    for root, methods in TIMED_METHODS:
+        for klass in _get_subclasses(root):
+            for method in methods:
+                func = klass.__dict__.get(method)
+                if func is None or hasattr(func, 'original_function'):
+                    continue
+                setattr(klass, method, _make_timer(func, method))
+                _patched.append((klass, method, func))
+    array_handler.conversion_hook = _record_conversion
+
+def _uninstall():
+    """Restores everything patched by `_install`."""
+    for klass, method, func in _patched:
+        setattr(klass, method, func)
+    del _patched[:]
+    _active_calls.clear()
+    array_handler.conversion_hook = None
+
+
+######################################################################
+# `Profiler` class.
+######################################################################
+class Profiler(HasTraits):
+    """Records timings of the pipeline.  Each record is a tuple of
+    `(category, name, start, end, args)` where the times are in
+    seconds and `args` is a dictionary.  The categories are 'pipeline',
+    'vtk', 'render' and 'array'.  Array conversions are instantaneous
+    and their `end` is None.
+    """
+
+    # Is the profiler running?
+    running = Bool(False)
+
+    # The recorded events.  This is a plain list to keep recording
+    # cheap.
+    events = Any
+
+    ########################################
+    # Private traits.
+
+    # The engine being profiled.
+    _engine = Any
+
+    # The observed VTK objects mapped to their observer ids.
+    _observed = Dict
+
+    # The start time of the running VTK algorithms and renders.
+    _started = Dict
+
+    ######################################################################
+    # `Profiler` interface
+    ######################################################################
+    def start(self, engine=None):
+        """Starts recording.  If an `engine` is given the VTK
+        algorithms of its pipeline and its renders are also timed.
+        """
+        if self.running:
+            return
+        self.running = True
+        if len(_profilers) == 0:
+            _install()
+        _profilers.append(self)
+        self._engine = engine
+        if engine is not None:
+            engine.on_trait_change(self._update_scenes, 'scenes[]')
+            self._update_scenes()
+
+    def stop(self):
+        """Stops recording.  The recorded events are kept."""
+        if not self.running:
+            return
+        self.running = False
+        _profilers.remove(self)
+        if len(_profilers) == 0:
+            _uninstall()
+        engine = self._engine
+        if engine is not None:
+            engine.on_trait_change(self._update_scenes, 'scenes[]',
+                                   remove=True)
+        for vtk_obj, ids in self._observed.values():
+            for id in ids:
+                vtk_obj.RemoveObserver(id)
+        self._observed.clear()
+        self._started.clear()
+        self._engine = None
+
+    def clear(self):
+        """Discards the recorded events."""
+        del self.events[:]
+
+    def watch(self, obj, label=None, category='vtk'):
+        """Times every execution of the given tvtk algorithm or render
+        window under the given `label`.
+        """
+        vtk_obj = tvtk.to_vtk(obj)
+        key = vtk_obj.__this__
+        if key in self._observed:
+            return
+        if label is None:
+            label = obj.__class__.__name__
+        def on_start(o, event):
+            self._started[key] = clock()
+        def on_end(o, event):
+            start = self._started.pop(key, None)
+            if start is not None:
+                self.events.append((category, label, start, clock(), {}))
+        ids = [vtk_obj.AddObserver('StartEvent', on_start),
+               vtk_obj.AddObserver('EndEvent', on_end)]
+        self._observed[key] = (vtk_obj, ids)
+
+    def watch_pipeline(self, obj):
+        """Times the VTK algorithms held by the pipeline object `obj`
+        and those of its children and components.
+        """
+        self._watch_algorithms(obj)
+        for name in ('children', 'components'):
+            for child in getattr(obj, name, []):
+                self.watch_pipeline(child)
+
+    def record_call(self, obj, method, start, end):
+        """Records a call of `method` on the pipeline object `obj`."""
+        self.events.append(('pipeline', '%s.%s'%(get_label(obj), method),
+                            start, end, {}))
+        self._watch_algorithms(obj)
+
+    def record_conversion(self, name, nbytes, time):
+        """Records an array conversion of `nbytes` bytes."""
+        self.events.append(('array', name, time, None, {'bytes': nbytes}))
+
+    def summary(self):
+        """Returns a table summarizing the recorded events."""
+        stats = {}
+        for category, name, start, end, args in self.events:
+            key = (category, name)
+            if key not in stats:
+                stats[key] = [0, 0.0, 0.0, 0]
+            s = stats[key]
+            s[0] += 1
+            if end is not None:
+                duration = end - start
+                s[1] += duration
+                s[2] = max(s[2], duration)
+            s[3] += args.get('bytes', 0)
+
+        header = '%-8s %-48s %7s %10s %10s %10s %12s'%(
+            'Category', 'Name', 'Calls', 'Total(ms)', 'Mean(ms)',
+            'Max(ms)', 'Bytes')
+        lines = [header, '-'*len(header)]
+        # Sort by the total time, then by the bytes converted.
+        order = sorted(stats.items(), key=lambda x: (-x[1][1], -x[1][3]))
+        for (category, name), (count, total, longest, nbytes) in order:
+            lines.append('%-8s %-48s %7d %10.3f %10.3f %10.3f %12d'%(
+                category, name[:48], count, total*1e3, total*1e3/count,
+                longest*1e3, nbytes))
+        return '\n'.join(lines)
+
+    def get_trace(self):
+        """Returns the recorded events as a Chrome trace dictionary."""
+        events = []
+        if len(self.events) > 0:
+            t0 = min(e[2] for e in self.events)
+        pid = 0
+        tid = thread.get_ident()
+        converted = 0
+        for category, name, start, end, args in self.events:
+            ts = (start - t0)*1e6
+            if end is None:
+                converted += args.get('bytes', 0)
+                events.append({'name': 'array bytes', 'cat': category,
+                               'ph': 'C', 'ts': ts, 'pid': pid,
+                               'tid': tid, 'args': {'bytes': converted}})
+            else:
+                events.append({'name': name, 'cat': category, 'ph': 'X',
+                               'ts': ts, 'dur': (end - start)*1e6,
+                               'pid': pid, 'tid': tid, 'args': args})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def save_trace(self, file_or_fname):
+        """Saves the events as a Chrome trace (JSON) file."""
+        if hasattr(file_or_fname, 'write'):
+            json.dump(self.get_trace(), file_or_fname)
+        else:
+            f = open(file_or_fname, 'w')
+            try:
+                json.dump(self.get_trace(), f)
+            finally:
+                f.close()
+
+    ######################################################################
+    # Non-public interface
+    ######################################################################
+    def _events_default(self):
+        return []
+
+    def _watch_algorithms(self, obj):
+        label = None
+        for value in obj.__dict__.values():
+            if isinstance(value, tvtk.Algorithm):
+                if label is None:
+                    label = get_label(obj)
+                self.watch(value, '%s: %s'%(label,
+                                            value.__class__.__name__))
+
+    def _update_scenes(self):
+        engine = self._engine
+        if engine is None:
+            return
+        for scene in engine.scenes:
+            tvtk_scene = scene.scene
+            render_window = getattr(tvtk_scene, 'render_window', None)
+            if render_window is not None:
+                self.watch(render_window, 'render: %s'%scene.name,
+                           category='render')
+            self.watch_pipeline(scene)
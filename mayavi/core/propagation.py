@@ -0,0 +1,205 @@
+"""Deduplicated change propagation through the pipeline.
+
+Pipeline objects are told about changes upstream of them by the
+`pipeline_changed` and `data_changed` events of their inputs.  When
+each event calls the listeners directly a diamond shaped pipeline (a
+source feeding several filters whose outputs are collected again)
+updates the shared downstream objects once for every path leading to
+them.  The `Propagator` instead marks the listeners of an event as
+dirty and then updates every dirty object once, in topological order,
+before the event returns.
+
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import logging
+import weakref
+
+# Setup a logger for this module.
+logger = logging.getLogger(__name__)
+
+
+# The methods called by default for the pipeline events.
+DEFAULT_METHODS = {'pipeline_changed': 'update_pipeline',
+                   'data_changed': 'update_data'}
+
+
+######################################################################
+# `Propagator` class.
+######################################################################
+class Propagator(object):
+    """Propagates the pipeline events of the connected objects.
+
+    The `updates` attribute counts the updates made and
+    `avoided_updates` those saved by collapsing duplicate
+    notifications.
+    """
+
+    def __init__(self):
+        self.updates = 0
+        self.avoided_updates = 0
+        # Maps (id(emitter), event) to (emitter ref, [(node ref,
+        # method)]).
+        self._edges = {}
+        # Maps id(node) to (node ref, [emitter ref]).
+        self._inputs = {}
+        # The cached topological rank of the objects.
+        self._ranks = {}
+        # The dirty (node, method) pairs in the order they were marked.
+        self._dirty = []
+        self._dirty_keys = set()
+        self._flushing = False
+
+    ######################################################################
+    # `Propagator` interface
+    ######################################################################
+    def connect(self, emitter, node, methods=None):
+        """Updates `node` when `emitter` fires one of its pipeline
+        events.  `methods` maps the event names to the names of the
+        methods to call on `node` and defaults to `DEFAULT_METHODS`.
+        Like `on_trait_change`, connecting the same pair again does
+        nothing.
+        """
+        if methods is None:
+            methods = DEFAULT_METHODS
+        node_ref = weakref.ref(node)
+        for event, method in methods.items():
+            key = (id(emitter), event)
+            entry = self._edges.get(key)
+            if entry is None or entry[0]() is not emitter:
+                entry = (weakref.ref(emitter), [])
+                self._edges[key] = entry
+            edges = entry[1]
+            for ref, m in edges:
+                if ref() is node and m == method:
+                    break
+            else:
+                if len(edges) == 0:
+                    emitter.on_trait_event(self._dispatch, event)
+                edges.append((node_ref, method))
+
+        entry = self._inputs.get(id(node))
+        if entry is None or entry[0]() is not node:
+            entry = (node_ref, [])
+            self._inputs[id(node)] = entry
+        if not [ref for ref in entry[1] if ref() is emitter]:
+            entry[1].append(weakref.ref(emitter))
+        self._ranks.clear()
+
+    def disconnect(self, emitter, node, methods=None):
+        """Undoes a `connect` call made with the same arguments."""
+        if methods is None:
+            methods = DEFAULT_METHODS
+        for event, method in methods.items():
+            key = (id(emitter), event)
+            entry = self._edges.get(key)
+            if entry is None or entry[0]() is not emitter:
+                continue
+            edges = entry[1]
+            for i, (node_ref, m) in enumerate(edges):
+                if node_ref() is node and m == method:
+                    del edges[i]
+                    break
+            if len(edges) == 0:
+                emitter.on_trait_event(self._dispatch, event, remove=True)
+                del self._edges[key]
+
+        entry = self._inputs.get(id(node))
+        if entry is not None and entry[0]() is node:
+            refs = entry[1]
+            for i, ref in enumerate(refs):
+                if ref() is emitter:
+                    del refs[i]
+                    break
+            if len(refs) == 0:
+                del self._inputs[id(node)]
+        self._ranks.clear()
+
+    def reset_counts(self):
+        """Resets the `updates` and `avoided_updates` counters."""
+        self.updates = 0
+        self.avoided_updates = 0
+
+    ######################################################################
+    # Non-public interface
+    ######################################################################
+    def _dispatch(self, object, name, new):
+        entry = self._edges.get((id(object), name))
+        if entry is None:
+            return
+        for node_ref, method in list(entry[1]):
+            node = node_ref()
+            if node is not None:
+                self._mark(node, method)
+        if not self._flushing:
+            self._flush()
+
+    def _mark(self, node, method):
+        key = (id(node), method)
+        if key in self._dirty_keys:
+            self.avoided_updates += 1
+        else:
+            self._dirty_keys.add(key)
+            self._dirty.append((node, method))
+
+    def _flush(self):
+        """Updates the dirty objects, including those marked while
+        doing so, upstream ones first.  As with trait notification
+        handlers, an exception raised by an update is logged and the
+        other objects are still updated.
+        """
+        dirty = self._dirty
+        self._flushing = True
+        try:
+            while len(dirty) > 0:
+                node, method = dirty.pop(self._get_next())
+                self._dirty_keys.discard((id(node), method))
+                self.updates += 1
+                try:
+                    getattr(node, method)()
+                except Exception:
+                    logger.exception('Exception occurred in %s.%s while '
+                                     'propagating a pipeline event',
+                                     node.__class__.__name__, method)
+        finally:
+            self._flushing = False
+            del dirty[:]
+            self._dirty_keys.clear()
+
+    def _get_next(self):
+        """Returns the index of the dirty pair to update next.  Ties
+        are broken by updating the pipeline before the data and then
+        in the order the objects were marked.
+        """
+        best = None
+        for i, (node, method) in enumerate(self._dirty):
+            rank = (self._get_rank(node), method != 'update_pipeline')
+            if best is None or rank < best[0]:
+                best = (rank, i)
+        return best[1]
+
+    def _get_rank(self, node):
+        """Returns the length of the longest chain of connected objects
+        leading to `node`.
+        """
+        key = id(node)
+        rank = self._ranks.get(key)
+        if rank is not None:
+            return rank
+        # Guard against cycles.
+        self._ranks[key] = 0
+        rank = 0
+        entry = self._inputs.get(key)
+        if entry is not None and entry[0]() is node:
+            for ref in entry[1]:
+                emitter = ref()
+                if emitter is not None:
+                    rank = max(rank, self._get_rank(emitter) + 1)
+        self._ranks[key] = rank
+        return rank
+
+
+# The propagator used by the pipeline objects.
+propagator = Propagator()
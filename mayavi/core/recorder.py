@@ -0,0 +1,205 @@
+"""A script recorder that logs the recorded events and writes the Python
+code only when the code is asked for.
+
+The `Recorder` of `apptools.scripting` formats every trait change it
+sees into a line of Python as soon as it happens.  When interacting
+with a scene (dragging a widget or a slider, moving the camera) this
+slows the interaction down and fills the script with thousands of
+intermediate values.  The `BufferedRecorder` instead appends a small
+tuple to a log for every event.  Within a run of changes of traits or
+cameras, a change drops the previous change of the same trait or
+camera, so only the final values of an interaction are kept.  The code
+is generated from the log when the recording is stopped or the script
+is saved.
+
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Enthought library imports.
+from traits.api import Any, Bool
+from apptools.scripting.api import Recorder, RecorderWithUI, \
+     set_recorder
+
+
+######################################################################
+# `BufferedRecorder` class.
+######################################################################
+class BufferedRecorder(Recorder):
+    """A `Recorder` that keeps the events in a log, collapsing the
+    repeated changes of the same trait, and turns them into code only
+    when needed.
+    """
+
+    # The events not yet turned into code.  Each is a tuple of a key
+    # (or None), a function returning the code and the arguments of
+    # the function (or None and the code).  The events dropped for a
+    # later change of the same key are None.
+    _events = Any
+
+    # The index in the events of the keys of the current run of keyed
+    # events.
+    _run = Any
+
+    # Are the events being turned into code.
+    _flushing = Bool(False)
+
+    ######################################################################
+    # `Recorder` interface.
+    ######################################################################
+    def record(self, code):
+        """Record a string to be stored to the output file."""
+        if self._flushing:
+            super(BufferedRecorder, self).record(code)
+        elif self.recording and not self._in_function:
+            self._events.append((None, None, code))
+            self._run = {}
+
+    def record_later(self, key, func, *args):
+        """Record the code (one or more lines) returned by `func(*args)`,
+        called when the code is needed.  `key` identifies what the code
+        changes, for example a trait of an object or the camera of a
+        scene.  If an event with the same `key` was recorded since the
+        last event without a key, it is dropped and this one recorded
+        after the other events, so the events keep their order.
+        """
+        if self.recording and not self._in_function:
+            events = self._events
+            run = self._run
+            index = run.get(key)
+            if index is not None:
+                events[index] = None
+            run[key] = len(events)
+            events.append((key, func, args))
+
+    def flush(self):
+        """Turn the events logged so far into code."""
+        events = self._events
+        if len(events) == 0 or self._flushing:
+            return
+        self._events = []
+        self._run = {}
+        self._flushing = True
+        try:
+            for event in events:
+                if event is None:
+                    # Replaced by a later event.
+                    continue
+                key, func, args = event
+                if func is None:
+                    self.record(args)
+                else:
+                    for line in func(*args).split('\n'):
+                        self.record(line)
+        finally:
+            self._flushing = False
+
+    def record_function(self, func, args, kw):
+        # The call is written to the lines straight away.
+        self.flush()
+        return super(BufferedRecorder, self).record_function(func, args, kw)
+
+    def unregister(self, object):
+        # The script ids of the objects are needed to write the code.
+        self.flush()
+        super(BufferedRecorder, self).unregister(object)
+
+    def clear(self):
+        self._events = []
+        self._run = {}
+        super(BufferedRecorder, self).clear()
+
+    def get_code(self):
+        self.flush()
+        return super(BufferedRecorder, self).get_code()
+
+    ######################################################################
+    # Non-public interface.
+    ######################################################################
+    def __events_default(self):
+        return []
+
+    def __run_default(self):
+        return {}
+
+    def _recording_changed(self, value):
+        if not value:
+            # Write the pending events while still recording.
+            self.trait_setq(recording=True)
+            try:
+                self.flush()
+            finally:
+                self.trait_setq(recording=False)
+
+    def _listner(self, object, name, old, new):
+        if self.recording and not self._in_function:
+            if isinstance(new, list):
+                # The list may be changed in place later.
+                new = list(new)
+            self.record_later((object, name), self._assignment_as_string,
+                              object, name, new)
+
+    def _list_items_listner(self, object, name, old, event):
+        # The items are written to the lines straight away.
+        self.flush()
+        super(BufferedRecorder, self)._list_items_listner(object, name,
+                                                          old, event)
+
+    def _assignment_as_string(self, object, name, value):
+        """Returns the code setting the trait `name` of `object` to
+        `value`, commented out if the value has no usable repr.
+        """
+        sid = self._get_registry_data(object).script_id
+        if len(sid) == 0:
+            code = '%s = %r'%(name, value)
+        else:
+            code = '%s.%s = %r'%(sid, name, value)
+        value_repr = repr(value)
+        if value_repr.startswith('<') and value_repr.endswith('>'):
+            code = '# ' + code
+        return code
+
+
+######################################################################
+# `BufferedRecorderWithUI` class.
+######################################################################
+class BufferedRecorderWithUI(BufferedRecorder, RecorderWithUI):
+    """A `BufferedRecorder` with the user interface of the
+    `RecorderWithUI`.  The code shown is updated when the events are
+    turned into code.
+    """
+
+    def flush(self):
+        if len(self._events) == 0 or self._flushing:
+            return
+        super(BufferedRecorderWithUI, self).flush()
+        # The code was not updated line by line.
+        self.code = '\n'.join(self.lines) + '\n'
+        self.current_line = len(self.lines) + 1
+
+    def _update_code(self):
+        if not self._flushing:
+            super(BufferedRecorderWithUI, self)._update_code()
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def start_recording(object, ui=True, **kw):
+    """Starts recording `object` with a `BufferedRecorder`, shown in a
+    user interface if `ui` is True.  The keyword arguments are passed to
+    the `register` method of the recorder.  Returns the recorder.
+
+    The recording is stopped with
+    `apptools.scripting.api.stop_recording`.
+    """
+    if ui:
+        r = BufferedRecorderWithUI(root=object)
+        r.edit_traits(kind='live')
+    else:
+        r = BufferedRecorder()
+    # Set the global recorder.
+    set_recorder(r)
+    r.recording = True
+    r.register(object, **kw)
+    return r
@@ -102,9 +102,22 @@ class Registry(HasTraits):
         # method or a simple function which returns whether the object is
         # capable of reading the file or not.
 
+        # If the extension is unknown or ambiguous, the format found from
+        # the first bytes of the file selects the source metadata.
+
         # Finally returns the most suitable source metadata object to the engine. If
         # multiple objects are still present we return the last one in the list.
 
+        if len(result) != 1:
+            from mayavi.core.file_format import sniff_format
+            format = sniff_format(filename)
+            if format is not None:
+                sources = result or self.sources
+                matches = [src for src in sources \
+                           if format in src.extensions]
+                if len(matches) > 0:
+                    result = matches
+
         if len(result) > 1:
             for res in result[:]:
                 if len(res.can_read_test) > 0:
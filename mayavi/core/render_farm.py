@@ -0,0 +1,261 @@
+"""Render many images of a visualization with a pool of worker processes.
+
+A `RenderFarm` is given a pipeline, either a saved visualization, a
+session directory or a factory function building the visualization,
+and a list of jobs.  Every worker process loads the pipeline once in
+its own `OffScreenEngine` and then renders the jobs it is handed,
+changing only what a job specifies.  Each job is a dictionary that may
+contain:
+
+ - 'camera': a dictionary of camera settings.  The 'azimuth',
+   'elevation', 'distance', 'focalpoint' and 'roll' keys are passed to
+   `mayavi.tools.camera.view`, the other keys (for example 'position',
+   'focal_point', 'view_up', 'view_angle') are set on the camera.
+ - 'timestep': the timestep set on the file data sources.
+ - 'parameters': a dictionary mapping a path to a value, the path
+   being relative to the scene, for example
+   ``'children[0].children[0].children[0].contour.contours'``.
+ - 'filename': the image to write, by default `file_name` of the farm
+   formatted with the index of the job.
+
+The jobs are spread over the workers in no particular order, so a job
+should give every setting that other jobs change.  For example::
+
+    farm = RenderFarm(pipeline='flow.mv2', n_processes=4)
+    jobs = [{'camera': {'azimuth': a, 'elevation': 60}}
+            for a in range(0, 360, 2)]
+    report = farm.run(jobs)
+    print report.summary()
+
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import multiprocessing
+import os
+import re
+from itertools import imap
+from timeit import default_timer as clock
+
+# Enthought library imports.
+from traits.api import HasTraits, Any, Int, Str, Tuple, List, Float, \
+     Property
+
+# Local imports.
+from mayavi.core.off_screen_engine import OffScreenEngine, \
+     off_screen_viewer_factory
+
+# The camera settings handled by `mayavi.tools.camera.view`.
+VIEW_ARGS = ('azimuth', 'elevation', 'distance', 'focalpoint', 'roll')
+
+# The engine of the worker process.
+_engine = None
+
+_path_re = re.compile(r'\.?([A-Za-z_]\w*)|\[(-?\d+)\]')
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def resolve(obj, path):
+    """Returns the object at the `path` (for example
+    ``'children[0].actor.property'``) from `obj`.
+    """
+    pos = 0
+    for m in _path_re.finditer(path):
+        if m.start() != pos:
+            break
+        name, index = m.groups()
+        if name is not None and m.group().startswith('.') != (pos > 0):
+            # The names after the first one follow a dot.
+            break
+        if name is not None:
+            obj = getattr(obj, name)
+        else:
+            obj = obj[int(index)]
+        pos = m.end()
+    if pos != len(path) or pos == 0:
+        raise ValueError('Invalid path: %r'%path)
+    return obj
+
+def set_parameter(obj, path, value):
+    """Sets the trait at the `path` from `obj` to `value`."""
+    head, sep, name = path.rpartition('.')
+    if len(sep) > 0:
+        obj = resolve(obj, head)
+    setattr(obj, name, value)
+
+def start_engine(pipeline, size=(400, 350)):
+    """Starts an `OffScreenEngine` rendering scenes of the given `size`
+    and loads the `pipeline` in it.  Returns the engine.
+    """
+    factory = lambda: off_screen_viewer_factory(size)
+    e = OffScreenEngine(scene_factory=factory)
+    e.start()
+    if callable(pipeline):
+        e.new_scene()
+        pipeline(e)
+    elif os.path.isdir(pipeline):
+        e.load_session(pipeline)
+    else:
+        e.load_visualization(pipeline)
+    return e
+
+def apply_job(scene, job):
+    """Applies the settings of the `job` (see the module docstring) to
+    the mayavi `scene`.
+    """
+    tvtk_scene = scene.scene
+    tvtk_scene.disable_render = True
+    try:
+        if 'timestep' in job:
+            for src in scene.children:
+                if hasattr(src, 'timestep'):
+                    src.timestep = job['timestep']
+        for path, value in sorted(job.get('parameters', {}).items()):
+            set_parameter(scene, path, value)
+        camera = job.get('camera')
+        if camera is not None:
+            view = dict((k, v) for k, v in camera.items() if k in VIEW_ARGS)
+            if len(view) > 0:
+                from mayavi.tools.camera import view as set_view
+                set_view(figure=scene, **view)
+            cam = tvtk_scene.camera
+            for name, value in camera.items():
+                if name not in VIEW_ARGS:
+                    setattr(cam, name, value)
+            if 'clipping_range' not in camera:
+                tvtk_scene.renderer.reset_camera_clipping_range()
+    finally:
+        # Setting this back renders the scene once.
+        tvtk_scene.disable_render = False
+
+def _init_worker(pipeline, size):
+    """Starts the engine of a worker process."""
+    global _engine
+    _engine = start_engine(pipeline, size)
+
+def _stop_engine():
+    """Stops the engine started in this process."""
+    global _engine
+    if _engine is not None:
+        _engine.stop()
+        _engine = None
+
+def _render_job(args):
+    """Renders the job in the worker and returns the index of the job,
+    the image written, the time taken and the process id.
+    """
+    index, filename, job = args
+    t0 = clock()
+    scene = _engine.current_scene
+    apply_job(scene, job)
+    scene.scene.save(filename)
+    return index, filename, clock() - t0, os.getpid()
+
+
+######################################################################
+# `RenderReport` class.
+######################################################################
+class RenderReport(HasTraits):
+    """The timings of a run of a `RenderFarm`."""
+
+    # The (job index, image file, seconds, process id) of every job in
+    # the order they completed.
+    timings = List
+
+    # The time taken by the whole run, including starting the workers.
+    wall_time = Float
+
+    # The number of images rendered per second.
+    throughput = Property(Float, depends_on='timings, wall_time')
+
+    def summary(self):
+        """Returns a table of the time spent by each worker followed by
+        the totals.
+        """
+        workers = {}
+        for index, filename, seconds, pid in self.timings:
+            w = workers.setdefault(pid, [0, 0.0, 0.0])
+            w[0] += 1
+            w[1] += seconds
+            w[2] = max(w[2], seconds)
+
+        header = '%-10s %7s %10s %10s %10s'%('Worker', 'Jobs', 'Total(s)',
+                                             'Mean(ms)', 'Max(ms)')
+        lines = [header, '-'*len(header)]
+        for pid, (count, total, longest) in sorted(workers.items()):
+            lines.append('%-10d %7d %10.3f %10.3f %10.3f'%(
+                pid, count, total, total*1e3/count, longest*1e3))
+        lines.append('-'*len(header))
+        lines.append('%d images in %.3f s: %.2f images/s'%(
+            len(self.timings), self.wall_time, self.throughput))
+        return '\n'.join(lines)
+
+    def _get_throughput(self):
+        if self.wall_time > 0:
+            return len(self.timings)/self.wall_time
+        return 0.0
+
+
+######################################################################
+# `RenderFarm` class.
+######################################################################
+class RenderFarm(HasTraits):
+    """Renders a list of jobs of a visualization with a pool of
+    processes each running an `OffScreenEngine`.
+    """
+
+    # The visualization: the file name of a saved visualization, a
+    # session directory or a function called with a started engine
+    # that builds the visualization in its current scene.
+    pipeline = Any
+
+    # The number of worker processes.  If it is 0 the jobs are rendered
+    # in this process.
+    n_processes = Int(multiprocessing.cpu_count())
+
+    # The size of the images.
+    size = Tuple(Int(400), Int(350))
+
+    # The images written for the jobs without a 'filename', formatted
+    # with the index of the job.  The format of the image is given by
+    # the extension.
+    file_name = Str('frame_%05d.png')
+
+    ######################################################################
+    # `RenderFarm` interface.
+    ######################################################################
+    def run(self, jobs, callback=None):
+        """Renders the `jobs` and returns a `RenderReport`.  `callback`
+        is called with the number of jobs done and the number of jobs
+        after each job.
+        """
+        t0 = clock()
+        tasks = [(i, job.get('filename', self.file_name%i), job)
+                 for i, job in enumerate(jobs)]
+        n = len(tasks)
+        pool = None
+        if self.n_processes > 0 and n > 1:
+            pool = multiprocessing.Pool(min(self.n_processes, n),
+                                        _init_worker,
+                                        (self.pipeline, self.size))
+            chunk = max(1, n//(8*self.n_processes))
+            results = pool.imap_unordered(_render_job, tasks, chunk)
+        else:
+            _init_worker(self.pipeline, self.size)
+            results = imap(_render_job, tasks)
+        timings = []
+        try:
+            for result in results:
+                timings.append(result)
+                if callback is not None:
+                    callback(len(timings), n)
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+            else:
+                _stop_engine()
+        return RenderReport(timings=timings, wall_time=clock() - t0)
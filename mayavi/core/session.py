@@ -0,0 +1,331 @@
+"""Saving and loading visualizations as session directories, with the
+data of the datasets kept apart from the state of the pipeline.
+
+`Engine.save_visualization` pickles everything into one file, including
+the contents of the datasets of `VTKDataSource` and `ArraySource`
+objects.  A session directory instead holds the pickled state of the
+pipeline in `state.mv2` and the arrays of the datasets as `.npy` files
+in `blobs/`, named by the hash of their contents.  An array is written
+once, straight from memory to its file: saving the session again only
+writes the arrays that changed and the (small) state.  On load, the
+arrays are memory mapped, so the pipeline is restored without reading
+the data up front.
+
+While a session is saved or loaded, the store of the arrays is
+available from `get_blob_store` to the `__get_pure_state__` and
+`__set_pure_state__` methods of the sources.
+
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import hashlib
+import os
+from os.path import join, exists
+
+import numpy
+
+# Enthought library imports.
+from apptools.persistence import state_pickler
+from tvtk.api import tvtk
+
+# Local imports.
+from mayavi.core.lru_cache import LRUCache
+
+# The name of the state file of a session.
+STATE_FILE = 'state.mv2'
+
+# The directory of the arrays in a session.
+BLOB_DIR = 'blobs'
+
+# The store of the session being saved or loaded.
+_store = None
+
+# The keys of the arrays already hashed, keyed on the address and the
+# modification time of the VTK object holding them.
+_keys = LRUCache(max_size=256)
+
+# The attributes of the point and cell data, with the VTK attribute
+# types (vtkDataSetAttributes::AttributeTypes).
+_ATTRIBUTES = (('scalars', 0), ('vectors', 1), ('normals', 2),
+               ('t_coords', 3), ('tensors', 4))
+
+# The cell arrays of poly data.
+_POLY_CELLS = ('verts', 'lines', 'polys', 'strips')
+
+
+######################################################################
+# `BlobStore` class.
+######################################################################
+class BlobStore(object):
+    """Stores arrays as `.npy` files in `directory`, named by the hash
+    of their contents.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        # The keys of the arrays put or read.
+        self.used = set()
+
+    def get_path(self, key):
+        return join(self.directory, key + '.npy')
+
+    def put(self, array):
+        """Stores the NumPy `array` if it is not already stored and
+        returns its key.
+        """
+        array = numpy.ascontiguousarray(array)
+        h = hashlib.sha1(repr((array.dtype.str, array.shape)))
+        h.update(array.data)
+        key = h.hexdigest()
+        self._write(key, array)
+        return key
+
+    def put_object(self, obj):
+        """Stores the array of the tvtk object `obj` (a data array, a
+        points or a cell array) and returns its key.  The key is
+        remembered until the object is modified, so the array is not
+        hashed again when it has not changed.
+        """
+        cache_key = _get_cache_key(obj)
+        key = _keys.get(cache_key)
+        if key is None:
+            key = self.put(obj.to_array())
+            _keys[cache_key] = key
+        else:
+            self._write(key, obj)
+        return key
+
+    def get(self, key):
+        """Returns the array stored with `key`, memory mapped.  The
+        array can be modified without changing the file.
+        """
+        self.used.add(key)
+        return numpy.load(self.get_path(key), mmap_mode='c')
+
+    def remember(self, obj, key):
+        """Remembers that the array of the tvtk object `obj` is the
+        stored array `key`, so it is not hashed again when saved.
+        """
+        _keys[_get_cache_key(obj)] = key
+
+    def collect(self):
+        """Removes the stored arrays that were not used."""
+        for name in os.listdir(self.directory):
+            key, ext = os.path.splitext(name)
+            if ext == '.npy' and key not in self.used:
+                os.remove(join(self.directory, name))
+
+    def _write(self, key, array):
+        """Writes `array` (or the array of a tvtk object) to the file of
+        `key` unless it exists.
+        """
+        self.used.add(key)
+        path = self.get_path(key)
+        if exists(path):
+            return
+        if not isinstance(array, numpy.ndarray):
+            array = array.to_array()
+        if not exists(self.directory):
+            os.makedirs(self.directory)
+        # Write to a temporary file so a partly written file is never
+        # taken for the array.
+        tmp = path + '.tmp'
+        f = open(tmp, 'wb')
+        try:
+            numpy.save(f, array)
+        finally:
+            f.close()
+        os.rename(tmp, path)
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def _get_cache_key(obj):
+    """Returns the key of the hash of the array of a tvtk object."""
+    vtk_obj = tvtk.to_vtk(obj)
+    return vtk_obj.GetAddressAsString('vtkObject'), vtk_obj.GetMTime()
+
+def _get_address(obj):
+    return tvtk.to_vtk(obj).GetAddressAsString('vtkObject')
+
+def get_blob_store():
+    """Returns the `BlobStore` of the session being saved or loaded,
+    or None.
+    """
+    return _store
+
+def _has_numeric_arrays(data):
+    """Returns True if all the arrays of the field `data` are numeric
+    (the only arrays a `BlobStore` can store).
+    """
+    for i in range(data.number_of_arrays):
+        if data.get_array(i) is None:
+            return False
+    return True
+
+def _attributes_to_state(data, store):
+    """Stores the arrays of the point, cell or field `data`.  Returns a
+    list of their names, keys and the attributes they are active for.
+    """
+    active = []
+    if isinstance(data, tvtk.DataSetAttributes):
+        active = [(attr, _get_address(getattr(data, attr)))
+                  for attr, kind in _ATTRIBUTES
+                  if getattr(data, attr) is not None]
+    arrays = []
+    for i in range(data.number_of_arrays):
+        array = data.get_array(i)
+        address = _get_address(array)
+        attrs = [attr for attr, a in active if a == address]
+        arrays.append((array.name, store.put_object(array), attrs))
+    return arrays
+
+def _attributes_from_state(data, arrays, store):
+    kinds = dict(_ATTRIBUTES)
+    for name, key, attrs in arrays:
+        index = data.add_array(store.get(key))
+        array = data.get_array(index)
+        if name is not None:
+            array.name = name
+        for attr in attrs:
+            data.set_active_attribute(index, kinds[attr])
+        store.remember(array, key)
+
+def dataset_to_state(dataset, store):
+    """Stores the arrays of the tvtk `dataset` in `store` and returns a
+    dictionary describing it, or None if the type of the dataset or of
+    some of its arrays (string arrays for example) is not supported.
+    """
+    fields = (dataset.point_data, dataset.cell_data, dataset.field_data)
+    for data in fields:
+        if not _has_numeric_arrays(data):
+            return None
+    name = dataset.__class__.__name__
+    state = {'class_name': name}
+    if name in ('ImageData', 'StructuredPoints'):
+        state.update(dimensions=tuple(dataset.dimensions),
+                     origin=tuple(dataset.origin),
+                     spacing=tuple(dataset.spacing))
+    elif name == 'RectilinearGrid':
+        state['dimensions'] = tuple(dataset.dimensions)
+        for c in ('x_coordinates', 'y_coordinates', 'z_coordinates'):
+            state[c] = store.put_object(getattr(dataset, c))
+    elif name == 'StructuredGrid':
+        state['dimensions'] = tuple(dataset.dimensions)
+    elif name == 'PolyData':
+        for c in _POLY_CELLS:
+            cells = getattr(dataset, c)
+            if cells is not None and cells.number_of_cells > 0:
+                state[c] = (cells.number_of_cells, store.put_object(cells))
+    elif name == 'UnstructuredGrid':
+        cells = dataset.get_cells()
+        if cells is not None and cells.number_of_cells > 0:
+            state['cells'] = (cells.number_of_cells,
+                              store.put_object(cells))
+            state['cell_types'] = \
+                    store.put_object(dataset.cell_types_array)
+            state['cell_locations'] = \
+                    store.put_object(dataset.cell_locations_array)
+    else:
+        return None
+
+    if name not in ('ImageData', 'StructuredPoints', 'RectilinearGrid'):
+        points = dataset.points
+        if points is not None and len(points) > 0:
+            state['points'] = store.put_object(points.data)
+    state['point_data'] = _attributes_to_state(dataset.point_data, store)
+    state['cell_data'] = _attributes_to_state(dataset.cell_data, store)
+    state['field_data'] = _attributes_to_state(dataset.field_data, store)
+    return state
+
+def dataset_from_state(state, store):
+    """Returns the tvtk dataset described by the dictionary `state`
+    made by `dataset_to_state`, its arrays memory mapped from `store`.
+    """
+    name = state['class_name']
+    dataset = getattr(tvtk, name)()
+    if name in ('ImageData', 'StructuredPoints'):
+        dataset.set(dimensions=state['dimensions'], origin=state['origin'],
+                    spacing=state['spacing'])
+    elif name == 'RectilinearGrid':
+        dataset.dimensions = state['dimensions']
+        for c in ('x_coordinates', 'y_coordinates', 'z_coordinates'):
+            setattr(dataset, c, store.get(state[c]))
+    elif name == 'StructuredGrid':
+        dataset.dimensions = state['dimensions']
+
+    if 'points' in state:
+        dataset.points = store.get(state['points'])
+        store.remember(dataset.points.data, state['points'])
+
+    if name == 'PolyData':
+        for c in _POLY_CELLS:
+            if c in state:
+                n, key = state[c]
+                cells = tvtk.CellArray()
+                cells.set_cells(n, store.get(key))
+                setattr(dataset, c, cells)
+    elif name == 'UnstructuredGrid' and 'cells' in state:
+        n, key = state['cells']
+        cells = tvtk.CellArray()
+        cells.set_cells(n, store.get(key))
+        dataset.set_cells(store.get(state['cell_types']),
+                          store.get(state['cell_locations']), cells)
+
+    _attributes_from_state(dataset.point_data, state['point_data'], store)
+    _attributes_from_state(dataset.cell_data, state['cell_data'], store)
+    _attributes_from_state(dataset.field_data,
+                           state.get('field_data', []), store)
+    return dataset
+
+def array_to_state(array):
+    """Returns the NumPy `array` to pickle: a reference to the array in
+    the store of the session being saved, if any.
+    """
+    if _store is None or array is None:
+        return array
+    return {'blob': _store.put(array)}
+
+def array_from_state(value):
+    """Returns the array pickled by `array_to_state`."""
+    if isinstance(value, dict):
+        if _store is None:
+            raise IOError('The data of this visualization is saved '
+                          'apart, load it with `Engine.load_session`.')
+        return _store.get(value['blob'])
+    return value
+
+def save_session(engine, dirname):
+    """Saves the visualization of `engine` to the session directory
+    `dirname`.  The arrays that are no longer used are removed.
+    """
+    global _store
+    if not exists(dirname):
+        os.makedirs(dirname)
+    store = BlobStore(join(dirname, BLOB_DIR))
+    path = join(dirname, STATE_FILE)
+    tmp = path + '.tmp'
+    _store = store
+    try:
+        state_pickler.dump(engine, tmp)
+    finally:
+        _store = None
+    if exists(path):
+        os.remove(path)
+    os.rename(tmp, path)
+    if exists(store.directory):
+        store.collect()
+
+def load_session(engine, dirname):
+    """Loads the visualization saved in the session directory `dirname`
+    into `engine`.
+    """
+    global _store
+    _store = BlobStore(join(dirname, BLOB_DIR))
+    try:
+        engine.load_visualization(join(dirname, STATE_FILE))
+    finally:
+        _store = None
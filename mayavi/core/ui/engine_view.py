@@ -16,11 +16,12 @@ from traitsui.api import (Item, TreeEditor, TreeNode,
 from traitsui.menu import ToolBar, Action, Separator
 from pyface.resource.resource_path import resource_path
 from pyface.image_resource import ImageResource
-from apptools.scripting.api import start_recording, stop_recording
+from apptools.scripting.api import stop_recording
 
 # Local imports.
 from mayavi.core.engine import Engine
 from mayavi.core.base import Base
+from mayavi.core.recorder import start_recording
 from mayavi.core.adder_node import ModuleFilterAdderNode, \
         SourceAdderNode, ModuleAdderNode, FilterAdderNode, \
         SceneAdderNode, AdderNode
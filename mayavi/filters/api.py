@@ -5,6 +5,8 @@
 # Copyright (c) 2007-2009, Enthought, Inc.
 # License: BSD Style.
 
+from array_function import ArrayFunction
+from block_decimation import BlockDecimation
 from cell_derivatives import CellDerivatives
 from cell_to_point_data import CellToPointData
 from collection import Collection
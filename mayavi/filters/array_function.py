@@ -0,0 +1,287 @@
+"""A filter that computes new data arrays with a Python function
+operating on NumPy arrays.
+
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import hashlib
+
+import numpy
+
+# Enthought library imports.
+from traits.api import Instance, Callable, Dict, Enum, Str, Bool, \
+     Range, Any
+from traitsui.api import View, Group, Item
+from tvtk.api import tvtk
+from tvtk.array_handler import array2vtk
+
+# Local imports.
+from mayavi.core.filter import Filter
+from mayavi.core.pipeline_info import PipelineInfo
+from mayavi.core.common import exception
+from mayavi.core.lru_cache import LRUCache
+
+# The thread pools used to split up the work, keyed on their size.
+_thread_pools = {}
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def get_thread_pool(n_threads):
+    """Returns a (shared) pool of `n_threads` threads."""
+    pool = _thread_pools.get(n_threads)
+    if pool is None:
+        from multiprocessing.pool import ThreadPool
+        pool = ThreadPool(n_threads)
+        _thread_pools[n_threads] = pool
+    return pool
+
+def get_parameters_key(parameters):
+    """Returns a hashable key for a dictionary of parameters.  Arrays
+    are keyed on their contents.
+    """
+    key = []
+    for name, value in sorted(parameters.items()):
+        if isinstance(value, numpy.ndarray):
+            value = (value.shape, value.dtype.str,
+                     hashlib.md5(numpy.ascontiguousarray(value)).hexdigest())
+        else:
+            value = repr(value)
+        key.append((name, value))
+    return tuple(key)
+
+
+################################################################################
+# `ArrayFunction` class.
+################################################################################
+class ArrayFunction(Filter):
+    """
+    This filter adds data arrays computed by a Python function to its
+    input.
+
+    The function is called as `function(arrays, **parameters)` where
+    `arrays` is a dictionary mapping the names of the point (or cell)
+    data arrays of the input to NumPy views of them.  For point data,
+    the points of the dataset are also passed (as 'points') when they
+    do not clash with an array name.  The function should return a
+    dictionary of the new arrays, or a single array that is named
+    `output_name`.  The returned arrays should have one value per
+    point (or cell) and are passed to VTK without copying when they
+    are contiguous.
+
+    Outputs are cached, keyed on the modification time of the input
+    and the parameters, so changing a parameter back and forth does
+    not recompute anything.  If the function only works on one point
+    (or cell) at a time it can be run on chunks of the data by several
+    threads.  This only helps when the function spends its time in
+    NumPy operations that release the GIL.
+    """
+
+    # The version of this class.  Used for persistence.
+    __version__ = 0
+
+    # The function computing the new arrays.
+    function = Callable
+
+    # The keyword arguments passed to the function.
+    parameters = Dict
+
+    # The data the function operates on.
+    attribute = Enum('point', 'cell', desc='the data passed to the function')
+
+    # The name of the array when the function returns a single array.
+    output_name = Str('result', desc='the name of a single returned array')
+
+    # Make the first computed array the active scalars (or vectors).
+    active_output = Bool(True, desc='if the first computed array '\
+                                    'is made active')
+
+    # The number of threads to split the work across.
+    n_threads = Range(1, 64, 1, enter_set=True, auto_set=False,
+                      desc='the number of threads to split the work across')
+
+    # The maximum number of outputs that are cached.
+    cache_size = Range(1, 1000, 4, enter_set=True, auto_set=False,
+                       desc='the maximum number of cached outputs')
+
+    input_info = PipelineInfo(datasets=['any'],
+                              attribute_types=['any'],
+                              attributes=['any'])
+
+    output_info = PipelineInfo(datasets=['any'],
+                               attribute_types=['any'],
+                               attributes=['any'])
+
+    ########################################
+    # Traits View.
+
+    view = View(Group(Item(name='attribute'),
+                      Item(name='output_name'),
+                      Item(name='active_output'),
+                      Item(name='n_threads'),
+                      Item(name='cache_size')),
+                resizable=True)
+
+    ########################################
+    # Private traits.
+
+    # The output dataset.  The cached results are shallow copied into
+    # it so downstream objects only see data changes.
+    _output = Instance(tvtk.DataSet)
+
+    # The cached results.
+    _cache = Instance(LRUCache, kw={'max_size': 4})
+
+    # The key of the current result.
+    _key = Any
+
+    ######################################################################
+    # `object` interface.
+    ######################################################################
+    def __get_pure_state__(self):
+        d = super(ArrayFunction, self).__get_pure_state__()
+        for name in ('function', '_output', '_cache', '_key'):
+            d.pop(name, None)
+        return d
+
+    ######################################################################
+    # `Filter` interface.
+    ######################################################################
+    def update_pipeline(self):
+        if len(self.inputs) == 0 or len(self.inputs[0].outputs) == 0:
+            return
+        self._update_output()
+
+    def update_data(self):
+        if len(self.inputs) == 0 or len(self.inputs[0].outputs) == 0:
+            return
+        self._update_output()
+        self.render()
+
+    ######################################################################
+    # `ArrayFunction` interface.
+    ######################################################################
+    def clear_cache(self):
+        """Discards the cached outputs."""
+        self._cache.clear()
+        self._key = None
+
+    ######################################################################
+    # Non-public interface.
+    ######################################################################
+    def _update_output(self):
+        input = self.inputs[0].outputs[0]
+        if hasattr(input, 'update'):
+            input.update()
+        output = self._output
+        if output is None or output.__class__ is not input.__class__:
+            output = input.new_instance()
+            self._output = output
+
+        key = (id(input), input.m_time, self.function, self.attribute,
+               self.output_name, self.active_output,
+               get_parameters_key(self.parameters))
+        result = self._cache.get(key)
+        if result is None:
+            result = self._compute(input)
+            self._cache[key] = result
+        if key != self._key:
+            output.shallow_copy(result)
+            self._key = key
+        self._set_outputs([output])
+
+    def _compute(self, input):
+        """Returns a shallow copy of `input` with the computed arrays
+        added.
+        """
+        result = input.new_instance()
+        result.shallow_copy(input)
+        if self.function is None:
+            return result
+
+        data = getattr(result, '%s_data'%self.attribute)
+        arrays = {}
+        for i in range(data.number_of_arrays):
+            array = data.get_array(i)
+            if array is not None and array.name is not None:
+                arrays[array.name] = array.to_array()
+        if self.attribute == 'point' and 'points' not in arrays:
+            points = getattr(input, 'points', None)
+            if points is not None:
+                arrays['points'] = points.to_array()
+
+        try:
+            outputs = self._evaluate(arrays)
+        except:
+            exception('Error evaluating the function of %s'%self.name)
+            return result
+
+        first = True
+        for name, value in sorted(outputs.items()):
+            value = numpy.ascontiguousarray(value)
+            if value.dtype == numpy.bool_:
+                value = value.view(numpy.uint8)
+            vtk_array = array2vtk(value)
+            vtk_array.SetName(name)
+            data.add_array(vtk_array)
+            if first and self.active_output:
+                if value.ndim == 1:
+                    data.set_active_scalars(name)
+                elif value.shape[1] == 3:
+                    data.set_active_vectors(name)
+                first = False
+        return result
+
+    def _evaluate(self, arrays):
+        """Calls the function, on chunks of the arrays if more than one
+        thread is to be used, and returns a dictionary of the results.
+        """
+        function, parameters = self.function, self.parameters
+        n = 0
+        if len(arrays) > 0:
+            n = min(len(a) for a in arrays.values())
+        n_chunks = min(self.n_threads, n)
+        if n_chunks < 2:
+            return self._as_dict(function(arrays, **parameters))
+
+        bounds = numpy.linspace(0, n, n_chunks + 1).astype(int)
+        chunks = [dict((name, a[start:end]) for name, a in arrays.items())
+                  for start, end in zip(bounds[:-1], bounds[1:])]
+        pool = get_thread_pool(n_chunks)
+        results = pool.map(lambda c: self._as_dict(function(c, **parameters)),
+                           chunks)
+        return dict((name, numpy.concatenate([r[name] for r in results]))
+                    for name in results[0])
+
+    def _as_dict(self, result):
+        if isinstance(result, dict):
+            return result
+        return {self.output_name: result}
+
+    def _cache_size_changed(self, value):
+        self._cache.max_size = value
+
+    def _parameters_changed(self):
+        self._update()
+
+    def _parameters_items_changed(self):
+        self._update()
+
+    def _function_changed(self):
+        self._update()
+
+    def _attribute_changed(self):
+        self._update()
+
+    def _output_name_changed(self):
+        self._update()
+
+    def _active_output_changed(self):
+        self._update()
+
+    def _update(self):
+        if self.running:
+            self.update_data()
@@ -0,0 +1,266 @@
+"""A filter decimating large triangle meshes block by block.
+
+The mesh is split into blocks on a regular grid and every block is
+decimated on its own, optionally in worker processes.  The vertices on
+the boundary of a block are not removed, so the decimated blocks still
+share their boundary vertices and are stitched back together by their
+ids.  Only one block at a time needs the memory of the decimation
+algorithm, which makes it possible to decimate meshes far too large to
+decimate in one go.
+
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import numpy
+
+# Enthought library imports.
+from traits.api import Instance, Range, Int, Float, Bool
+from traitsui.api import View, Group, Item
+from tvtk.api import tvtk
+from tvtk.array_handler import ID_TYPE_CODE
+
+# Local imports.
+from mayavi.core.filter import Filter
+from mayavi.core.pipeline_info import PipelineInfo
+from mayavi.components.common import convert_to_poly_data
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def get_block_ids(points, triangles, n_blocks):
+    """Returns the block of every triangle, the blocks forming a grid of
+    `n_blocks` along each axis over the bounds of the points.  A
+    triangle belongs to the block of its first vertex.
+    """
+    lo = points.min(axis=0)
+    size = points.max(axis=0) - lo
+    size[size == 0] = 1.0
+    p = points[triangles[:, 0]]
+    index = ((p - lo)*(n_blocks/size)).astype(int).clip(0, n_blocks - 1)
+    return (index[:, 0]*n_blocks + index[:, 1])*n_blocks + index[:, 2]
+
+
+def make_triangle_cells(triangles):
+    """Returns a `tvtk.CellArray` of the given (N, 3) triangles."""
+    n = len(triangles)
+    cells = numpy.empty((n, 4), ID_TYPE_CODE)
+    cells[:, 0] = 3
+    cells[:, 1:] = triangles
+    ca = tvtk.CellArray()
+    ca.set_cells(n, cells.ravel())
+    return ca
+
+
+def decimate_block(args):
+    """Decimates a block given as a tuple of its points, triangles,
+    target reduction and whether the topology is preserved.  The
+    boundary vertices of the block are kept.  Returns the indices of
+    the kept points and the decimated triangles referring to them.
+
+    This is run in the worker processes.
+    """
+    points, triangles, reduction, preserve_topology = args
+    pd = tvtk.PolyData(points=points, polys=make_triangle_cells(triangles))
+    ids = tvtk.IdTypeArray(name='ids')
+    ids.from_array(numpy.arange(len(points)))
+    pd.point_data.add_array(ids)
+    dec = tvtk.DecimatePro(input=pd, target_reduction=reduction,
+                           preserve_topology=preserve_topology,
+                           boundary_vertex_deletion=False,
+                           splitting=False)
+    dec.update()
+    out = dec.output
+    kept = out.point_data.get_array('ids').to_array().astype(ID_TYPE_CODE)
+    polys = out.polys.to_array().reshape(-1, 4)[:, 1:]
+    return kept, polys
+
+
+def iter_blocks(points, triangles, n_blocks, reduction, preserve_topology):
+    """Yields the `decimate_block` arguments of the non empty blocks
+    along with the ids of the block points in the whole mesh.
+    """
+    block = get_block_ids(points, triangles, n_blocks)
+    order = numpy.argsort(block, kind='mergesort')
+    bounds = numpy.searchsorted(block[order],
+                                numpy.arange(n_blocks**3 + 1))
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        if start == end:
+            continue
+        tri = triangles[order[start:end]]
+        ids, local = numpy.unique(tri, return_inverse=True)
+        yield ids, (points[ids], local.reshape(-1, 3), reduction,
+                    preserve_topology)
+
+
+def decimate_in_blocks(points, triangles, n_blocks, reduction,
+                       preserve_topology=False, n_processes=0):
+    """Decimates the mesh of (N, 3) `points` and (M, 3) `triangles` in
+    `n_blocks`**3 blocks by the fraction `reduction`.  The blocks are
+    decimated by `n_processes` worker processes, or in this process if
+    it is 0.  Returns the indices of the kept points and the decimated
+    triangles referring to them.
+    """
+    blocks = iter_blocks(points, triangles, n_blocks, reduction,
+                         preserve_topology)
+    block_ids = []
+    def jobs():
+        for ids, job in blocks:
+            block_ids.append(ids)
+            yield job
+
+    if n_processes > 0:
+        from multiprocessing import Pool
+        pool = Pool(n_processes)
+        try:
+            results = list(pool.imap(decimate_block, jobs()))
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [decimate_block(job) for job in jobs()]
+
+    tris = [ids[kept][polys]
+            for ids, (kept, polys) in zip(block_ids, results)]
+    if len(tris) == 0:
+        empty = numpy.zeros((0, 3), ID_TYPE_CODE)
+        return empty[:, 0], empty
+    tris = numpy.concatenate(tris)
+    # The blocks share their boundary vertices, stitch them by id.
+    kept, local = numpy.unique(tris, return_inverse=True)
+    return kept, local.reshape(-1, 3)
+
+
+################################################################################
+# `BlockDecimation` class.
+################################################################################
+class BlockDecimation(Filter):
+    """
+    Decimates a triangle mesh to a target number of triangles, one
+    block of the mesh at a time.
+
+    The mesh is split into a grid of `n_blocks` blocks along each axis
+    that are decimated with `tvtk.DecimatePro`, in `n_processes` worker
+    processes if it is not 0.  The vertices on the block boundaries are
+    kept so the blocks stitch together without cracks.  The point data
+    of the kept points is passed on.
+    """
+
+    # The version of this class.  Used for persistence.
+    __version__ = 0
+
+    # The number of blocks along each axis.
+    n_blocks = Range(1, 32, 4, enter_set=True, auto_set=False,
+                     desc='the number of blocks along each axis')
+
+    # The number of triangles to decimate the mesh to.
+    target_triangles = Int(100000, enter_set=True, auto_set=False,
+                           desc='the number of triangles to decimate to')
+
+    # Preserve the topology of the mesh.
+    preserve_topology = Bool(False, desc='if the topology is preserved')
+
+    # The number of worker processes, 0 to decimate in this process.
+    n_processes = Range(0, 64, 0, enter_set=True, auto_set=False,
+                        desc='the number of worker processes')
+
+    # The fraction of the triangles removed by the last run.
+    reduction = Float(0.0)
+
+    input_info = PipelineInfo(datasets=['poly_data'],
+                              attribute_types=['any'],
+                              attributes=['any'])
+
+    output_info = PipelineInfo(datasets=['poly_data'],
+                               attribute_types=['any'],
+                               attributes=['any'])
+
+    ########################################
+    # Traits View.
+
+    view = View(Group(Item(name='target_triangles'),
+                      Item(name='n_blocks'),
+                      Item(name='preserve_topology'),
+                      Item(name='n_processes'),
+                      Item(name='reduction', style='readonly')),
+                resizable=True)
+
+    ########################################
+    # Private traits.
+
+    # Turns the input into triangles.
+    _triangles = Instance(tvtk.TriangleFilter, args=(), allow_none=False)
+
+    # The decimated mesh.
+    _output = Instance(tvtk.PolyData, args=(), allow_none=False)
+
+    ######################################################################
+    # `Filter` interface.
+    ######################################################################
+    def update_pipeline(self):
+        if len(self.inputs) == 0 or len(self.inputs[0].outputs) == 0:
+            return
+        self._decimate()
+        self._set_outputs([self._output])
+
+    def update_data(self):
+        if len(self.inputs) == 0 or len(self.inputs[0].outputs) == 0:
+            return
+        self._decimate()
+        self.data_changed = True
+
+    ######################################################################
+    # Non-public interface.
+    ######################################################################
+    def _decimate(self):
+        tf = self._triangles
+        tf.input = convert_to_poly_data(self.inputs[0].outputs[0])
+        tf.update()
+        mesh = tf.output
+        output = self._output
+        output.initialize()
+        if mesh.number_of_points == 0:
+            return
+        points = mesh.points.to_array()
+        polys = mesh.polys.to_array()
+        triangles = polys.reshape(-1, 4)[:, 1:]
+        n = len(triangles)
+        if n > self.target_triangles:
+            reduction = 1.0 - float(self.target_triangles)/n
+            kept, triangles = decimate_in_blocks(points, triangles,
+                                                 self.n_blocks, reduction,
+                                                 self.preserve_topology,
+                                                 self.n_processes)
+        else:
+            kept = numpy.unique(triangles)
+            triangles = numpy.searchsorted(kept, triangles)
+
+        output.points = points[kept]
+        output.polys = make_triangle_cells(triangles)
+        pd = mesh.point_data
+        for i in range(pd.number_of_arrays):
+            array = pd.get_array(i)
+            if array is None:
+                continue
+            index = output.point_data.add_array(array.to_array()[kept])
+            output.point_data.get_array(index).name = array.name
+        for attr in ('scalars', 'vectors', 'normals'):
+            array = getattr(pd, attr)
+            if array is not None and array.name is not None:
+                getattr(output.point_data, 'set_active_%s'%attr)(array.name)
+        self.reduction = 1.0 - float(len(triangles))/max(n, 1)
+
+    def _n_blocks_changed(self):
+        self._update()
+
+    def _target_triangles_changed(self):
+        self._update()
+
+    def _preserve_topology_changed(self):
+        self._update()
+
+    def _update(self):
+        if self.running:
+            self.update_data()
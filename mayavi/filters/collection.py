@@ -13,6 +13,11 @@ from traitsui.api import Item, Group, View, ListEditor
 from mayavi.core.pipeline_base import PipelineBase
 from mayavi.core.filter import Filter
 from mayavi.core.common import handle_children_state
+from mayavi.core.propagation import propagator
+
+# The methods called for the events of the last filter.
+LAST_FILTER_METHODS = {'pipeline_changed': '_fire_pipeline_changed',
+                       'data_changed': 'update_data'}
 
 
 ################################################################################
@@ -163,10 +168,12 @@ class Collection(Filter):
         self._set_outputs(self.filters[-1].outputs)
 
     def _setup_events(self, obj, remove=False):
-        obj.on_trait_change(self.update_data, 'data_changed',
-                            remove=remove)
-        obj.on_trait_change(self._fire_pipeline_changed,
-                            'pipeline_changed', remove=remove)
+        # The events go through the propagator so the collection is
+        # updated once, after its filters, when its input changes.
+        if remove:
+            propagator.disconnect(obj, self, LAST_FILTER_METHODS)
+        else:
+            propagator.connect(obj, self, LAST_FILTER_METHODS)
 
     def _visible_changed(self, value):
         for filter in self.filters:
@@ -6,12 +6,13 @@
 
 
 # Enthought library imports.
-from traits.api import Instance
+from traits.api import Instance, Bool, Any
 from traitsui.api import View, Group, Item
 from tvtk.api import tvtk
 
 # Local imports
 from mayavi.core.filter import Filter
+from mayavi.core.background import BackgroundExecution, detached_copy
 
 
 ######################################################################
@@ -27,14 +28,42 @@ class FilterBase(Filter):
     # The actual TVTK filter that this class manages.
     filter = Instance(tvtk.Object, allow_none=False, record=True)
 
+    # Execute the filter on a worker thread.  This keeps the UI
+    # responsive while long running filters execute and lets them be
+    # cancelled.
+    background = Bool(False, desc='if the filter is executed on a '\
+                                  'worker thread')
+
+    # The progress and cancellation of the background execution.
+    execution = Instance(BackgroundExecution, (), record=False)
+
     # The view of these filters.
 
     view = View(Group(Item(name='filter', style='custom', resizable=True,
                       show_label=False), springy=True),
+                Group(Item(name='background'),
+                      Item(name='execution', style='custom',
+                           show_label=False, visible_when='background'),
+                      label='Execution'),
                 scrollable=True,
                 resizable=True
                 )
 
+    ########################################
+    # Private traits.
+
+    # The output the results of background executions are copied into.
+    _background_output = Any
+
+    ######################################################################
+    # `object` interface.
+    ######################################################################
+    def __get_pure_state__(self):
+        d = super(FilterBase, self).__get_pure_state__()
+        for name in ('execution', '_background_output'):
+            d.pop(name, None)
+        return d
+
     ######################################################################
     # `Filter` interface.
     ######################################################################
@@ -70,7 +99,12 @@ class FilterBase(Filter):
 
         # By default we set the input to the first output of the first
         # input.
-        fil.input = inputs[0].outputs[0]
+        input = self._get_filter_input()
+        if self.background:
+            self._detach_outputs()
+            self.execution.execute(fil, input, self._background_done)
+            return
+        fil.input = input
         fil.update()
         self._set_outputs([fil.output])
 
@@ -85,10 +119,52 @@ class FilterBase(Filter):
         if len(self.inputs) == 0 or not self.running:
             return
 
+        if self.background:
+            self._detach_outputs()
+            self.execution.execute(self.filter, self._get_filter_input(),
+                                   self._background_done)
+            return
         self.filter.update()
         # Propagate the data_changed event.
         self.data_changed = True
 
+    ######################################################################
+    # Non-public interface.
+    ######################################################################
+    def _get_filter_input(self):
+        """Returns the dataset the filter is to be run on."""
+        return self.inputs[0].outputs[0]
+
+    def _detach_outputs(self):
+        """Hands the modules and filters downstream a copy of the
+        current output, so they do not update the filter while it
+        executes on the worker thread.  The results of the execution
+        are copied into it by `_background_done`.
+        """
+        outputs = self.outputs
+        if len(outputs) > 0 and outputs[0] is not self._background_output:
+            self._background_output = detached_copy(outputs[0])
+            self._set_outputs([self._background_output])
+
+    def _background_done(self, output):
+        """Called with the output of a background execution."""
+        current = self._background_output
+        if current is None or current.__class__ is not output.__class__ \
+               or len(self.outputs) == 0 or self.outputs[0] is not current:
+            self._background_output = output
+            self._set_outputs([output])
+        else:
+            current.shallow_copy(output)
+            self.data_changed = True
+
+    def _background_changed(self, value):
+        if value:
+            self.update_pipeline()
+        else:
+            # The filter must not be updated here while the worker
+            # still executes it.
+            self.execution.stop(self.update_pipeline)
+
     def _filter_changed(self, old, new):
         if old is not None:
             old.on_trait_change(self.update_data, remove=True)
@@ -6,7 +6,7 @@
 import numpy
 
 # Enthought library imports.
-from traits.api import Instance, Bool, Array, Button, Str
+from traits.api import Instance, Bool, Array, Button, Str, Range, Any
 from traitsui.api import View, Group, Item
 from tvtk.api import tvtk
 
@@ -15,6 +15,69 @@ from mayavi.core.filter import Filter
 from mayavi.core.pipeline_info import PipelineInfo
 
 
+######################################################################
+# Utility functions.
+######################################################################
+def fit_dimensions(dims, max_points):
+    """Scales down the dimensions `dims` of a grid so that it has at
+    most `max_points` points, keeping its aspect ratio.
+    """
+    dims = numpy.asarray(dims, int)
+    while dims.prod() > max_points and dims.max() > 1:
+        fac = (float(max_points)/dims.prod())**(1./3.)
+        new = ((dims - 1)*min(fac, 0.99)).astype(int) + 1
+        if (new == dims).all():
+            new = (dims - 1).clip(min=0) + (dims == 1)
+        dims = new
+    return dims
+
+def get_geometry_key(dataset):
+    """Returns a key that changes when the points or cells of a point
+    set are replaced or modified.
+    """
+    arrays = [dataset.points]
+    if isinstance(dataset, tvtk.UnstructuredGrid):
+        arrays.append(dataset.get_cells())
+    elif isinstance(dataset, tvtk.PolyData):
+        arrays.extend([dataset.verts, dataset.lines, dataset.polys,
+                       dataset.strips])
+    elif isinstance(dataset, tvtk.StructuredGrid):
+        arrays.append(tuple(dataset.dimensions))
+    key = [dataset.__class__]
+    for a in arrays:
+        if isinstance(a, tvtk.Object):
+            a = (tvtk.to_vtk(a).GetAddressAsString('vtkObject'), a.m_time)
+        key.append(a)
+    return tuple(key)
+
+def copy_data_in_place(source, target):
+    """Copies the values of the point and cell data arrays of `source`
+    into the matching arrays of `target` without modifying `target`.
+    Returns False if the arrays do not match.
+    """
+    pairs = []
+    for name in ('point_data', 'cell_data'):
+        src, dst = getattr(source, name), getattr(target, name)
+        if src.number_of_arrays != dst.number_of_arrays:
+            return False
+        for attr in ('scalars', 'vectors'):
+            a, b = getattr(src, attr), getattr(dst, attr)
+            if (a is None) != (b is None) or \
+                   (a is not None and a.name != b.name):
+                return False
+        for i in range(src.number_of_arrays):
+            a, b = src.get_array(i), dst.get_array(i)
+            if a is None or b is None:
+                return False
+            a, b = a.to_array(), b.to_array()
+            if a.shape != b.shape or a.dtype != b.dtype:
+                return False
+            pairs.append((a, b))
+    for a, b in pairs:
+        b[...] = a
+    return True
+
+
 ################################################################################
 # `ImageDataProbe` class.
 ################################################################################
@@ -66,6 +129,24 @@ class ImageDataProbe(Filter):
     # Name of rescaled scalar to generate.
     rescaled_scalar_name = Str('probe_us_array')
 
+    # The memory (in megabytes) the probed data may use.  The default
+    # dimensions are lowered to fit in it.
+    memory_budget = Range(1, 65536, 256, enter_set=True, auto_set=False,
+                          desc='the memory in MB the probed data may use')
+
+    # Only probe a region of interest of the input.
+    use_roi = Bool(False, desc='if only a region of interest is probed')
+
+    # The bounds of the region of interest.
+    roi = Array(value=(0.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+                shape=(6,),
+                cols=2,
+                dtype=float,
+                enter_set=True,
+                auto_set=False,
+                labels=['xmin', 'xmax', 'ymin', 'ymax', 'zmin', 'zmax'],
+                desc='the bounds of the region of interest')
+
     input_info = PipelineInfo(datasets=['image_data'],
                               attribute_types=['any'],
                               attributes=['any'])
@@ -80,6 +161,15 @@ class ImageDataProbe(Filter):
     # A trait to prevent static handlers from firing unnecessarily.
     _event_handled = Bool(False)
 
+    # A private copy of the input that is probed.  It is kept as long as
+    # the points and cells of the input do not change, so the locator
+    # VTK builds on it to find the cells is reused when only the data
+    # changes.
+    _source = Any
+
+    # The geometry key of the input `_source` was copied from.
+    _source_key = Any
+
     ########################################
     # View related traits.
 
@@ -89,6 +179,12 @@ class ImageDataProbe(Filter):
                       Item(name='spacing',
                            enabled_when='allow_changes'),
                       Item(name='rescale_scalars'),
+                      Item(name='memory_budget',
+                           enabled_when='allow_changes'),
+                      Item(name='use_roi',
+                           enabled_when='allow_changes'),
+                      Item(name='roi',
+                           enabled_when='allow_changes and use_roi'),
                       Item(name='reset_defaults',
                            show_label=False),
                       ),
@@ -96,6 +192,15 @@ class ImageDataProbe(Filter):
                       )
 
 
+    ######################################################################
+    # `object` interface.
+    ######################################################################
+    def __get_pure_state__(self):
+        d = super(ImageDataProbe, self).__get_pure_state__()
+        for name in ('_source', '_source_key'):
+            d.pop(name, None)
+        return d
+
     ######################################################################
     # `Filter` interface.
     ######################################################################
@@ -110,7 +215,7 @@ class ImageDataProbe(Filter):
             return
 
         fil = self.filter
-        fil.source = inputs[0].outputs[0]
+        fil.source = self._get_source()
         reset = False
         if self.dimensions.sum() == 0:
             reset = True
@@ -119,6 +224,18 @@ class ImageDataProbe(Filter):
         self._rescale_scalars_changed(self.rescale_scalars)
         self._set_outputs([fil.output])
 
+    def update_data(self):
+        """Probe the new data of the input."""
+        if len(self.inputs) == 0:
+            return
+        fil = self.filter
+        source = self._get_source()
+        if fil.source is not source:
+            fil.source = source
+        fil.update()
+        self._rescale_scalars_changed(self.rescale_scalars)
+        self.data_changed = True
+
     ######################################################################
     # Non-public interface.
     ######################################################################
@@ -135,13 +252,14 @@ class ImageDataProbe(Filter):
             pd.update()
         elif reset:
             self.allow_changes = True
-            b = numpy.array(input.bounds)
+            b = self._get_bounds()
             pd.origin = b[::2]
             l = b[1::2] - b[::2]
-            tot_len = sum(l)
+            tot_len = max(sum(l), 1e-3)
             npnt = pow(input.number_of_points, 1./3.) + 0.5
             fac = 3.0*npnt/tot_len
             dims = (l*fac).astype(int) + 1
+            dims = fit_dimensions(dims, self._get_max_points())
             extent = (0, dims[0] -1, 0, dims[1] -1, 0, dims[2] -1)
             pd.set(extent=extent,
                    update_extent=extent,
@@ -200,7 +318,7 @@ class ImageDataProbe(Filter):
 
         max_d = value.max()
         dims = (value-1).clip(min=1, max=max_d)
-        b = numpy.array(self.inputs[0].outputs[0].bounds)
+        b = self._get_bounds()
         l = b[1::2] - b[::2]
         self.spacing = l/dims
         self._update_probe()
@@ -208,7 +326,7 @@ class ImageDataProbe(Filter):
     def _spacing_changed(self, value):
         if not self.allow_changes or self._event_handled:
             return
-        b = numpy.array(self.inputs[0].outputs[0].bounds)
+        b = self._get_bounds()
         l = b[1::2] - b[::2]
         dims = (l/value + 0.5).astype(int) + 1
         # Recalculate space because of rounding.
@@ -230,6 +348,8 @@ class ImageDataProbe(Filter):
                whole_extent=extent,
                dimensions=dims,
                spacing=spacing)
+        if self.allow_changes:
+            pd.origin = self._get_bounds()[::2]
         pd.modified()
         pd.update()
         fil = self.filter
@@ -247,3 +367,81 @@ class ImageDataProbe(Filter):
         self._setup_probe_data(reset=True)
         self._rescale_scalars_changed(self.rescale_scalars)
 
+    def _get_bounds(self):
+        """Returns the bounds of the probed region: the bounds of the
+        input, clipped to the region of interest if it is used.
+        """
+        b = numpy.array(self.inputs[0].outputs[0].bounds)
+        if self.use_roi:
+            roi = self.roi
+            b[::2] = numpy.maximum(b[::2], roi[::2])
+            b[1::2] = numpy.maximum(numpy.minimum(b[1::2], roi[1::2]),
+                                    b[::2])
+        return b
+
+    def _get_max_points(self):
+        """Returns the number of probe points that fit in the memory
+        budget.
+        """
+        input = self.inputs[0].outputs[0]
+        # The probe filter adds a mask of the valid points.
+        n_bytes = 1
+        if self.rescale_scalars:
+            n_bytes += 2
+        for data in (input.point_data, input.cell_data):
+            for i in range(data.number_of_arrays):
+                array = data.get_array(i)
+                if array is not None:
+                    n_bytes += array.number_of_components*\
+                               array.to_array().itemsize
+        return max(int(self.memory_budget*1024*1024/n_bytes), 1)
+
+    def _get_source(self):
+        """Returns the dataset to probe.  Point sets are copied and the
+        copy is updated in place while the geometry of the input does
+        not change, so VTK does not rebuild its cell locator.
+        """
+        input = self.inputs[0].outputs[0]
+        if not isinstance(input, tvtk.PointSet):
+            return input
+        key = get_geometry_key(input)
+        source = self._source
+        if source is not None and key == self._source_key and \
+               copy_data_in_place(input, source):
+            # The source was not modified, make sure the probe runs.
+            self.filter.modified()
+            return source
+        source = input.new_instance()
+        source.shallow_copy(input)
+        # The data arrays are copied so they can be updated in place.
+        source.point_data.deep_copy(input.point_data)
+        source.cell_data.deep_copy(input.cell_data)
+        self._source = source
+        self._source_key = key
+        return source
+
+    def _update_region(self):
+        if len(self.inputs) == 0 or not self.allow_changes:
+            return
+        self._spacing_changed(self.spacing)
+
+    def _use_roi_changed(self, value):
+        if len(self.inputs) == 0:
+            return
+        if value and (self.roi[1::2] <= self.roi[::2]).all():
+            self._event_handled = True
+            self.roi = self.inputs[0].outputs[0].bounds
+            self._event_handled = False
+        self._update_region()
+
+    def _roi_changed(self):
+        if self._event_handled:
+            return
+        self._update_region()
+
+    def _memory_budget_changed(self):
+        if len(self.inputs) == 0 or not self.allow_changes:
+            return
+        self._setup_probe_data(reset=True)
+        self._update_probe()
+
@@ -24,6 +24,38 @@ def make_user_defined_filter():
 ################################################################################
 # Metadata.
 
+array_function_filter = FilterMetadata(
+    id            = "ArrayFunctionFilter",
+    menu_name          = "&Array Function",
+    class_name = BASE + '.array_function.ArrayFunction',
+    tooltip = "Compute new data arrays with a Python function of NumPy arrays",
+    desc = "Compute new data arrays with a Python function of NumPy arrays",
+    help = "Compute new data arrays with a Python function of NumPy arrays",
+    input_info = PipelineInfo(datasets=['any'],
+                              attribute_types=['any'],
+                              attributes=['any']),
+    output_info = PipelineInfo(datasets=['any'],
+                               attribute_types=['any'],
+                               attributes=['any'])
+)
+
+block_decimation_filter = FilterMetadata(
+    id            = "BlockDecimationFilter",
+    menu_name          = "&Block Decimation",
+    class_name = BASE + '.block_decimation.BlockDecimation',
+    tooltip = "Decimate a large triangle mesh block by block",
+    desc = "Decimate a large triangle mesh block by block, optionally "\
+           "in worker processes",
+    help = "Decimate a large triangle mesh block by block, optionally "\
+           "in worker processes",
+    input_info = PipelineInfo(datasets=['poly_data'],
+                              attribute_types=['any'],
+                              attributes=['any']),
+    output_info = PipelineInfo(datasets=['poly_data'],
+                               attribute_types=['any'],
+                               attributes=['any'])
+)
+
 cell_derivatives_filter = FilterMetadata(
     id            = "CellDerivativesFilter",
     menu_name          = "&CellDerivatives",
@@ -550,7 +582,9 @@ warp_vector_filter = FilterMetadata(
 )
 
 # Now collect all the filters for the mayavi registry.
-filters = [cell_derivatives_filter,
+filters = [array_function_filter,
+           block_decimation_filter,
+           cell_derivatives_filter,
            cell_to_point_data_filter,
            clip_filter,
            contour_filter,
@@ -17,17 +17,7 @@ class PolyDataFilterBase(FilterBase):
     """
 
     ######################################################################
-    # `Filter` interface.
+    # Non-public interface.
     ######################################################################
-    def update_pipeline(self):
-        # Do nothing if there is no input.
-        inputs = self.inputs
-        if len(inputs) == 0:
-            return
-
-        # By default we set the input to the first output of the first
-        # input.
-        fil = self.filter
-        fil.input = convert_to_poly_data(inputs[0].outputs[0])
-        fil.update()
-        self._set_outputs([fil.output])
+    def _get_filter_input(self):
+        return convert_to_poly_data(self.inputs[0].outputs[0])
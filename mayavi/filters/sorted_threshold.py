@@ -0,0 +1,258 @@
+"""An index of the cells (or points) of a dataset sorted on their
+scalar value, used to threshold interactively.
+
+The cells are sorted on their scalar value once every time the dataset
+changes.  Any interval of values then maps to a contiguous range of
+the sorted cells that is found by a binary search, and the thresholded
+dataset is made by slicing the sorted arrays.  Moving a threshold
+therefore costs time proportional to the size of the output instead
+of the size of the input.
+
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import numpy
+
+# Enthought library imports.
+from traits.api import HasTraits, Enum, Any
+from tvtk.api import tvtk
+from tvtk.array_handler import ID_TYPE_CODE
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def sort_cells(connectivity, locations, order):
+    """Reorders the cells of an unstructured grid.  `connectivity` is
+    the array of the cells (the number of points of each cell followed
+    by their ids), `locations` the offset of each cell into it and
+    `order` the new order of the cells.  Returns the reordered
+    connectivity and locations.
+    """
+    n = len(locations)
+    if n == 0:
+        return connectivity[:0], locations
+    sizes = connectivity[locations] + 1
+    new_sizes = sizes[order]
+    new_locations = numpy.zeros(n, ID_TYPE_CODE)
+    numpy.cumsum(new_sizes[:-1], out=new_locations[1:])
+    shift = numpy.repeat(locations[order] - new_locations, new_sizes)
+    index = numpy.arange(len(shift), dtype=ID_TYPE_CODE) + shift
+    return connectivity[index], new_locations
+
+
+def get_sort_values(scalars):
+    """Returns the values of a tvtk data array the items are sorted on:
+    the first component of the tuples.
+    """
+    values = scalars.to_array()
+    if values.ndim > 1:
+        values = values[:, 0]
+    return values
+
+
+######################################################################
+# `SortedThresholdIndex` class.
+######################################################################
+class SortedThresholdIndex(HasTraits):
+    """Thresholds the cells or the points of a dataset by slicing their
+    ids sorted on the scalar value.
+
+    In 'cells' mode the cells are sorted on the cell scalars.  If the
+    dataset only has point scalars, a cell is thresholded on the mean of
+    the scalars at its points.  The output is an unstructured grid that
+    shares all the points of the input.  In 'points' mode the output is
+    a poly data of the points in the interval, with a vertex each.
+    """
+
+    # What is thresholded.
+    mode = Enum('cells', 'points')
+
+    ########################################
+    # Private traits.
+
+    # The dataset modification time and mode the index was built for.
+    _key = Any
+
+    # The sorted scalar values and the order of the ids sorting them.
+    _values = Any
+    _order = Any
+
+    # The sorted cells: their connectivity, locations and types, along
+    # with the dataset holding the points and point data.
+    _connectivity = Any
+    _locations = Any
+    _types = Any
+    _grid = Any
+
+    # The sorted points and the connectivity of a vertex per point.
+    _points = Any
+    _vertices = Any
+
+    # The sorted data arrays, as (name, array) tuples, and the names of
+    # the active scalars and vectors.
+    _arrays = Any
+    _active = Any
+
+    ######################################################################
+    # `SortedThresholdIndex` interface
+    ######################################################################
+    def supports(self, dataset):
+        """Returns if the dataset has scalars to threshold on."""
+        if self.mode == 'points':
+            return dataset.point_data.scalars is not None
+        return dataset.point_data.scalars is not None or \
+               dataset.cell_data.scalars is not None
+
+    def update(self, dataset):
+        """(Re)builds the index if the dataset has been modified since
+        the index was last built.
+        """
+        key = (dataset.m_time, self.mode)
+        if key == self._key:
+            return
+        if self.mode == 'cells':
+            self._build_cells(dataset)
+        else:
+            self._build_points(dataset)
+        self._key = key
+
+    def get_range(self, lower, upper):
+        """Returns the range (start, end) of the sorted ids whose value
+        lies in [lower, upper].
+        """
+        values = self._values
+        start = numpy.searchsorted(values, lower, side='left')
+        end = numpy.searchsorted(values, upper, side='right')
+        return int(start), int(max(start, end))
+
+    def get_histogram(self, bins=64):
+        """Returns the counts and the bin edges of a histogram of the
+        (finite) sorted values, see `numpy.histogram`.
+        """
+        values = self._values
+        finite = values[numpy.isfinite(values)]
+        if len(finite) == 0:
+            return numpy.zeros(bins, int), numpy.linspace(0.0, 1.0, bins + 1)
+        edges = numpy.linspace(finite[0], finite[-1], bins + 1)
+        # Like numpy.histogram, the bins hold the values from their
+        # lower edge up to (but excluding) their upper edge, except for
+        # the last bin that also holds the maximum.
+        ends = numpy.searchsorted(finite, edges[1:], side='left')
+        ends[-1] = len(finite)
+        counts = numpy.diff(numpy.r_[0, ends])
+        return counts, edges
+
+    def threshold(self, dataset, lower, upper):
+        """Returns a new dataset of the cells (or points) of `dataset`
+        whose scalar lies in [lower, upper].
+        """
+        self.update(dataset)
+        start, end = self.get_range(lower, upper)
+        if self.mode == 'cells':
+            return self._slice_cells(start, end)
+        return self._slice_points(start, end)
+
+    ######################################################################
+    # Non-public interface
+    ######################################################################
+    def _sort(self, values):
+        order = numpy.argsort(values, kind='mergesort')
+        self._order = order
+        self._values = values[order]
+        return order
+
+    def _sort_arrays(self, data, order):
+        active = [None, None]
+        arrays = []
+        for i in range(data.number_of_arrays):
+            array = data.get_array(i)
+            if array is None:
+                continue
+            name = array.name or 'array%d'%i
+            arrays.append((name, array.to_array()[order]))
+            if tvtk.to_vtk(array) is tvtk.to_vtk(data.scalars):
+                active[0] = name
+            elif tvtk.to_vtk(array) is tvtk.to_vtk(data.vectors):
+                active[1] = name
+        self._active = active
+        self._arrays = arrays
+
+    def _build_cells(self, dataset):
+        if isinstance(dataset, tvtk.UnstructuredGrid):
+            grid = dataset
+        else:
+            append = tvtk.AppendFilter()
+            append.add_input(dataset)
+            append.update()
+            grid = append.output
+
+        data = grid.cell_data
+        if data.scalars is None:
+            p2c = tvtk.PointDataToCellData(input=grid)
+            p2c.update()
+            values = get_sort_values(p2c.output.cell_data.scalars)
+        else:
+            values = get_sort_values(data.scalars)
+        order = self._sort(values)
+
+        connectivity = grid.get_cells().to_array()
+        locations = grid.cell_locations_array.to_array()
+        self._connectivity, self._locations = \
+            sort_cells(connectivity, locations, order)
+        self._types = grid.cell_types_array.to_array()[order]
+        self._sort_arrays(data, order)
+        self._grid = grid
+        self._points = self._vertices = None
+
+    def _build_points(self, dataset):
+        values = get_sort_values(dataset.point_data.scalars)
+        order = self._sort(values)
+        n = len(order)
+        self._points = dataset.points.to_array()[order]
+        vertices = numpy.ones((n, 2), ID_TYPE_CODE)
+        vertices[:, 1] = numpy.arange(n)
+        self._vertices = vertices.ravel()
+        self._sort_arrays(dataset.point_data, order)
+        self._connectivity = self._locations = self._types = None
+        self._grid = None
+
+    def _add_arrays(self, data, start, end):
+        scalars, vectors = self._active
+        for name, array in self._arrays:
+            index = data.add_array(array[start:end])
+            data.get_array(index).name = name
+            if name == scalars:
+                data.set_active_scalars(name)
+            elif name == vectors:
+                data.set_active_vectors(name)
+
+    def _slice_cells(self, start, end):
+        grid = self._grid
+        output = tvtk.UnstructuredGrid(points=grid.points)
+        output.point_data.pass_data(grid.point_data)
+        n = end - start
+        locations = self._locations
+        if n > 0:
+            first = locations[start]
+            if end < len(locations):
+                last = locations[end]
+            else:
+                last = len(self._connectivity)
+            cells = tvtk.CellArray()
+            cells.set_cells(n, self._connectivity[first:last])
+            output.set_cells(self._types[start:end],
+                             locations[start:end] - first, cells)
+        self._add_arrays(output.cell_data, start, end)
+        return output
+
+    def _slice_points(self, start, end):
+        n = end - start
+        output = tvtk.PolyData(points=self._points[start:end])
+        verts = tvtk.CellArray()
+        verts.set_cells(n, self._vertices[:2*n])
+        output.verts = verts
+        self._add_arrays(output.point_data, start, end)
+        return output
@@ -7,17 +7,17 @@
 # Copyright (c) 2010, Enthought, Inc.
 # License: BSD Style.
 
-import numpy as np
-
 # Enthought library imports.
 from traits.api import Instance, Range, Float, Bool, \
-                                 Property, Enum
+                                 Property, Enum, Any
 from traitsui.api import View, Group, Item
 from tvtk.api import tvtk
 
 # Local imports
 from mayavi.core.filter import Filter
 from mayavi.core.pipeline_info import PipelineInfo
+from mayavi.core.array_stats import get_array_stats, get_histogram
+from mayavi.filters.sorted_threshold import SortedThresholdIndex
 
 
 ######################################################################
@@ -66,6 +66,15 @@ class Threshold(Filter):
                             'automatically reset when upstream '
                             'data changes')
 
+    # How the data is thresholded: by the VTK filter or by slicing the
+    # cells (or points) sorted on their scalar value.  Sorting is done
+    # once per data change and makes moving the thresholds much faster
+    # on large datasets.  When thresholding cells on point scalars the
+    # sorted method uses the mean of the scalars at the cell points.
+    method = Enum('vtk', 'sorted',
+                  desc='if the data is thresholded by VTK or by '
+                       'slicing the sorted cells')
+
     input_info = PipelineInfo(datasets=['any'],
                               attribute_types=['any'],
                               attributes=['any'])
@@ -77,6 +86,7 @@ class Threshold(Filter):
 
     # Our view.
     view = View(Group(Group(Item(name='filter_type'),
+                            Item(name='method'),
                             Item(name='lower_threshold'),
                             Item(name='auto_reset_lower'),
                             Item(name='upper_threshold'),
@@ -107,13 +117,19 @@ class Threshold(Filter):
     # Internal data to
     _first = Bool(True)
 
+    # The index of the sorted cells (or points) used by the sorted
+    # method and the output it is copied into.
+    _index = Instance(SortedThresholdIndex, args=())
+    _sorted_output = Any
+
     ######################################################################
     # `object` interface.
     ######################################################################
     def __get_pure_state__(self):
         d = super(Threshold, self).__get_pure_state__()
         # These traits are dynamically created.
-        for name in ('_first', '_data_min', '_data_max'):
+        for name in ('_first', '_data_min', '_data_max', '_index',
+                     '_sorted_output'):
             d.pop(name, None)
 
         return d
@@ -143,7 +159,7 @@ class Threshold(Filter):
         fil.input = self.inputs[0].outputs[0]
 
         self._update_ranges()
-        self._set_outputs([self.threshold_filter.output])
+        self._set_outputs([self._get_output()])
 
     def update_data(self):
         """Override this method to do what is necessary when upstream
@@ -156,25 +172,96 @@ class Threshold(Filter):
             return
 
         self._update_ranges()
+        if self._use_index():
+            self._threshold_sorted()
 
         # Propagate the data_changed event.
         self.data_changed = True
 
+    ######################################################################
+    # `Threshold` interface
+    ######################################################################
+    def get_histogram(self, bins=64):
+        """Returns a histogram of the scalars thresholded on, as a tuple
+        of the counts and the bin edges (see `numpy.histogram`).  The
+        histogram is cached until the input changes.
+        """
+        if len(self.inputs) == 0:
+            return None
+        input = self.inputs[0].outputs[0]
+        if self._use_index():
+            self._index.update(input)
+            return self._index.get_histogram(bins)
+        scalars = input.point_data.scalars
+        if scalars is None:
+            scalars = input.cell_data.scalars
+        if scalars is None:
+            return None
+        return get_histogram(scalars, bins)
+
     ######################################################################
     # Non-public interface
     ######################################################################
     def _lower_threshold_changed(self, new_value):
-        fil = self.threshold_filter
-        fil.threshold_between(new_value, self.upper_threshold)
-        fil.update()
+        if self._use_index():
+            self._threshold_sorted()
+        else:
+            fil = self.threshold_filter
+            fil.threshold_between(new_value, self.upper_threshold)
+            fil.update()
         self.data_changed = True
 
     def _upper_threshold_changed(self, new_value):
-        fil = self.threshold_filter
-        fil.threshold_between(self.lower_threshold, new_value)
-        fil.update()
+        if self._use_index():
+            self._threshold_sorted()
+        else:
+            fil = self.threshold_filter
+            fil.threshold_between(self.lower_threshold, new_value)
+            fil.update()
         self.data_changed = True
 
+    def _use_index(self):
+        """Returns if the sorted index is used to threshold the input."""
+        if self.method != 'sorted' or len(self.inputs) == 0:
+            return False
+        index = self._index
+        index.mode = self.filter_type
+        return index.supports(self.inputs[0].outputs[0])
+
+    def _get_output(self):
+        if self._use_index():
+            return self._threshold_sorted()
+        return self.threshold_filter.output
+
+    def _threshold_sorted(self):
+        """Thresholds the input using the sorted index and returns the
+        output.  The output is updated in place so downstream objects
+        only see a data change.
+        """
+        input = self.inputs[0].outputs[0]
+        if hasattr(input, 'update'):
+            input.update()
+        result = self._index.threshold(input, self.lower_threshold,
+                                       self.upper_threshold)
+        output = self._sorted_output
+        if output is None or output.__class__ is not result.__class__:
+            output = result.new_instance()
+            self._sorted_output = output
+        output.shallow_copy(result)
+        return output
+
+    def _method_changed(self):
+        if len(self.inputs) == 0:
+            return
+        if not self._use_index():
+            # The thresholds may have changed while the sorted index was
+            # used.
+            fil = self.threshold_filter
+            fil.threshold_between(self.lower_threshold,
+                                  self.upper_threshold)
+            fil.update()
+        self._set_outputs([self._get_output()])
+
     def _update_ranges(self):
         """Updates the ranges of the input.
         """
@@ -206,17 +293,9 @@ class Threshold(Filter):
         # FIXME: need to be able to handle cell and point data
         # together.
         if ps is not None:
-            data_range = list(ps.range)
-            if np.isnan(data_range[0]):
-                data_range[0] = float(np.nanmin(ps.to_array()))
-            if np.isnan(data_range[1]):
-                data_range[1] = float(np.nanmax(ps.to_array()))
+            data_range = get_array_stats(ps).range
         elif cs is not None:
-            data_range = cs.range
-            if np.isnan(data_range[0]):
-                data_range[0] = float(np.nanmin(cs.to_array()))
-            if np.isnan(data_range[1]):
-                data_range[1] = float(np.nanmax(cs.to_array()))
+            data_range = get_array_stats(cs).range
         return data_range
 
     def _auto_reset_lower_changed(self, value):
@@ -224,16 +303,18 @@ class Threshold(Filter):
             return
         if value:
             dr = self._get_data_range()
-            self._data_min = dr[0]
-            self.lower_threshold = dr[0]
+            if len(dr) > 0:
+                self._data_min = dr[0]
+                self.lower_threshold = dr[0]
 
     def _auto_reset_upper_changed(self, value):
         if len(self.inputs) == 0:
             return
         if value:
             dr = self._get_data_range()
-            self._data_max = dr[1]
-            self.upper_threshold = dr[1]
+            if len(dr) > 0:
+                self._data_max = dr[1]
+                self.upper_threshold = dr[1]
 
     def _get_threshold_filter(self):
         if self.filter_type == 'cells':
@@ -255,10 +336,11 @@ class Threshold(Filter):
             return
         fil = new
         fil.input = self.inputs[0].outputs[0]
-        fil.threshold_between(self.lower_threshold,
-                              self.upper_threshold)
-        fil.update()
-        self._set_outputs([fil.output])
+        if not self._use_index():
+            fil.threshold_between(self.lower_threshold,
+                                  self.upper_threshold)
+            fil.update()
+        self._set_outputs([self._get_output()])
 
     def _threshold_filter_edited(self):
         self.threshold_filter.update()
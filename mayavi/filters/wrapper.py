@@ -16,6 +16,11 @@ from apptools.persistence import state_pickler
 from mayavi.core.pipeline_base import PipelineBase
 from mayavi.core.filter import Filter
 from mayavi.core.common import handle_children_state
+from mayavi.core.propagation import propagator
+
+# The methods called for the events of the wrapped filter.
+FILTER_METHODS = {'pipeline_changed': '_filter_pipeline_changed',
+                  'data_changed': 'update_data'}
 
 ################################################################################
 # `Wrapper` class.
@@ -163,12 +168,12 @@ class Wrapper(Filter):
             self._set_outputs(self.filter.outputs)
 
     def _setup_events(self, obj, remove=False):
-        obj.on_trait_change(self._filter_pipeline_changed,
-                            'pipeline_changed',
-                            remove=remove)
-        obj.on_trait_change(self.update_data,
-                            'data_changed',
-                            remove=remove)
+        # The events go through the propagator so the wrapper is
+        # updated once, after its filter, when its input changes.
+        if remove:
+            propagator.disconnect(obj, self, FILTER_METHODS)
+        else:
+            propagator.connect(obj, self, FILTER_METHODS)
 
     def _visible_changed(self, value):
         self.filter.visible = value
@@ -23,48 +23,51 @@ if not 'wx' in sys.modules:
         """ wxversion not installed """
 
 
-# Mayavi imports
-from mayavi.tools.camera import view, roll, yaw, pitch, move
-from mayavi.tools.figure import figure, clf, gcf, savefig, \
-    draw, sync_camera, close, screenshot
-from mayavi.tools.engine_manager import get_engine, show_pipeline, \
-        options, set_engine
-from mayavi.tools.show import show
-from mayavi.tools.animator import animate
+# The functions of mlab are imported when first used, so that importing
+# mlab is fast: a script only pays for the parts of Mayavi it uses.
+from tvtk.common import LazyModule as _LazyModule
+
+_imports = [
+    ('mayavi.tools.camera', ['view', 'roll', 'yaw', 'pitch', 'move']),
+    ('mayavi.tools.figure', ['figure', 'clf', 'gcf', 'savefig', 'draw',
+                             'sync_camera', 'close', 'screenshot']),
+    ('mayavi.tools.engine_manager', ['get_engine', 'show_pipeline',
+                                     'options', 'set_engine']),
+    ('mayavi.tools.show', ['show']),
+    ('mayavi.tools.animator', ['animate']),
+    ('mayavi.tools.helper_functions', ['contour3d', 'test_contour3d',
+        'quiver3d', 'test_quiver3d', 'test_quiver3d_2d_data',
+        'points3d', 'test_points3d', 'test_molecule',
+        'flow', 'test_flow',
+        'imshow', 'test_imshow',
+        'surf', 'test_surf', 'mesh', 'test_mesh', 'test_simple_surf',
+        'test_mesh_sphere', 'test_fancy_mesh',
+        'contour_surf', 'test_contour_surf',
+        'plot3d', 'test_plot3d',
+        'test_plot3d_anim', 'test_points3d_anim', 'test_contour3d_anim',
+        'test_simple_surf_anim', 'test_flow_anim', 'test_mesh_sphere_anim',
+        'triangular_mesh', 'test_triangular_mesh', 'barchart',
+        'test_barchart']),
+    ('mayavi.tools.decorations', ['colorbar', 'scalarbar', 'vectorbar',
+        'outline', 'axes', 'xlabel', 'ylabel', 'zlabel', 'text', 'title',
+        'orientation_axes', 'text3d']),
+    ('mayavi.tools.pipeline', None),
+    ('mayavi.tools.tools', ['start_recording', 'stop_recording']),
+]
 
 def show_engine():
     """ This function is deprecated, please use show_pipeline.
     """
     import warnings
+    from mayavi.tools.engine_manager import show_pipeline
     warnings.warn('The show_engine function is deprecated, please use'
                     'show_pipeline', stacklevel=2)
     return show_pipeline()
 
-from tools.helper_functions import contour3d, test_contour3d, \
-    quiver3d, test_quiver3d, test_quiver3d_2d_data, \
-    points3d, test_points3d, test_molecule, \
-    flow, test_flow, \
-    imshow, test_imshow, \
-    surf, test_surf, mesh, test_mesh, test_simple_surf, \
-    test_mesh_sphere, test_fancy_mesh,\
-    contour_surf, test_contour_surf, \
-    plot3d, test_plot3d, \
-    test_plot3d_anim, test_points3d_anim, test_contour3d_anim,\
-    test_simple_surf_anim, test_flow_anim, test_mesh_sphere_anim, \
-    triangular_mesh, test_triangular_mesh, barchart, \
-    test_barchart
-
-
-from tools.decorations import colorbar, scalarbar, vectorbar, \
-    outline, axes, xlabel, ylabel, zlabel, text, title, \
-    orientation_axes, text3d
-
-import tools.pipeline as pipeline
-
-from tools.tools import start_recording, stop_recording
-
 if __name__ == "__main__":
     import numpy
+    from mayavi.tools.helper_functions import plot3d, points3d
+    from mayavi.tools.decorations import colorbar, axes, outline, title
 
     n_mer, n_long = 6, 11
     pi = numpy.pi
@@ -95,4 +98,5 @@ if __name__ == "__main__":
     outline(pl)
 
     title('Mayavi rocks', height=0.85)
-
+else:
+    sys.modules[__name__] = _LazyModule(__name__, _imports, globals())
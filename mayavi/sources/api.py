@@ -11,6 +11,7 @@ from builtin_image import BuiltinImage
 from builtin_surface import BuiltinSurface
 from chaco_reader import ChacoReader
 from image_reader import ImageReader
+from image_stack_reader import ImageStackReader
 from parametric_surface import ParametricSurface
 from plot3d_reader import PLOT3DReader
 from point_load import PointLoad
@@ -17,6 +17,7 @@ from tvtk import array_handler
 # Local imports
 from mayavi.core.source import Source
 from mayavi.core.pipeline_info import PipelineInfo
+from mayavi.core.session import array_to_state, array_from_state
 
 def _check_scalar_array(obj, name, value):
     """Validates a scalar array passed to the object."""
@@ -139,8 +140,18 @@ class ArraySource(Source):
     def __get_pure_state__(self):
         d = super(ArraySource, self).__get_pure_state__()
         d.pop('image_data', None)
+        # In a session, the arrays are stored apart.
+        for name in ('scalar_data', 'vector_data'):
+            if name in d:
+                d[name] = array_to_state(d[name])
         return d
 
+    def __set_pure_state__(self, state):
+        for name in ('scalar_data', 'vector_data'):
+            if name in state:
+                state[name] = array_from_state(state[name])
+        super(ArraySource, self).__set_pure_state__(state)
+
     ######################################################################
     # ArraySource interface.
     ######################################################################
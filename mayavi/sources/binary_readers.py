@@ -0,0 +1,490 @@
+"""Readers of binary STL, PLY and particle files that memory map the
+file with NumPy.
+
+The VTK readers of these formats parse the files one point (or
+triangle) at a time and the STL reader merges the duplicate vertices
+of the triangles with a point locator.  The readers here view the file
+as a NumPy structured array instead, merge the vertices with a sort
+and hand the arrays to a `tvtk.PolyData` without copying them where
+the layout of the file allows it.  The files are mapped copy-on-write,
+so the arrays can be modified in place without changing the files.
+The files these readers cannot read (text files for example) are read
+with the VTK reader of the format.
+
+The readers mimic the tvtk readers so they can be used by the
+`PolyDataReader`: they have a `file_name`, an `output` and `update` and
+`update_information` methods.
+
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+from os.path import getsize, getmtime, isfile
+
+import numpy
+
+# Enthought library imports.
+from traits.api import HasTraits, Str, Instance, Enum, Bool, Any
+from traitsui.api import View, Group, Item
+from tvtk.api import tvtk
+from tvtk.array_handler import ID_TYPE_CODE
+
+# Local imports.
+from mayavi.core.file_format import is_binary_stl
+
+# The NumPy types of the PLY types.
+PLY_TYPES = {'char': 'i1', 'int8': 'i1',
+             'uchar': 'u1', 'uint8': 'u1',
+             'short': 'i2', 'int16': 'i2',
+             'ushort': 'u2', 'uint16': 'u2',
+             'int': 'i4', 'int32': 'i4',
+             'uint': 'u4', 'uint32': 'u4',
+             'float': 'f4', 'float32': 'f4',
+             'double': 'f8', 'float64': 'f8'}
+
+# The byte order of the binary PLY formats.
+PLY_FORMATS = {'binary_little_endian': '<',
+               'binary_big_endian': '>'}
+
+# The record of a triangle in a binary STL file.
+STL_DTYPE = numpy.dtype([('normal', '<f4', (3,)),
+                         ('vertices', '<f4', (3, 3)),
+                         ('attribute', '<u2')])
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def merge_points(points):
+    """Merges the identical rows of the (N, 3) `points`.  Returns the
+    unique points, in the order they first occur, and the index of
+    every point into them.
+    """
+    # Adding zero turns -0.0 into 0.0, which compare equal.
+    points = numpy.ascontiguousarray(points + points.dtype.type(0))
+    n = len(points)
+    if n == 0:
+        return points, numpy.zeros(0, ID_TYPE_CODE)
+    # Sort on a hash of the bits of the coordinates, which is much
+    # faster than sorting the rows.
+    bits = points.view('u%d'%points.itemsize).astype(numpy.uint64)
+    key = (bits[:, 0]*numpy.uint64(0x9E3779B97F4A7C15)) ^ bits[:, 1]
+    key = (key*numpy.uint64(0xC2B2AE3D27D4EB4F)) ^ bits[:, 2]
+    order = numpy.argsort(key)
+    key = key[order]
+    is_new = numpy.empty(n, bool)
+    is_new[0] = True
+    numpy.not_equal(key[1:], key[:-1], is_new[1:])
+    sorted_bits = bits[order]
+    if (sorted_bits[1:] != sorted_bits[:-1]).any(axis=1)[~is_new[1:]].any():
+        # Different points with the same hash, compare the rows.
+        is_new[1:] |= (sorted_bits[1:] != sorted_bits[:-1]).any(axis=1)
+    starts = numpy.flatnonzero(is_new)
+    # The first occurrence of each point and the rank of the points in
+    # the order of their first occurrence.
+    first = numpy.minimum.reduceat(order, starts)
+    is_first = numpy.zeros(n, bool)
+    is_first[first] = True
+    rank = numpy.cumsum(is_first, dtype=ID_TYPE_CODE) - 1
+    index = numpy.empty(n, ID_TYPE_CODE)
+    index[order] = numpy.repeat(rank[first], numpy.diff(numpy.r_[starts, n]))
+    return points[is_first], index
+
+def make_cells(connectivity):
+    """Returns a `tvtk.CellArray` of the cells in the (N, M) array of
+    the ids of their points.
+    """
+    cells = tvtk.CellArray()
+    cells.from_array(numpy.asarray(connectivity, ID_TYPE_CODE))
+    return cells
+
+def read_binary_stl(filename, merging=True):
+    """Reads a binary STL file.  Returns the points and the (N, 3)
+    triangles, or None if the file is not a binary STL file.  If
+    `merging` is True the duplicate vertices are merged.
+    """
+    f = open(filename, 'rb')
+    try:
+        header = f.read(84)
+    finally:
+        f.close()
+    if not is_binary_stl(header, getsize(filename)):
+        return None
+    n = (getsize(filename) - 84)//STL_DTYPE.itemsize
+    if n == 0:
+        return numpy.zeros((0, 3), 'f'), numpy.zeros((0, 3), ID_TYPE_CODE)
+    data = numpy.memmap(filename, STL_DTYPE, mode='c', offset=84, shape=(n,))
+    vertices = data['vertices'].reshape(-1, 3)
+    if merging:
+        points, index = merge_points(vertices)
+        return points, index.reshape(n, 3)
+    triangles = numpy.arange(3*n, dtype=ID_TYPE_CODE).reshape(n, 3)
+    return numpy.array(vertices, 'f'), triangles
+
+def read_ply_header(filename):
+    """Returns the byte order of a binary PLY file, the size of its
+    header and its elements as a list of (name, count, properties)
+    tuples.  A property is a (name, type) tuple, with a (count type,
+    item type) tuple as type for list properties.  Returns None if the
+    file is not a binary PLY file.
+    """
+    f = open(filename, 'rb')
+    try:
+        if f.readline().strip() != 'ply':
+            return None
+        order = None
+        elements = []
+        while True:
+            line = f.readline()
+            if len(line) == 0:
+                return None
+            words = line.split()
+            if len(words) == 0 or words[0] in ('comment', 'obj_info'):
+                continue
+            if words[0] == 'end_header':
+                break
+            if words[0] == 'format':
+                order = PLY_FORMATS.get(words[1])
+            elif words[0] == 'element':
+                elements.append((words[1], int(words[2]), []))
+            elif words[0] == 'property' and len(elements) > 0:
+                if words[1] == 'list':
+                    kind = (PLY_TYPES[words[2]], PLY_TYPES[words[3]])
+                else:
+                    kind = PLY_TYPES[words[1]]
+                elements[-1][2].append((words[-1], kind))
+        size = f.tell()
+    finally:
+        f.close()
+    if order is None:
+        return None
+    return order, size, elements
+
+def _get_ply_dtype(order, properties, list_size=None):
+    """Returns the dtype of the records of a PLY element, with the list
+    properties holding `list_size` items.
+    """
+    fields = []
+    for name, kind in properties:
+        if isinstance(kind, tuple):
+            fields.append(('%s_count'%name, order + kind[0]))
+            fields.append((name, order + kind[1], (list_size,)))
+        else:
+            fields.append((name, order + kind))
+    return numpy.dtype(fields)
+
+def read_binary_ply(filename):
+    """Reads a binary PLY file.  Returns a dictionary of the points,
+    the (N, 3) triangles and the 'normals' and 'colors' of the points
+    found in the file, or None if the file is not a binary PLY file of
+    triangles.
+    """
+    header = read_ply_header(filename)
+    if header is None:
+        return None
+    order, offset, elements = header
+    size = getsize(filename)
+    data = {}
+    indices = None
+    for name, count, properties in elements:
+        lists = [n for n, kind in properties if isinstance(kind, tuple)]
+        if name == 'face' and len(lists) == 1:
+            # Only triangles are read, the faces then have a fixed size.
+            indices = lists[0]
+            dtype = _get_ply_dtype(order, properties, 3)
+        elif len(lists) > 0:
+            # The offset of the next elements is unknown.
+            break
+        else:
+            dtype = _get_ply_dtype(order, properties)
+        if offset + count*dtype.itemsize > size:
+            return None
+        if count > 0:
+            data[name] = numpy.memmap(filename, dtype, mode='c',
+                                      offset=offset, shape=(count,))
+        else:
+            data[name] = numpy.zeros(0, dtype)
+        offset += count*dtype.itemsize
+
+    vertices = data.get('vertex')
+    if vertices is None:
+        return None
+    result = {'points': _get_columns(vertices, ('x', 'y', 'z'), 'f')}
+    names = vertices.dtype.names
+    if 'nx' in names:
+        result['normals'] = _get_columns(vertices, ('nx', 'ny', 'nz'), 'f')
+    colors = [c for c in ('red', 'green', 'blue', 'alpha') if c in names]
+    if len(colors) >= 3:
+        result['colors'] = _get_columns(vertices, colors, numpy.uint8)
+
+    faces = data.get('face')
+    if faces is not None:
+        if not (faces['%s_count'%indices] == 3).all():
+            return None
+        result['triangles'] = faces[indices]
+    return result
+
+def _get_columns(records, names, dtype):
+    """Returns the fields `names` of the structured array `records` as
+    the columns of a 2D array of `dtype`.  The records are viewed
+    without a copy if they only hold these fields in the native byte
+    order.
+    """
+    rd = records.dtype
+    if rd.names == tuple(names) and \
+       all(rd.fields[n][0] == numpy.dtype(dtype) for n in names):
+        return numpy.asarray(records).view(dtype).reshape(-1, len(names))
+    result = numpy.empty((len(records), len(names)), dtype)
+    for i, name in enumerate(names):
+        result[:, i] = records[name]
+    return result
+
+def is_text(filename, size=512):
+    """Returns True if the first `size` bytes of the file are text."""
+    f = open(filename, 'rb')
+    try:
+        header = f.read(size)
+    finally:
+        f.close()
+    text = header.translate(None, '\t\n\r\f\v')
+    return all(32 <= ord(c) < 127 for c in text)
+
+
+######################################################################
+# `MemoryMappedReader` class.
+######################################################################
+class MemoryMappedReader(HasTraits):
+    """Base class of the readers memory mapping the files with NumPy.
+
+    Subclasses implement `_read` and `_get_fallback`.
+    """
+
+    # The file read.
+    file_name = Str
+
+    # The output of the reader.
+    output = Instance(tvtk.PolyData, args=(), allow_none=False)
+
+    ########################################
+    # Private traits.
+
+    # The VTK reader of the files that are not read natively.
+    _fallback = Instance(tvtk.Object)
+
+    # The file, modification time and options last read.
+    _key = Any
+
+    ######################################################################
+    # `object` interface
+    ######################################################################
+    def __get_pure_state__(self):
+        d = dict((name, getattr(self, name)) for name in self._get_options())
+        d['file_name'] = self.file_name
+        return d
+
+    ######################################################################
+    # `MemoryMappedReader` interface
+    ######################################################################
+    def update(self):
+        """Reads the file if it or the options changed since it was
+        last read.
+        """
+        fname = self.file_name
+        if len(fname) == 0 or not isfile(fname):
+            return
+        key = (fname, getmtime(fname),
+               tuple(getattr(self, n) for n in self._get_options()))
+        if key == self._key:
+            return
+        self._key = key
+        output = self.output
+        output.initialize()
+        if not self._read(fname, output):
+            fallback = self._get_fallback()
+            fallback.file_name = fname
+            fallback.update()
+            output.shallow_copy(fallback.output)
+        output.modified()
+
+    def update_information(self):
+        pass
+
+    ######################################################################
+    # Non-public interface
+    ######################################################################
+    def _get_options(self):
+        """Returns the names of the traits changing what is read."""
+        return []
+
+    def _read(self, filename, output):
+        """Reads the file into `output`.  Returns False if the file has
+        to be read by the VTK reader instead.
+        """
+        raise NotImplementedError
+
+    def _get_fallback(self):
+        """Returns the VTK reader used for the files not read."""
+        raise NotImplementedError
+
+    def _reread(self):
+        self._key = None
+        self.update()
+
+
+######################################################################
+# `STLReader` class.
+######################################################################
+class STLReader(MemoryMappedReader):
+    """Reads binary STL files by memory mapping them, and ASCII STL
+    files with `tvtk.STLReader`.
+    """
+
+    # Merge the duplicate vertices of the triangles.
+    merging = Bool(True, desc='if the duplicate vertices are merged')
+
+    view = View(Group(Item(name='file_name', style='readonly'),
+                      Item(name='merging')))
+
+    def _get_options(self):
+        return ['merging']
+
+    def _read(self, filename, output):
+        data = read_binary_stl(filename, self.merging)
+        if data is None:
+            return False
+        points, triangles = data
+        output.points = points
+        output.polys = make_cells(triangles)
+        return True
+
+    def _get_fallback(self):
+        if self._fallback is None:
+            self._fallback = tvtk.STLReader()
+        self._fallback.merging = self.merging
+        return self._fallback
+
+    def _merging_changed(self):
+        self._reread()
+
+
+######################################################################
+# `PLYReader` class.
+######################################################################
+class PLYReader(MemoryMappedReader):
+    """Reads binary PLY files of triangles by memory mapping them, and
+    the other PLY files with `tvtk.PLYReader`.
+
+    The points, their normals and colors and the triangles are read.
+    """
+
+    view = View(Group(Item(name='file_name', style='readonly')))
+
+    def _read(self, filename, output):
+        data = read_binary_ply(filename)
+        if data is None:
+            return False
+        output.points = data['points']
+        if 'triangles' in data:
+            output.polys = make_cells(data['triangles'])
+        pd = output.point_data
+        if 'normals' in data:
+            pd.normals = data['normals']
+            pd.normals.name = 'Normals'
+        if 'colors' in data:
+            pd.scalars = data['colors']
+            pd.scalars.name = 'RGB'
+        return True
+
+    def _get_fallback(self):
+        if self._fallback is None:
+            self._fallback = tvtk.PLYReader()
+        return self._fallback
+
+
+######################################################################
+# `ParticleReader` class.
+######################################################################
+class ParticleReader(MemoryMappedReader):
+    """Reads binary particle files by memory mapping them, and text
+    particle files with `tvtk.ParticleReader`.
+
+    A particle is made of its coordinates and, optionally, a scalar.
+    The traits are those of `tvtk.ParticleReader`.
+    """
+
+    # The byte order of binary files.
+    data_byte_order = Enum('big_endian', 'little_endian',
+                           desc='the byte order of binary files')
+
+    # The type of the values.
+    data_type = Enum('float', 'double', desc='the type of the values')
+
+    # The type of the file, 'unknown' if it has to be guessed.
+    file_type = Enum('unknown', 'text', 'binary',
+                     desc='the type of the file')
+
+    # Has every particle a scalar.
+    has_scalar = Bool(True, desc='if every particle has a scalar')
+
+    view = View(Group(Item(name='file_name', style='readonly'),
+                      Item(name='file_type'),
+                      Item(name='data_byte_order'),
+                      Item(name='data_type'),
+                      Item(name='has_scalar')))
+
+    def _get_options(self):
+        return ['data_byte_order', 'data_type', 'file_type', 'has_scalar']
+
+    def _read(self, filename, output):
+        if self.file_type == 'text' or \
+           (self.file_type == 'unknown' and is_text(filename)):
+            return False
+        order = {'big_endian': '>', 'little_endian': '<'}
+        kind = {'float': 'f4', 'double': 'f8'}[self.data_type]
+        dtype = numpy.dtype(order[self.data_byte_order] + kind)
+        n_components = 3 + int(self.has_scalar)
+        n = getsize(filename)//(dtype.itemsize*n_components)
+        if n > 0:
+            data = numpy.memmap(filename, dtype, mode='c',
+                                shape=(n, n_components))
+        else:
+            data = numpy.zeros((0, n_components), dtype)
+        native = dtype.newbyteorder('=')
+        if self.has_scalar or not dtype.isnative:
+            points = data[:, :3].astype(native)
+        else:
+            points = numpy.asarray(data)
+        output.points = points
+        # All the particles are in one vertex cell, as with VTK.
+        verts = numpy.empty(n + 1, ID_TYPE_CODE)
+        verts[0] = n
+        verts[1:] = numpy.arange(n)
+        cells = tvtk.CellArray()
+        cells.set_cells(1, verts)
+        output.verts = cells
+        if self.has_scalar:
+            output.point_data.scalars = data[:, 3].astype(native)
+            output.point_data.scalars.name = 'Scalar'
+        return True
+
+    def _get_fallback(self):
+        if self._fallback is None:
+            self._fallback = tvtk.ParticleReader()
+        self._fallback.set(data_byte_order=self.data_byte_order,
+                           data_type=self.data_type,
+                           file_type=self.file_type,
+                           has_scalar=self.has_scalar)
+        return self._fallback
+
+    def _data_byte_order_changed(self):
+        self._reread()
+
+    def _data_type_changed(self):
+        self._reread()
+
+    def _file_type_changed(self):
+        self._reread()
+
+    def _has_scalar_changed(self):
+        self._reread()
@@ -12,13 +12,29 @@
 from os.path import basename
 
 # Enthought library imports.
-from traits.api import Instance, Str, Dict
+from traits.api import Instance
 from traitsui.api import View, Group, Item, Include
 from tvtk.api import tvtk
 
 # Local imports.
 from mayavi.core.file_data_source import FileDataSource
 from mayavi.core.pipeline_info import PipelineInfo
+from mayavi.core.file_format import ReaderCache
+
+# The names of the tvtk readers of the image formats.  The MINC reader
+# is not available before VTK 5.2.
+IMAGE_READERS = {'bmp': 'BMPReader',
+                 'jpg': 'JPEGReader',
+                 'jpeg': 'JPEGReader',
+                 'png': 'PNGReader',
+                 'pnm': 'PNMReader',
+                 'dcm': 'DICOMImageReader',
+                 'tiff': 'TIFFReader',
+                 'ximg': 'GESignaReader',
+                 'dem': 'DEMReader',
+                 'mha': 'MetaImageReader',
+                 'mhd': 'MetaImageReader',
+                 'mnc': 'MINCImageReader'}
 
 
 ########################################################################
@@ -50,37 +66,25 @@ class ImageReader(FileDataSource):
 
     ######################################################################
     # Private Traits
-    _image_reader_dict = Dict(Str, Instance(tvtk.Object))
+
+    # The readers of the image formats, made on demand.
+    _readers = Instance(ReaderCache)
 
     ######################################################################
     # `object` interface
     ######################################################################
-    def __init__(self, **traits):
-        d = {'bmp':tvtk.BMPReader(),
-             'jpg':tvtk.JPEGReader(),
-             'png':tvtk.PNGReader(),
-             'pnm':tvtk.PNMReader(),
-             'dcm':tvtk.DICOMImageReader(),
-             'tiff':tvtk.TIFFReader(),
-             'ximg':tvtk.GESignaReader(),
-             'dem':tvtk.DEMReader(),
-             'mha':tvtk.MetaImageReader(),
-             'mhd':tvtk.MetaImageReader(),
-            }
-        # Account for pre 5.2 VTk versions, without MINC reader
-        if hasattr(tvtk, 'MINCImageReader'):
-            d['mnc'] = tvtk.MINCImageReader()
-        d['jpeg'] = d['jpg']
-        self._image_reader_dict = d
-        # Call parent class' init.
-        super(ImageReader, self).__init__(**traits)
-
     def __set_pure_state__(self, state):
         # The reader has its own file_name which needs to be fixed.
         state.reader.file_name = state.file_path.abs_pth
         # Now call the parent class to setup everything.
         super(ImageReader, self).__set_pure_state__(state)
 
+    def __get_pure_state__(self):
+        d = super(ImageReader, self).__get_pure_state__()
+        # The readers are made on demand.
+        d.pop('_readers', None)
+        return d
+
     ######################################################################
     # `FileDataSource` interface
     ######################################################################
@@ -97,15 +101,12 @@ class ImageReader(FileDataSource):
         value = fpath.get()
         if len(value) == 0:
             return
-        # Extract the file extension
-        splitname = value.strip().split('.')
-        extension = splitname[-1].lower()
         # Select image reader based on file type
         old_reader = self.reader
-        if self._image_reader_dict.has_key(extension):
-            self.reader = self._image_reader_dict[extension]
-        else:
-            self.reader = tvtk.ImageReader()
+        reader = self._readers.get_reader(value)
+        if reader is None:
+            reader = tvtk.ImageReader()
+        self.reader = reader
 
         self.reader.file_name = value.strip()
         self.reader.update()
@@ -133,3 +134,6 @@ class ImageReader(FileDataSource):
 
         return ret
 
+    def __readers_default(self):
+        """Default value for the readers."""
+        return ReaderCache(IMAGE_READERS)
@@ -0,0 +1,282 @@
+"""A reader of stacks of 2D images, such as CT or microscopy slices or
+DICOM series, that decodes the slices in parallel.
+
+The slices are decoded by a pool of worker processes into a volume
+array allocated up front, which can be memory mapped to a `.npy` file
+for volumes that do not fit in memory.  The workers then write their
+slices straight into the file.  The volume is shown as image data by
+an `ArraySource`.
+
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import glob
+import re
+import threading
+import traceback
+import multiprocessing
+
+import numpy
+from numpy.lib.format import open_memmap
+
+# Enthought library imports.
+from traits.api import Str, List, Int, Range, Bool
+from traitsui.api import View, Group, Item
+
+# Local imports.
+from mayavi.core import common
+from mayavi.core.common import invoke_later, error
+from mayavi.core.file_format import ReaderCache
+from mayavi.sources.array_source import ArraySource
+from mayavi.sources.image_reader import IMAGE_READERS
+
+# The image readers of a worker process.
+_readers = None
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def _natural_key(filename):
+    """Sorts the numbers in file names by their value."""
+    return [int(t) if t.isdigit() else t
+            for t in re.split(r'(\d+)', filename)]
+
+def get_file_names(pattern):
+    """Returns the files matching the glob `pattern`, in the natural
+    order of their names (so that 'slice10' comes after 'slice9').
+    """
+    return sorted(glob.glob(pattern), key=_natural_key)
+
+def read_slice(filename, readers=None):
+    """Decodes the image file `filename` with a reader of the
+    `ReaderCache` `readers`, or of the worker process if it is None.
+    Returns its pixels as an (ny, nx) array and its spacing.  Colour
+    images are turned to gray levels.
+    """
+    global _readers
+    if readers is None:
+        if _readers is None:
+            _readers = ReaderCache(IMAGE_READERS)
+        readers = _readers
+    reader = readers.get_reader(filename)
+    if reader is None:
+        raise IOError('Unknown image format: %s'%filename)
+    reader.file_name = filename
+    reader.update()
+    image = reader.output
+    nx, ny, nz = image.dimensions
+    scalars = image.point_data.scalars
+    if scalars is None or nz != 1:
+        raise IOError('Not a 2D image: %s'%filename)
+    data = scalars.to_array()
+    if data.ndim > 1:
+        data = data[:, :3].mean(axis=1).astype(data.dtype)
+    # The array of the reader is reused for the next file.
+    return numpy.array(data.reshape(ny, nx)), tuple(image.spacing)
+
+def decode_slice(args, readers=None):
+    """Decodes a slice given as a tuple of its index, its file name and
+    the `.npy` file holding the volume, or None.  The slice is written
+    to the file if any.  Returns the index and the pixels of the slice,
+    or None if they were written to the file.
+
+    This is run in the worker processes, or in this process with the
+    readers of the load.
+    """
+    index, filename, volume_file = args
+    data, spacing = read_slice(filename, readers)
+    if volume_file is None:
+        return index, data
+    volume = open_memmap(volume_file, mode='r+')
+    if volume.shape[1:] != data.shape:
+        raise ValueError('The size of %s differs from the first slice'%
+                         filename)
+    volume[index] = data
+    volume.flush()
+    return index, None
+
+def load_stack(file_names, n_processes=0, volume_file='', callback=None):
+    """Decodes the images `file_names` into a volume of shape (number of
+    files, ny, nx).  The slices are decoded by `n_processes` worker
+    processes, or in this process if it is 0.  If `volume_file` is given
+    the volume is memory mapped to this `.npy` file.  `callback` is
+    called with the number of slices read and the number of slices
+    after each slice.  Returns the volume and the spacing of the first
+    image.
+    """
+    # The readers are not shared with the loads of other threads.
+    readers = ReaderCache(IMAGE_READERS)
+    n = len(file_names)
+    first, spacing = read_slice(file_names[0], readers)
+    shape = (n,) + first.shape
+    if len(volume_file) > 0:
+        volume = open_memmap(volume_file, mode='w+', dtype=first.dtype,
+                             shape=shape)
+        volume.flush()
+    else:
+        volume = numpy.empty(shape, first.dtype)
+    volume[0] = first
+    if callback is not None:
+        callback(1, n)
+
+    jobs = [(i, file_names[i], volume_file or None) for i in range(1, n)]
+    pool = None
+    if n_processes > 0 and len(jobs) > 1:
+        pool = multiprocessing.Pool(n_processes)
+        chunk = max(1, len(jobs)//(8*n_processes))
+        results = pool.imap_unordered(decode_slice, jobs, chunk)
+    else:
+        results = (decode_slice(job, readers) for job in jobs)
+    try:
+        for count, (index, data) in enumerate(results):
+            if data is not None:
+                if data.shape != shape[1:]:
+                    raise ValueError('The size of %s differs from the '
+                                     'first slice'%file_names[index])
+                volume[index] = data
+            if callback is not None:
+                callback(count + 2, n)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    return volume, spacing
+
+
+######################################################################
+# `ImageStackReader` class.
+######################################################################
+class ImageStackReader(ArraySource):
+    """Reads a stack of 2D images of the same size, one per slice, as
+    a volume.  The slices are decoded in parallel by `n_processes`
+    worker processes.  With a UI, the stack is loaded on a worker
+    thread and the volume is shown once it is loaded.
+    """
+
+    # The version of this class.  Used for persistence.
+    __version__ = 0
+
+    # The glob pattern of the files of the slices, e.g. 'ct/*.dcm'.
+    file_pattern = Str(desc='the pattern of the slice files')
+
+    # The files of the slices, in order.
+    file_names = List(Str)
+
+    # The number of worker processes decoding the slices, 0 to decode
+    # them in this process.
+    n_processes = Int(desc='the number of worker processes')
+
+    # The `.npy` file the volume is memory mapped to, if any.
+    volume_file = Str(desc='the file the volume is memory mapped to')
+
+    # The fraction of the slices loaded.
+    progress = Range(0.0, 1.0, 0.0)
+
+    # Is the stack being loaded.
+    loading = Bool(False)
+
+    ########################################
+    # Private traits.
+
+    # Must the stack be loaded again once the current load is done.
+    _reload = Bool(False)
+
+    # Our view.
+    view = View(Group(Item(name='file_pattern'),
+                      Item(name='n_processes'),
+                      Item(name='volume_file'),
+                      Item(name='progress', style='readonly'),
+                      Item(name='spacing'),
+                      Item(name='origin'),
+                      show_labels=True))
+
+    ######################################################################
+    # `object` interface.
+    ######################################################################
+    def __init__(self, **traits):
+        # Load the files once the other traits are set.
+        file_pattern = traits.pop('file_pattern', '')
+        file_names = traits.pop('file_names', None)
+        super(ImageStackReader, self).__init__(**traits)
+        if len(file_pattern) > 0:
+            self.file_pattern = file_pattern
+        elif file_names is not None:
+            self.file_names = file_names
+
+    def __get_pure_state__(self):
+        d = super(ImageStackReader, self).__get_pure_state__()
+        # The volume is read again from the files.
+        for name in ('scalar_data', 'vector_data', 'progress', 'loading',
+                     '_reload'):
+            d.pop(name, None)
+        return d
+
+    ######################################################################
+    # `ImageStackReader` interface.
+    ######################################################################
+    def load(self):
+        """(Re)loads the volume from the files.  If a load is running,
+        the volume is loaded again when it is done.
+        """
+        if self.loading:
+            self._reload = True
+            return
+        file_names = list(self.file_names)
+        if len(file_names) == 0:
+            return
+        self.set(loading=True, progress=0.0)
+        args = (file_names, self.n_processes, self.volume_file)
+        if common.pyface is None:
+            self._load(args, self._set_progress, self._loaded)
+        else:
+            def progress(count, n):
+                invoke_later(self._set_progress, count, n)
+            def done(*result):
+                invoke_later(self._loaded, *result)
+            thread = threading.Thread(target=self._load,
+                                      args=(args, progress, done))
+            thread.daemon = True
+            thread.start()
+
+    ######################################################################
+    # Non-public interface.
+    ######################################################################
+    def _load(self, args, progress, done):
+        try:
+            volume, spacing = load_stack(*args, callback=progress)
+        except Exception:
+            done(None, None, 'Error loading the image stack:\n%s'%
+                 traceback.format_exc())
+        else:
+            done(volume, spacing, None)
+
+    def _set_progress(self, count, n):
+        self.progress = float(count)/n
+
+    def _loaded(self, volume, spacing, message):
+        self.loading = False
+        if self._reload:
+            # The files or options changed during the load.
+            self._reload = False
+            self.load()
+            return
+        if message is not None:
+            error(message)
+            return
+        self.spacing = spacing
+        # The volume is in (z, y, x) order, its transpose is not copied
+        # when it is handed to VTK.
+        self.transpose_input_array = True
+        self.scalar_data = volume.T
+
+    def _n_processes_default(self):
+        return multiprocessing.cpu_count()
+
+    def _file_pattern_changed(self, value):
+        self.file_names = get_file_names(value)
+
+    def _file_names_changed(self):
+        self.load()
@@ -9,14 +9,16 @@
 from os.path import basename
 
 # Enthought imports.
-from traits.api import Instance, Str,Dict
+from traits.api import Instance, HasTraits
 from traitsui.api import View, Item, Group, Include
 from tvtk.api import tvtk
 
 # Local imports
 from mayavi.core.file_data_source import FileDataSource
 from mayavi.core.pipeline_info import PipelineInfo
+from mayavi.core.file_format import ReaderCache
 from mayavi.core.common import error
+from mayavi.sources import binary_readers
 
 ########################################################################
 # `PolyDataReader` class
@@ -30,13 +32,16 @@ class PolyDataReader(FileDataSource):
     # The version of this class.  Used for persistence.
     __version__ = 0
 
-    # The PolyData file reader
-    reader = Instance(tvtk.Object, allow_none=False,
+    # The PolyData file reader, a tvtk reader or one of the
+    # `binary_readers`.
+    reader = Instance(HasTraits, allow_none=False,
                       record=True)
 
     ######################################################################
     # Private Traits
-    _reader_dict = Dict(Str, Instance(tvtk.Object))
+
+    # The readers of the file formats, made on demand.
+    _readers = Instance(ReaderCache)
 
     # Our View.
     view = View(Group(Include('time_step_group'),
@@ -62,6 +67,12 @@ class PolyDataReader(FileDataSource):
         # Now call the parent class to setup everything.
         super(PolyDataReader, self).__set_pure_state__(state)
 
+    def __get_pure_state__(self):
+        d = super(PolyDataReader, self).__get_pure_state__()
+        # The readers are made on demand.
+        d.pop('_readers', None)
+        return d
+
     ######################################################################
     # `FileDataSource` interface
     ######################################################################
@@ -79,16 +90,13 @@ class PolyDataReader(FileDataSource):
         if len(value) == 0:
             return
 
-        # Extract the file extension
-        splitname = value.strip().split('.')
-        extension = splitname[-1].lower()
-        # Select polydata reader based on file type
-        old_reader = self.reader
-        if self._reader_dict.has_key(extension):
-            self.reader = self._reader_dict[extension]
-        else:
+        # Select the reader based on the file type.
+        reader = self._readers.get_reader(value)
+        if reader is None:
             error('Invalid extension for file: %s'%value)
             return
+        old_reader = self.reader
+        self.reader = reader
 
         self.reader.file_name = value.strip()
         self.reader.update()
@@ -119,23 +127,22 @@ class PolyDataReader(FileDataSource):
 
         return ret
 
-    def __reader_dict_default(self):
-        """Default value for reader dict."""
-        rd = {'stl':tvtk.STLReader(),
-             'stla':tvtk.STLReader(),
-             'stlb':tvtk.STLReader(),
-             'txt':tvtk.SimplePointsReader(),
-             'raw':tvtk.ParticleReader(),
-             'ply':tvtk.PLYReader(),
-             'pdb':tvtk.PDBReader(),
-             'slc':tvtk.SLCReader(),
-             'xyz':tvtk.XYZMolReader(),
-             'obj':tvtk.OBJReader(),
-             'facet':tvtk.FacetReader(),
-             'cube':tvtk.GaussianCubeReader(),
-             'g':tvtk.BYUReader(),
-            }
-        return rd
+    def __readers_default(self):
+        """Default value for the readers."""
+        # Binary STL, PLY and particle files are memory mapped.
+        return ReaderCache({'stl': binary_readers.STLReader,
+                            'stla': 'STLReader',
+                            'stlb': binary_readers.STLReader,
+                            'txt': 'SimplePointsReader',
+                            'raw': binary_readers.ParticleReader,
+                            'ply': binary_readers.PLYReader,
+                            'pdb': 'PDBReader',
+                            'slc': 'SLCReader',
+                            'xyz': 'XYZMolReader',
+                            'obj': 'OBJReader',
+                            'facet': 'FacetReader',
+                            'cube': 'GaussianCubeReader',
+                            'g': 'BYUReader'})
 
     # Callable to check if the reader can actually read the file
     def can_read(cls,filename):
@@ -8,13 +8,14 @@
 from os.path import basename
 
 # Enthought library imports.
-from traits.api import Instance, Str, Dict
+from traits.api import Instance
 from traitsui.api import View, Group, Item, Include
 from tvtk.api import tvtk
 
 # Local imports.
 from mayavi.core.file_data_source import FileDataSource
 from mayavi.core.pipeline_info import PipelineInfo
+from mayavi.core.file_format import ReaderCache
 from mayavi.core.common import error
 
 ########################################################################
@@ -33,7 +34,9 @@ class UnstructuredGridReader(FileDataSource):
 
     ######################################################################
     # Private Traits
-    _reader_dict = Dict(Str, Instance(tvtk.Object))
+
+    # The readers of the file formats, made on demand.
+    _readers = Instance(ReaderCache)
 
     # Our view.
     view = View(Group(Include('time_step_group'),
@@ -54,6 +57,12 @@ class UnstructuredGridReader(FileDataSource):
         # Now call the parent class to setup everything.
         super(UnstructuredGridReader, self).__set_pure_state__(state)
 
+    def __get_pure_state__(self):
+        d = super(UnstructuredGridReader, self).__get_pure_state__()
+        # The readers are made on demand.
+        d.pop('_readers', None)
+        return d
+
     ######################################################################
     # `FileDataSource` interface
     ######################################################################
@@ -70,16 +79,13 @@ class UnstructuredGridReader(FileDataSource):
         value = fpath.get()
         if len(value) == 0:
             return
-        # Extract the file extension
-        splitname = value.strip().split('.')
-        extension = splitname[-1].lower()
-        # Select UnstructuredGridreader based on file type
-        old_reader = self.reader
-        if self._reader_dict.has_key(extension):
-            self.reader = self._reader_dict[extension]
-        else:
+        # Select the reader based on the file type.
+        reader = self._readers.get_reader(value)
+        if reader is None:
             error('Invalid file extension for file: %s'%value)
             return
+        old_reader = self.reader
+        self.reader = reader
 
         self.reader.file_name = value.strip()
         self.reader.update()
@@ -111,10 +117,8 @@ class UnstructuredGridReader(FileDataSource):
 
         return ret
 
-    def __reader_dict_default(self):
-        """Default value for reader dict."""
-        rd = {'inp':tvtk.AVSucdReader(),
-             'neu':tvtk.GAMBITReader(),
-             'exii':tvtk.ExodusReader()
-            }
-        return rd
+    def __readers_default(self):
+        """Default value for the readers."""
+        return ReaderCache({'inp': 'AVSucdReader',
+                            'neu': 'GAMBITReader',
+                            'exii': 'ExodusReader'})
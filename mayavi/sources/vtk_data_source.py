@@ -20,6 +20,8 @@ from tvtk import messenger
 # Local imports.
 from mayavi.core.source import Source
 from mayavi.core.common import handle_children_state
+from mayavi.core.session import get_blob_store, dataset_to_state, \
+     dataset_from_state
 from mayavi.core.trait_defs import DEnum
 from mayavi.core.pipeline_info import (PipelineInfo,
         get_tvtk_dataset_name)
@@ -169,14 +171,26 @@ class VTKDataSource(Source):
             d.pop('_' + name + '_name', None)
         data = self.data
         if data is not None:
-            sdata = write_dataset_to_string(data)
-            z = gzip_string(sdata)
+            # In a session, the arrays of the data are stored apart.
+            store = get_blob_store()
+            z = None
+            if store is not None:
+                z = dataset_to_state(data, store)
+            if z is None:
+                sdata = write_dataset_to_string(data)
+                z = gzip_string(sdata)
             d['data'] = z
         return d
 
     def __set_pure_state__(self, state):
         z = state.data
-        if z is not None:
+        if isinstance(z, dict):
+            store = get_blob_store()
+            if store is None:
+                raise IOError('The data of this visualization is saved '
+                              'apart, load it with `Engine.load_session`.')
+            self.data = dataset_from_state(z, store)
+        elif z is not None:
             d = gunzip_string(z)
             r = tvtk.DataSetReader(read_from_input_string=1,
                                    input_string=d)
@@ -0,0 +1,107 @@
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import time
+import unittest
+
+# Enthought library imports
+from pyface.timer.api import Timer
+from mayavi.tools.animator import ThreadedAnimator
+
+
+class FakeTimer(Timer):
+    """A timer that never fires: the tests show the frames by hand."""
+    def __init__(self, *args):
+        self.running = True
+
+    def Start(self, millisecs=None):
+        self.running = True
+
+    def Stop(self):
+        self.running = False
+
+    def IsRunning(self):
+        return self.running
+
+
+def wait_for(condition, timeout=5.0):
+    """Waits until `condition()` is true or the `timeout` expires."""
+    end = time.time() + timeout
+    while not condition() and time.time() < end:
+        time.sleep(0.01)
+    return condition()
+
+
+def counter(delay=0.0, n=None):
+    i = 0
+    while n is None or i < n:
+        time.sleep(delay)
+        i += 1
+        yield i
+
+
+class TestThreadedAnimator(unittest.TestCase):
+
+    def make_animator(self, producer, **traits):
+        self.shown = []
+        a = ThreadedAnimator(10, producer, self.shown.append,
+                             timer=FakeTimer(), **traits)
+        self.animators.append(a)
+        return a
+
+    def setUp(self):
+        self.animators = []
+
+    def tearDown(self):
+        for a in self.animators:
+            a.stop = True
+            if a._worker is not None:
+                a._worker.join(5.0)
+
+    def test_handoff(self):
+        "Test if the most recent frame is shown and the others dropped"
+        a = self.make_animator(counter().next, queue_size=3)
+        self.assertTrue(wait_for(a._queue.full))
+        a._show_frame()
+        self.assertEqual(self.shown, [3])
+        self.assertEqual(a.dropped_frames, 2)
+        self.assertEqual(a.frames, 1)
+        self.assertTrue(wait_for(a._queue.full))
+        a._show_frame()
+        self.assertEqual(self.shown, [3, 6])
+
+    def test_end(self):
+        "Test if the animation stops when the producer is exhausted"
+        a = self.make_animator(counter(n=2).next, queue_size=3)
+        a._worker.join(5.0)
+        a._show_frame()
+        self.assertEqual(self.shown, [2])
+        self.assertFalse(a.running)
+        self.assertFalse(a.timer.IsRunning())
+
+    def test_restart(self):
+        "Test if restarting does not run the producer on two threads"
+        a = self.make_animator(counter(delay=0.05).next, queue_size=1)
+        for i in range(5):
+            a.stop = True
+            a.start = True
+        self.assertTrue(wait_for(a._queue.full))
+        a._show_frame()
+        self.assertEqual(a._error, None)
+        self.assertTrue(a.running)
+        self.assertEqual(len(self.shown), 1)
+
+    def test_error(self):
+        "Test if an error of the producer is raised on the UI thread"
+        def producer():
+            raise ZeroDivisionError('in the worker')
+        a = self.make_animator(producer)
+        a._worker.join(5.0)
+        self.assertRaises(ZeroDivisionError, a._show_frame)
+        self.assertFalse(a.running)
+        self.assertEqual(self.shown, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Tests for the ArrayFunction filter.
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import unittest
+
+import numpy
+
+# Local imports.
+from mayavi.core.null_engine import NullEngine
+from mayavi.filters.array_function import ArrayFunction
+from mayavi.sources.array_source import ArraySource
+
+
+class TestArrayFunction(unittest.TestCase):
+
+    def setUp(self):
+        e = NullEngine()
+        e.start()
+        e.new_scene()
+        self.e = e
+        self.data = numpy.arange(60, dtype=float).reshape(3, 4, 5)
+        self.src = ArraySource(scalar_data=self.data)
+        e.add_source(self.src)
+        self.calls = 0
+
+    def tearDown(self):
+        self.e.stop()
+
+    def scale(self, arrays, factor=1.0):
+        self.calls += 1
+        return {'scaled': arrays['scalar']*factor}
+
+    def get_output(self, f, name='scaled'):
+        return f.outputs[0].point_data.get_array(name).to_array()
+
+    def test_function(self):
+        """Test if the computed arrays are added and cached."""
+        f = ArrayFunction(function=self.scale, parameters={'factor': 2.0})
+        self.e.add_filter(f, self.src)
+        expect = self.src.outputs[0].point_data.scalars.to_array()*2
+        self.assertTrue(numpy.allclose(self.get_output(f), expect))
+        self.assertEqual(f.outputs[0].point_data.scalars.name, 'scaled')
+        n = self.calls
+
+        # Changing a parameter back and forth reuses the cache.
+        f.parameters = {'factor': 3.0}
+        self.assertTrue(numpy.allclose(self.get_output(f), expect*1.5))
+        f.parameters = {'factor': 2.0}
+        self.assertTrue(numpy.allclose(self.get_output(f), expect))
+        self.assertEqual(self.calls, n + 1)
+
+        # New input data is recomputed.
+        self.src.scalar_data = self.data + 1
+        expect = self.src.outputs[0].point_data.scalars.to_array()*2
+        self.assertTrue(numpy.allclose(self.get_output(f), expect))
+        self.assertEqual(self.calls, n + 2)
+
+    def test_threads(self):
+        """Test if splitting the work across threads works."""
+        f = ArrayFunction(n_threads=4, output_name='sq')
+        self.e.add_filter(f, self.src)
+        f.function = lambda arrays: arrays['scalar']**2
+        expect = self.src.outputs[0].point_data.scalars.to_array()**2
+        self.assertTrue(numpy.allclose(self.get_output(f, 'sq'), expect))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Tests for the cached array statistics.
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import unittest
+
+import numpy
+
+# Enthought library imports.
+from tvtk.api import tvtk
+
+# Local imports.
+from mayavi.core import array_stats
+from mayavi.core.array_stats import get_array_stats, get_histogram
+
+
+class TestArrayStats(unittest.TestCase):
+
+    def setUp(self):
+        array_stats.clear_cache()
+        pd = tvtk.PolyData()
+        pd.point_data.scalars = numpy.array([1.0, numpy.nan, 3.0, -2.0])
+        self.scalars = pd.point_data.scalars
+
+    def test_stats(self):
+        """Test if NaNs are ignored and the stats are cached."""
+        sc = self.scalars
+        stats = get_array_stats(sc)
+        self.assertEqual(stats.range, [-2.0, 3.0])
+        self.assertEqual(stats.n_nan, 1)
+        self.assertTrue(get_array_stats(sc) is stats)
+
+        # Modifying the array invalidates the cache.
+        sc.to_array()[1] = 5.0
+        sc.modified()
+        stats = get_array_stats(sc)
+        self.assertEqual(stats.range, [-2.0, 5.0])
+        self.assertEqual(stats.n_nan, 0)
+
+    def test_histogram(self):
+        """Test if the histogram counts the finite values."""
+        counts, edges = get_histogram(self.scalars, bins=5)
+        self.assertEqual(counts.sum(), 3)
+        self.assertEqual(edges[0], -2.0)
+        self.assertEqual(edges[-1], 3.0)
+        self.assertTrue(get_histogram(self.scalars, bins=5)[0] is counts)
+
+    def test_magnitude(self):
+        """Test the statistics of the magnitudes of vectors."""
+        pd = tvtk.PolyData()
+        pd.point_data.vectors = numpy.array([[3.0, 4.0, 0.0],
+                                             [1.0, 0.0, 0.0]])
+        stats = get_array_stats(pd.point_data.vectors, magnitude=True)
+        self.assertEqual(stats.range, [1.0, 5.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+"""
+Tests for running filters in the background.
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import time
+import unittest
+from Queue import Queue, Empty
+
+import numpy
+
+# Local imports.
+from mayavi.core import background
+from mayavi.core.null_engine import NullEngine
+from mayavi.filters.elevation_filter import ElevationFilter
+from mayavi.sources.array_source import ArraySource
+
+
+class TestBackground(unittest.TestCase):
+
+    def setUp(self):
+        e = NullEngine()
+        e.start()
+        e.new_scene()
+        self.e = e
+        self.src = ArraySource(scalar_data=numpy.ones((4, 4, 4)))
+        e.add_source(self.src)
+
+    def tearDown(self):
+        self.e.stop()
+
+    def get_elevation(self, f):
+        return f.outputs[0].point_data.get_array('Elevation').to_array()
+
+    def test_background(self):
+        """Test if a background filter gives the same output."""
+        f = ElevationFilter()
+        self.e.add_filter(f, self.src)
+        expect = self.get_elevation(f).copy()
+
+        g = ElevationFilter(background=True)
+        self.e.add_filter(g, self.src)
+        self.assertTrue(numpy.allclose(self.get_elevation(g), expect))
+        self.assertFalse(g.execution.executing)
+
+        # Results are copied into the same output.
+        output = g.outputs[0]
+        g.filter.high_point = (0, 0, 2)
+        self.assertTrue(g.outputs[0] is output)
+        self.assertFalse(numpy.allclose(self.get_elevation(g), expect))
+
+        # Switching back connects the filter to the source again.
+        g.background = False
+        self.assertTrue(g.filter.input is self.src.outputs[0])
+
+
+class FakeCommon(object):
+    # Makes `BackgroundExecution` believe a UI is running.
+    pyface = object()
+
+
+class TestBackgroundThread(unittest.TestCase):
+    """Runs the background executions on a worker thread, the calls
+    the worker makes on the UI thread being made by `process_events`.
+    """
+
+    def setUp(self):
+        self.calls = Queue()
+        self.orig = background.common, background.invoke_later
+        background.common = FakeCommon()
+        background.invoke_later = lambda f, *args: self.calls.put((f, args))
+        e = NullEngine()
+        e.start()
+        e.new_scene()
+        self.e = e
+        self.src = ArraySource(scalar_data=numpy.ones((20, 20, 20)))
+        e.add_source(self.src)
+
+    def tearDown(self):
+        self.e.stop()
+        background.common, background.invoke_later = self.orig
+
+    def process_events(self, execution, timeout=10.0):
+        """Makes the calls of the worker until the execution is done."""
+        end = time.time() + timeout
+        while execution.executing and time.time() < end:
+            try:
+                f, args = self.calls.get(timeout=0.1)
+            except Empty:
+                continue
+            f(*args)
+        self.assertFalse(execution.executing)
+
+    def test_thread(self):
+        """Test if the filter executes on the worker thread."""
+        f = ElevationFilter(background=True)
+        progress = []
+        f.execution.on_trait_change(lambda v: progress.append(v),
+                                    'progress')
+        self.e.add_filter(f, self.src)
+        self.assertTrue(f.execution.executing)
+        self.assertEqual(len(f.outputs), 0)
+        self.process_events(f.execution)
+        self.assertEqual(f.execution.progress, 1.0)
+        self.assertTrue(len(progress) > 1)
+        self.assertEqual(progress, sorted(progress))
+        elevation = f.outputs[0].point_data.get_array('Elevation')
+        self.assertEqual(len(elevation), 8000)
+
+        # Downstream never sees the output of the filter itself.
+        output = f.outputs[0]
+        f.filter.high_point = (0, 0, 2)
+        self.assertTrue(f.execution.executing)
+        self.assertTrue(f.outputs[0] is output)
+        self.assertFalse(f.outputs[0] is f.filter.output)
+        self.process_events(f.execution)
+        self.assertTrue(f.outputs[0] is output)
+
+    def test_switch(self):
+        """Test if turning the background on detaches the outputs."""
+        f = ElevationFilter()
+        self.e.add_filter(f, self.src)
+        self.assertTrue(f.outputs[0] is f.filter.output)
+        f.background = True
+        self.assertTrue(f.execution.executing)
+        self.assertFalse(f.outputs[0] is f.filter.output)
+        self.process_events(f.execution)
+
+    def test_cancel(self):
+        """Test if a cancelled execution leaves the output alone."""
+        f = ElevationFilter(background=True)
+        self.e.add_filter(f, self.src)
+        self.process_events(f.execution)
+        expect = f.outputs[0].point_data.get_array('Elevation').to_array()
+        expect = expect.copy()
+        f.filter.high_point = (0, 0, 2)
+        f.execution.cancel = True
+        self.process_events(f.execution)
+        result = f.outputs[0].point_data.get_array('Elevation').to_array()
+        self.assertTrue(numpy.allclose(result, expect))
+        self.assertFalse(f.filter._vtk_obj.GetAbortExecute())
+
+    def test_switch_off(self):
+        """Test if turning the background off while executing waits for
+        the execution to stop."""
+        f = ElevationFilter(background=True)
+        self.e.add_filter(f, self.src)
+        self.process_events(f.execution)
+        f.filter.high_point = (0, 0, 2)
+        self.assertTrue(f.execution.executing)
+        f.background = False
+        # The filter is only connected once the worker is done with it.
+        self.assertFalse(f.filter.input is self.src.outputs[0])
+        self.process_events(f.execution)
+        self.assertTrue(f.filter.input is self.src.outputs[0])
+        self.assertTrue(f.outputs[0] is f.filter.output)
+        self.assertTrue(self.calls.empty())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,191 @@
+"""
+Tests for the readers memory mapping binary STL, PLY and particle files.
+
+Run this file with `--benchmark` to compare the time taken by these
+readers and the VTK readers on the test data files and on a synthetic
+binary STL file of 10 million triangles.
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+import numpy
+
+# Enthought library imports
+from tvtk.api import tvtk
+from mayavi.sources.poly_data_reader import PolyDataReader
+from mayavi.sources.binary_readers import STL_DTYPE, merge_points, \
+     STLReader, PLYReader, ParticleReader
+
+
+# The points and triangles of a tetrahedron.
+POINTS = numpy.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], 'f')
+TRIANGLES = numpy.array([[0, 1, 2], [0, 1, 3], [0, 2, 3], [1, 2, 3]])
+
+
+class TestBinaryReaders(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _read(self, fname):
+        r = PolyDataReader()
+        r.initialize(os.path.join(self.root, fname))
+        return r
+
+    def test_merge_points(self):
+        "Test if identical points are merged in their order"
+        points = numpy.array([[1, 1, 1], [0, 0, 0], [1, 1, 1],
+                              [-0.0, 0, 0], [2, 2, 2]], 'f')
+        unique, index = merge_points(points)
+        self.assertTrue(numpy.all(unique == [[1, 1, 1], [0, 0, 0],
+                                             [2, 2, 2]]))
+        self.assertEqual(list(index), [0, 1, 0, 1, 2])
+
+    def test_binary_stl(self):
+        "Test if a binary STL file is read and its vertices merged"
+        records = numpy.zeros(len(TRIANGLES), STL_DTYPE)
+        records['vertices'] = POINTS[TRIANGLES]
+        f = open(os.path.join(self.root, 'tet.stl'), 'wb')
+        f.write(' '*80)
+        f.write(numpy.array([len(TRIANGLES)], '<u4').tostring())
+        f.write(records.tostring())
+        f.close()
+
+        r = self._read('tet.stl')
+        self.assertTrue(isinstance(r.reader, STLReader))
+        output = r.outputs[0]
+        self.assertEqual(output.number_of_points, 4)
+        self.assertEqual(output.number_of_cells, 4)
+        self.assertTrue(numpy.all(output.points.to_array() == POINTS))
+        polys = output.polys.to_array().reshape(-1, 4)[:, 1:]
+        self.assertTrue(numpy.all(polys == TRIANGLES))
+
+        r.reader.merging = False
+        self.assertEqual(output.number_of_points, 12)
+
+    def test_binary_ply(self):
+        "Test if a binary PLY file is read"
+        f = open(os.path.join(self.root, 'tet.ply'), 'wb')
+        f.write('ply\nformat binary_big_endian 1.0\n'
+                'element vertex 4\n'
+                'property float x\nproperty float y\nproperty float z\n'
+                'property uchar red\nproperty uchar green\n'
+                'property uchar blue\n'
+                'element face 4\n'
+                'property list uchar int vertex_indices\n'
+                'end_header\n')
+        vertex = numpy.zeros(4, [('p', '>f4', (3,)), ('c', 'u1', (3,))])
+        vertex['p'] = POINTS
+        vertex['c'] = 255
+        f.write(vertex.tostring())
+        face = numpy.zeros(4, [('n', 'u1'), ('v', '>i4', (3,))])
+        face['n'] = 3
+        face['v'] = TRIANGLES
+        f.write(face.tostring())
+        f.close()
+
+        r = self._read('tet.ply')
+        self.assertTrue(isinstance(r.reader, PLYReader))
+        output = r.outputs[0]
+        self.assertTrue(numpy.all(output.points.to_array() == POINTS))
+        self.assertEqual(output.number_of_cells, 4)
+        self.assertEqual(output.point_data.scalars.name, 'RGB')
+        self.assertTrue(numpy.all(output.point_data.scalars.to_array() == 255))
+
+    def test_particles_copy_on_write(self):
+        "Test if the points read can be modified without changing the file"
+        fname = os.path.join(self.root, 'p.raw')
+        POINTS.astype('<f4').tofile(fname)
+        r = ParticleReader(file_name=fname, data_byte_order='little_endian',
+                           file_type='binary', has_scalar=False)
+        r.update()
+        points = r.output.points.to_array()
+        self.assertTrue(numpy.all(points == POINTS))
+        points[:] = 2.0
+        self.assertTrue(numpy.all(r.output.points.to_array() == 2.0))
+        data = numpy.fromfile(fname, '<f4').reshape(-1, 3)
+        self.assertTrue(numpy.all(data == POINTS))
+
+
+def write_grid_stl(fname, n_triangles):
+    """Writes a binary STL file of a wavy square grid made of about
+    `n_triangles` triangles, each inner vertex being shared by six of
+    them.
+    """
+    n = max(int(numpy.sqrt(n_triangles/2)), 1)
+    x = numpy.arange(n + 1, dtype='f')
+    records = numpy.zeros((n, 2), STL_DTYPE)
+    f = open(fname, 'wb')
+    f.write(' '*80)
+    f.write(numpy.array([2*n*n], '<u4').tostring())
+    # One row of squares at a time to keep the memory used low.
+    for j in range(n):
+        row = numpy.empty((2, n + 1, 3), 'f')
+        row[:, :, 0] = x
+        row[:, :, 1] = [[j], [j + 1]]
+        xy = 0.1*row[:, :, :2]
+        row[:, :, 2] = numpy.sin(xy[..., 0])*numpy.cos(xy[..., 1])
+        v = records['vertices']
+        v[:, 0, 0], v[:, 0, 1], v[:, 0, 2] = row[0, :-1], row[0, 1:], \
+                                             row[1, 1:]
+        v[:, 1, 0], v[:, 1, 1], v[:, 1, 2] = row[0, :-1], row[1, 1:], \
+                                             row[1, :-1]
+        f.write(records.tostring())
+    f.close()
+
+
+def time_reader(klass, fname, n):
+    """Returns the best time of `n` reads of `fname` by new readers of
+    class `klass`.
+    """
+    times = []
+    for i in range(n):
+        r = klass(file_name=fname)
+        t0 = time.time()
+        r.update()
+        times.append(time.time() - t0)
+    return min(times)
+
+
+def benchmark(n_triangles=10000000, n=3):
+    """Prints the best time of `n` reads of the test data files and of a
+    synthetic binary STL file with `n_triangles` triangles, with the
+    readers memory mapping the files and with the VTK readers.
+    """
+    data = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+    root = tempfile.mkdtemp()
+    stl = os.path.join(root, 'grid.stl')
+    files = [(os.path.join(data, 'humanoid_tri.stla'), STLReader,
+              tvtk.STLReader),
+             (os.path.join(data, 'pyramid.ply'), PLYReader, tvtk.PLYReader),
+             (os.path.join(data, 'Particles.raw'), ParticleReader,
+              tvtk.ParticleReader),
+             (stl, STLReader, tvtk.STLReader)]
+    try:
+        write_grid_stl(stl, n_triangles)
+        print('%-20s %10s %10s'%('file', 'numpy', 'vtk'))
+        for fname, reader, vtk_reader in files:
+            t_numpy = time_reader(reader, fname, n)
+            t_vtk = time_reader(vtk_reader, fname, n)
+            print('%-20s %9.3fs %9.3fs'%(os.path.basename(fname),
+                                         t_numpy, t_vtk))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    if '--benchmark' in sys.argv:
+        benchmark()
+    else:
+        unittest.main()
@@ -0,0 +1,63 @@
+"""
+Tests for the BlockDecimation filter.
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import unittest
+
+import numpy
+
+# Enthought library imports.
+from tvtk.api import tvtk
+
+# Local imports.
+from mayavi.core.null_engine import NullEngine
+from mayavi.filters.block_decimation import BlockDecimation
+from mayavi.sources.vtk_data_source import VTKDataSource
+
+
+class TestBlockDecimation(unittest.TestCase):
+
+    def setUp(self):
+        e = NullEngine()
+        e.start()
+        e.new_scene()
+        self.e = e
+        sphere = tvtk.SphereSource(theta_resolution=64, phi_resolution=64)
+        sphere.update()
+        pd = sphere.output
+        pd.point_data.scalars = pd.points.to_array()[:, 2].copy()
+        pd.point_data.scalars.name = 'z'
+        self.src = VTKDataSource(data=pd)
+        e.add_source(self.src)
+
+    def tearDown(self):
+        self.e.stop()
+
+    def test_decimation(self):
+        """Test if the blocks are decimated and stitched."""
+        n = self.src.outputs[0].number_of_cells
+        f = BlockDecimation(target_triangles=n/4, n_blocks=2)
+        self.e.add_filter(f, self.src)
+        out = f.outputs[0]
+        self.assertTrue(0 < out.number_of_cells < n)
+        self.assertTrue(f.reduction > 0.5)
+        # The scalars follow the kept points.
+        z = out.points.to_array()[:, 2]
+        self.assertTrue(numpy.allclose(out.point_data.scalars.to_array(), z))
+        # The blocks share their boundary points: no point is
+        # duplicated.
+        pts = out.points.to_array()
+        self.assertEqual(len(set(map(tuple, pts))), len(pts))
+        ids = out.polys.to_array().reshape(-1, 4)[:, 1:]
+        self.assertTrue(ids.max() < out.number_of_points)
+
+        # Nothing is decimated when the mesh is small enough.
+        f.target_triangles = 2*n
+        self.assertEqual(f.outputs[0].number_of_cells, n)
+
+
+if __name__ == '__main__':
+    unittest.main()
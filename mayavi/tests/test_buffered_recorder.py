@@ -0,0 +1,84 @@
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import unittest
+
+# Enthought library imports
+from apptools.scripting.api import set_recorder
+from mayavi.core.recorder import BufferedRecorder
+from mayavi.sources.parametric_surface import ParametricSurface
+from mayavi.modules.surface import Surface
+from mayavi.core.null_engine import NullEngine
+
+
+class TestBufferedRecorder(unittest.TestCase):
+
+    def setUp(self):
+        tape = BufferedRecorder()
+        set_recorder(tape)
+        self.tape = tape
+        e = NullEngine()
+        e.start()
+        tape.recording = True
+        tape.register(e, known=True, script_id='engine')
+        e.new_scene()
+        self.e = e
+
+    def tearDown(self):
+        self.tape.clear()
+        set_recorder(None)
+
+    def test_collapse(self):
+        "Test if only the last of consecutive changes is recorded"
+        tape = self.tape
+        e = self.e
+        src = ParametricSurface()
+        e.add_source(src)
+        s = Surface()
+        e.add_module(s)
+        n_lines = len(tape.lines)
+        for opacity in (0.1, 0.2, 0.3, 0.4):
+            s.actor.property.opacity = opacity
+        src.function = 'dini'
+        # Nothing is written until the code is asked for.
+        self.assertEqual(len(tape.lines), n_lines)
+
+        lines = tape.get_code().splitlines()
+        self.assertEqual(lines[-2], 'surface.actor.property.opacity = 0.4')
+        self.assertEqual(lines[-1], "parametric_surface.function = 'dini'")
+        self.assertEqual(len(lines), n_lines + 2)
+
+    def test_order(self):
+        "Test if a repeated change is recorded after the changes before it"
+        tape = self.tape
+        e = self.e
+        src = ParametricSurface()
+        e.add_source(src)
+        s = Surface()
+        e.add_module(s)
+        n_lines = len(tape.get_code().splitlines())
+        s.actor.property.opacity = 0.1
+        src.function = 'dini'
+        s.actor.property.opacity = 0.3
+
+        lines = tape.get_code().splitlines()
+        self.assertEqual(lines[-2], "parametric_surface.function = 'dini'")
+        self.assertEqual(lines[-1], 'surface.actor.property.opacity = 0.3')
+        self.assertEqual(len(lines), n_lines + 2)
+
+    def test_stop(self):
+        "Test if the pending changes are written when stopping"
+        tape = self.tape
+        e = self.e
+        src = ParametricSurface()
+        e.add_source(src)
+        src.function = 'dini'
+        tape.unregister(e)
+        tape.recording = False
+        self.assertEqual(tape.lines[-1],
+                         "parametric_surface.function = 'dini'")
+
+
+if __name__ == '__main__':
+    unittest.main()
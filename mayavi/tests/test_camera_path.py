@@ -0,0 +1,60 @@
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import unittest
+
+import numpy as np
+
+# Local imports.
+from mayavi.tools.camera_path import CameraPath, quaternions, \
+     rotated_y_axes, orthogonal_view_ups, clipping_ranges
+
+
+class TestCameraPath(unittest.TestCase):
+
+    def test_quaternions(self):
+        "Test if the quaternions give back the view ups"
+        rng = np.random.RandomState(0)
+        d = rng.randn(100, 3)
+        d /= np.sqrt((d*d).sum(axis=1))[:, None]
+        up = orthogonal_view_ups(d, rng.randn(100, 3))
+        q = quaternions(d, up)
+        self.assertTrue(np.allclose((q*q).sum(axis=1), 1.0))
+        self.assertTrue(np.allclose(rotated_y_axes(q), up))
+
+    def test_keyframes(self):
+        "Test if the path goes through the keyframes"
+        path = CameraPath()
+        path.add_view(0, 90, 10, (0, 0, 0))
+        path.add_view(90, 90, 10, (0, 0, 0))
+        path.add_view(180, 90, 10, (0, 0, 0))
+        for smooth in (True, False):
+            path.smooth = smooth
+            pos, fp, up, angles = path.interpolate(5)
+            self.assertTrue(np.allclose(pos[::2], [[10, 0, 0], [0, 10, 0],
+                                                   [-10, 0, 0]]))
+            self.assertTrue(np.allclose(fp, 0.0))
+            self.assertTrue(np.allclose(up, [0, 0, 1]))
+            self.assertTrue(np.allclose(angles, 30.0))
+
+    def test_roll(self):
+        "Test if the view up turns smoothly"
+        path = CameraPath()
+        path.add_keyframe((0, 0, 10), (0, 0, 0), (0, 1, 0), time=0)
+        path.add_keyframe((0, 0, 10), (0, 0, 0), (1, 0, 0), time=1)
+        up = path.interpolate(3)[2]
+        s = np.sqrt(0.5)
+        self.assertTrue(np.allclose(up, [[0, 1, 0], [s, s, 0], [1, 0, 0]]))
+
+    def test_clipping_ranges(self):
+        "Test if the clipping ranges enclose the bounds"
+        near, far = clipping_ranges(np.array([[0, 0, 10.0]]),
+                                    np.array([[0, 0, -1.0]]),
+                                    (-1, 1, -1, 1, -1, 1))[0]
+        self.assertTrue(8.5 < near < 9.0)
+        self.assertTrue(11.0 < far < 11.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
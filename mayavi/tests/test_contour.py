@@ -192,5 +192,74 @@ class TestContour(unittest.TestCase):
         cp.implicit_plane.widget.enabled = False
         self.check()
 
+    def test_progressive_contours(self):
+        """Test if progressive automatic contours work."""
+        iso = self.iso
+        ctr = iso.contour
+        ctr.set(minimum_contour=2.0, maximum_contour=8.0,
+                number_of_contours=4)
+        ctr.progressive = True
+        ctr.auto_contours = True
+        # Without a UI all the levels are computed right away.
+        ctr.finish_contours()
+        self.assertEqual(len(ctr._pending_levels), 0)
+        self.assertEqual(sorted(ctr._level_cache.keys()),
+                         [2.0, 4.0, 6.0, 8.0])
+        rng = iso.actor.mapper.input.point_data.scalars.range
+        self.assertEqual(rng[0], 2.0)
+        self.assertEqual(rng[1], 8.0)
+
+        # Cached levels are reused when the parameters change.
+        surface = ctr._level_cache[8.0]
+        ctr.number_of_contours = 7
+        self.assertTrue(ctr._level_cache[8.0] is surface)
+        self.assertEqual(len(ctr._level_cache), 7)
+
+        # More levels than the cache holds are not cached.
+        ctr._level_cache.max_size = 7
+        ctr.number_of_contours = 10
+        ctr.finish_contours()
+        self.assertEqual(ctr._level_cache.max_size, 7)
+        self.assertEqual(sorted(ctr._level_cache.keys()),
+                         [2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0])
+
+        # Switching back gives the usual output.
+        ctr.progressive = False
+        self.assertTrue(ctr.outputs[0] is ctr.contour_filter.output)
+
+    def test_span_space_contours(self):
+        """Test if contouring with the span space index works."""
+        iso = self.iso
+        ctr = iso.contour
+        cf = ctr.contour_filter
+        cf.update()
+        n_cells = cf.output.number_of_cells
+        # Always contour block-wise.
+        ctr._span_index.max_active_fraction = 1.0
+        ctr.span_space_block_size = 4
+        ctr.span_space = True
+        out = ctr.outputs[0]
+        self.assertTrue(out is ctr._append.output)
+        self.assertTrue(ctr._span_index.active_blocks > 0)
+        out.update()
+        # The blocks partition the cells so the same polygons result.
+        self.assertEqual(out.number_of_cells, n_cells)
+        self.check()
+
+        # Surfaces are cached per level.
+        surface = ctr._level_cache[5.0]
+        ctr.contours = [5.0, 6.0]
+        self.assertTrue(ctr._level_cache[5.0] is surface)
+        ctr.contours = [5.0]
+        self.check()
+
+    def test_progressive_order(self):
+        """Test the coarse to fine ordering of contour levels."""
+        from mayavi.components.contour import progressive_order
+        for n in (1, 2, 5, 16, 33):
+            order = progressive_order(n)
+            self.assertEqual(sorted(order), range(n))
+        self.assertEqual(list(progressive_order(5)), [0, 4, 2, 1, 3])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,86 @@
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+# Local imports.
+from common import get_example_data
+
+# Enthought library imports
+from mayavi.core.null_engine import NullEngine
+from mayavi.core.registry import registry
+from mayavi.core.file_format import sniff_format, ReaderCache
+
+
+class TestFileFormat(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _copy(self, fname):
+        """Copies an example file to a file without an extension."""
+        dest = os.path.join(self.root, 'data')
+        shutil.copy(get_example_data(fname), dest)
+        return dest
+
+    def test_sniff_format(self):
+        "Test if the formats are found from the file contents"
+        for fname, format in [('cube.vti', 'xml'),
+                              ('pyramid_ug.vtu', 'xml'),
+                              ('pyramid.ply', 'ply'),
+                              ('humanoid_tri.stla', 'stl'),
+                              ('foot.mha', 'mha')]:
+            self.assertEqual(sniff_format(get_example_data(fname)),
+                             format)
+        self.assertEqual(sniff_format(get_example_data('points.txt')), None)
+        self.assertEqual(sniff_format(os.path.join(self.root, 'junk')),
+                         None)
+
+        # A binary STL file.
+        fname = os.path.join(self.root, 'mesh')
+        f = open(fname, 'wb')
+        f.write(' '*80 + struct.pack('<I', 1) + '\0'*50)
+        f.close()
+        self.assertEqual(sniff_format(fname), 'stl')
+
+    def test_reader_cache(self):
+        "Test if the readers are only made once per class"
+        readers = ReaderCache({'stl': 'STLReader', 'stla': 'STLReader',
+                               'ply': 'PLYReader'})
+        self.assertEqual(len(readers._readers), 0)
+        stl = readers.get('stl')
+        self.assertEqual(stl.__class__.__name__, 'STLReader')
+        self.assertTrue(readers.get('stla') is stl)
+        self.assertEqual(len(readers._readers), 1)
+        self.assertEqual(readers.get('abc'), None)
+        # Files without a known extension are sniffed.
+        ply = readers.get_reader(self._copy('pyramid.ply'))
+        self.assertEqual(ply.__class__.__name__, 'PLYReader')
+
+    def test_open_without_extension(self):
+        "Test if a file without an extension is opened"
+        fname = self._copy('pyramid.ply')
+        reader = registry.get_file_reader(fname)
+        self.assertEqual(reader.id, 'PolyDataFile')
+
+        e = NullEngine()
+        e.start()
+        e.new_scene()
+        try:
+            src = e.open(fname)
+            self.assertEqual(src.reader.__class__.__name__, 'PLYReader')
+            self.assertTrue(src.outputs[0].number_of_points > 0)
+        finally:
+            e.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
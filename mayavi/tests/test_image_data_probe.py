@@ -9,6 +9,8 @@ from StringIO import StringIO
 import copy
 import unittest
 
+import numpy
+
 # Local imports.
 from common import get_example_data
 
@@ -16,7 +18,8 @@ from common import get_example_data
 from mayavi.core.null_engine import NullEngine
 from mayavi.sources.vtk_xml_file_reader import VTKXMLFileReader
 from mayavi.modules.api import ContourGridPlane
-from mayavi.filters.image_data_probe import ImageDataProbe
+from mayavi.filters.image_data_probe import ImageDataProbe, \
+     fit_dimensions
 
 class TestImageDataProbe(unittest.TestCase):
 
@@ -79,6 +82,28 @@ class TestImageDataProbe(unittest.TestCase):
         #from mayavi.tools.show import show
         #show()
 
+    def test_roi_and_budget(self):
+        """Test the region of interest and the memory budget."""
+        self.check()
+        idp = self.scene.children[0].children[0]
+        source = idp._source
+        idp.update_data()
+        # The copy of the input is reused when its geometry is the same.
+        self.assertEqual(idp._source is source, True)
+
+        b = numpy.array(self.scene.children[0].outputs[0].bounds)
+        roi = b.copy()
+        roi[1] = 0.5*(b[0] + b[1])
+        idp.roi = roi
+        idp.use_roi = True
+        out = idp.outputs[0]
+        self.assertEqual(out.bounds[1] <= roi[1] + 1e-6, True)
+        self.assertEqual(abs(out.bounds[0] - roi[0]) < 1e-6, True)
+
+        dims = fit_dimensions((101, 51, 11), 1000)
+        self.assertEqual(dims.prod() <= 1000, True)
+        self.assertEqual(dims[0] > dims[1] > dims[2], True)
+
     def test_save_and_restore(self):
         """Test if saving a visualization and restoring it works."""
         engine = self.e
@@ -0,0 +1,77 @@
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+# Enthought library imports
+from tvtk.api import tvtk
+from mayavi.sources.image_stack_reader import ImageStackReader, \
+     get_file_names
+
+
+class TestImageStackReader(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        # A stack of 12 slices of 4x3 pixels, the value of a pixel
+        # being its slice number.
+        for i in range(12):
+            img = tvtk.ImageData(dimensions=(4, 3, 1),
+                                 scalar_type='unsigned_char')
+            img.point_data.scalars = numpy.ones(12, numpy.uint8)*i
+            w = tvtk.PNGWriter(input=img, file_name=self._name(i))
+            w.write()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _name(self, i):
+        return os.path.join(self.root, 'slice%d.png'%i)
+
+    def check(self, src):
+        data = src.scalar_data
+        self.assertEqual(data.shape, (4, 3, 12))
+        self.assertTrue(numpy.all(data == numpy.arange(12)))
+        self.assertEqual(src.outputs[0].dimensions, (4, 3, 12))
+        self.assertEqual(src.progress, 1.0)
+
+    def test_file_names(self):
+        "Test if the files are sorted on their numbers"
+        names = get_file_names(os.path.join(self.root, '*.png'))
+        self.assertEqual(names, [self._name(i) for i in range(12)])
+
+    def test_load(self):
+        "Test if the slices are loaded in this process"
+        src = ImageStackReader(file_pattern=os.path.join(self.root, '*.png'),
+                               n_processes=0)
+        self.check(src)
+
+    def test_load_parallel(self):
+        "Test if the slices are loaded by worker processes into a file"
+        volume_file = os.path.join(self.root, 'volume.npy')
+        src = ImageStackReader(file_pattern=os.path.join(self.root, '*.png'),
+                               n_processes=2, volume_file=volume_file)
+        self.check(src)
+        self.assertTrue(numpy.all(numpy.load(volume_file)[:, 0, 0] ==
+                                  numpy.arange(12)))
+
+    def test_reload(self):
+        "Test if files set during a load are loaded when it is done"
+        src = ImageStackReader(n_processes=0)
+        # Pretend a load of other files is running.
+        src.loading = True
+        src.file_pattern = os.path.join(self.root, '*.png')
+        self.assertEqual(src.progress, 0.0)
+        src._loaded(None, None, None)
+        self.check(src)
+        self.assertFalse(src.loading)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+Tests that importing mlab stays fast: its functions must only be
+imported when they are used.
+
+Run this file with `--benchmark` to time the imports.
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import subprocess
+import sys
+import time
+import unittest
+
+
+# The modules that must not be imported by `from mayavi import mlab`.
+HEAVY_MODULES = ['vtk', 'tvtk.tvtk_access', 'pyface.api',
+                 'mayavi.core.engine', 'mayavi.tools.helper_functions',
+                 'mayavi.tools.modules', 'mayavi.tools.filters',
+                 'mayavi.modules.api', 'mayavi.filters.api']
+
+
+def run(code):
+    """Runs `code` in a new Python process and returns what it prints."""
+    p = subprocess.Popen([sys.executable, '-c', code],
+                         stdout=subprocess.PIPE)
+    out = p.communicate()[0]
+    assert p.returncode == 0, 'Running %r failed'%code
+    return out
+
+def get_imported(code):
+    """Returns the heavy modules imported by running `code`."""
+    out = run(code + '\nimport sys\nprint(" ".join(sys.modules))')
+    modules = out.split()
+    return [m for m in HEAVY_MODULES if m in modules]
+
+
+class TestLazyImport(unittest.TestCase):
+
+    def test_mlab_import(self):
+        "Test if importing mlab does not import the heavy modules"
+        self.assertEqual(get_imported('from mayavi import mlab'), [])
+        self.assertEqual(get_imported('import mayavi.api'), [])
+
+    def test_pipeline_import(self):
+        "Test if using a source does not import the modules and filters"
+        imported = get_imported('from mayavi import mlab\n'
+                                'mlab.pipeline.scalar_field')
+        for name in ('mayavi.tools.modules', 'mayavi.tools.filters'):
+            self.assertFalse(name in imported)
+
+    def test_attributes(self):
+        "Test if the attributes of mlab are imported when used"
+        from mayavi import mlab
+        from mayavi.tools import helper_functions, sources
+        self.assertTrue(mlab.surf is helper_functions.surf)
+        self.assertTrue(mlab.pipeline.scalar_field is sources.scalar_field)
+        self.assertTrue('contour3d' in dir(mlab))
+        self.assertTrue('surface' in mlab.pipeline.__all__)
+        self.assertTrue('surface' in dir(mlab.pipeline))
+        self.assertRaises(AttributeError, getattr, mlab, 'no_such_function')
+
+
+def benchmark(n=5):
+    """Prints the best time of `n` runs of importing mlab, and of
+    importing it and all of its functions.
+    """
+    for label, code in [('import mlab', 'from mayavi import mlab'),
+                        ('import all of mlab', 'from mayavi.mlab import *'),
+                        ('make a scalar field',
+                         'from mayavi import mlab\n'
+                         'mlab.pipeline.scalar_field')]:
+        times = []
+        for i in range(n):
+            t0 = time.time()
+            run(code)
+            times.append(time.time() - t0)
+        print('%-20s %.3f s'%(label, min(times)))
+
+
+if __name__ == '__main__':
+    if '--benchmark' in sys.argv:
+        benchmark()
+    else:
+        unittest.main()
@@ -480,6 +480,25 @@ class TestMLineSource(unittest.TestCase):
         self.check_traits()
         self.check_dataset()
 
+    def test_append(self):
+        "Test if points can be appended to the line."
+        x, y, z, s, src = self.get_data()
+        for i in range(100):
+            src.append(i, 2*i, 3*i, i)
+        src.append(N.zeros(5), N.ones(5), N.ones(5), N.zeros(5))
+        self.x = N.r_[x, N.arange(100), N.zeros(5)]
+        self.y = N.r_[y, 2*N.arange(100), N.ones(5)]
+        self.z = N.r_[z, 3*N.arange(100), N.ones(5)]
+        self.s = N.r_[s, N.arange(100), N.zeros(5)]
+        self.check_traits()
+        self.check_dataset()
+        # The points are joined by a single poly line.
+        lines = src.dataset.lines
+        self.assertEqual(lines.number_of_cells, 1)
+        self.assertEqual(lines.to_array()[0], 115)
+        # Scalars must be given for the new points.
+        self.assertRaises(ValueError, src.append, 0, 0, 0)
+
 
 
 ################################################################################
@@ -828,6 +847,18 @@ class TestMTriangularMeshSource(unittest.TestCase):
         x, y, z = N.random.random((3, n))
         src.reset(x=x, y=y, z=z, triangles=triangles)
 
+    def test_same_triangles(self):
+        """Test if resetting with the same triangles keeps the cells."""
+        x, y, z, triangles, s, src = self.get_data()
+        polys = src.dataset.polys
+        mtime = polys.m_time
+        src.reset(x=x*2, y=y, z=z, triangles=triangles.copy(), scalars=s)
+        self.assertEqual(src.dataset.polys.m_time, mtime)
+        self.assertTrue(N.allclose(src.dataset.points.to_array()[:,0], x*2))
+        src.triangles = N.array([[2, 1, 0]])
+        self.assertEqual(N.alltrue(src.dataset.polys.to_array() ==
+                                   [3, 2, 1, 0]), True)
+
 
     def test_handlers(self):
         "Test if the various static handlers work correctly."
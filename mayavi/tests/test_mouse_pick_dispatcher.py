@@ -12,7 +12,7 @@ from mayavi.tools.engine_manager import engine_manager
 from mayavi.core.registry import registry
 from mayavi.core.mouse_pick_dispatcher import \
                 MousePickDispatcher
-from tvtk.pyface.picker import Picker
+from tvtk.pyface.picker import Picker, PickLocators
 
 ################################################################################
 # class `DummyScene`
@@ -80,6 +80,42 @@ class TestMousePickerDispatcher(unittest.TestCase):
         self.assertEquals(interactor_callbacks,
                     initial_interactor_callbacks)
 
+    def test_hover_callback_registering(self):
+        def test(picker):
+            pass
+        dispatcher = DummyMousePickDispatcher(scene=self.s)
+        initial_interactor_callbacks = frozenset([i for i in range(100)
+                                    if self.s.scene.interactor.has_observer(i)
+                                ])
+        dispatcher.callbacks.append((test, 'cell', 'Move'))
+
+        # Hovering needs no button observers.
+        self.assertTrue(dispatcher._hover_callback_nb)
+        self.assertFalse('Move' in dispatcher._mouse_press_callback_nbs)
+        self.assertFalse('Move' in dispatcher._mouse_release_callback_nbs)
+
+        # Check that we are back to no observers
+        dispatcher.callbacks[:] = []
+        self.assertEqual(dispatcher._hover_callback_nb, 0)
+        interactor_callbacks = frozenset([i for i in range(100)
+                                    if self.s.scene.interactor.has_observer(i)
+                                ])
+        self.assertEquals(interactor_callbacks,
+                    initial_interactor_callbacks)
+
+    def test_pick_locators_cached(self):
+        cs = tvtk.ConeSource()
+        cs.update()
+        data = cs.output
+        locators = PickLocators()
+        loc = locators.get_locator(data)
+        self.assertTrue(locators.get_locator(data) is loc)
+        self.assertEqual(locators.builds, 1)
+        # Modifying the data rebuilds the locator.
+        data.modified()
+        self.assertFalse(locators.get_locator(data) is loc)
+        self.assertEqual(locators.builds, 2)
+
 
 
 if __name__ == '__main__':
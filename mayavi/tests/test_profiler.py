@@ -0,0 +1,73 @@
+"""
+Tests for the engine profiler.
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import json
+import unittest
+from StringIO import StringIO
+
+import numpy
+
+# Local imports.
+from mayavi.core.null_engine import NullEngine
+from mayavi.core.filter import Filter
+from mayavi.sources.array_source import ArraySource
+from mayavi.modules.outline import Outline
+from mayavi.modules.iso_surface import IsoSurface
+from tvtk import array_handler
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        e = NullEngine()
+        e.start()
+        e.new_scene()
+        self.e = e
+        x, y, z = numpy.ogrid[-5:5:20j, -5:5:20j, -5:5:20j]
+        self.src = ArraySource(scalar_data=x*x + y*y + z*z)
+        e.add_source(self.src)
+        e.add_module(Outline())
+        e.add_module(IsoSurface())
+
+    def tearDown(self):
+        self.e.stop()
+
+    def test_profiling(self):
+        """Test if the pipeline is profiled and then cleaned up."""
+        e = self.e
+        original = Filter.update_data
+        e.profiling = True
+        self.assertTrue(array_handler.conversion_hook is not None)
+        self.src.scalar_data = self.src.scalar_data*2
+        e.profiling = False
+
+        # Everything is restored.
+        self.assertEqual(Filter.update_data, original)
+        self.assertTrue(array_handler.conversion_hook is None)
+
+        profiler = e.profiler
+        categories = set(event[0] for event in profiler.events)
+        self.assertTrue('pipeline' in categories)
+        self.assertTrue('array' in categories)
+        summary = profiler.summary()
+        self.assertTrue('update_data' in summary)
+
+        f = StringIO()
+        profiler.save_trace(f)
+        trace = json.loads(f.getvalue())
+        self.assertEqual(len(trace['traceEvents']), len(profiler.events))
+
+        # Nothing is recorded once profiling is off.
+        n = len(profiler.events)
+        self.src.scalar_data = self.src.scalar_data*2
+        self.assertEqual(len(profiler.events), n)
+        profiler.clear()
+        self.assertEqual(len(profiler.events), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Tests for the deduplicated propagation of pipeline events.
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import unittest
+
+import numpy
+
+# Enthought library imports.
+from traits.api import Int
+
+# Local imports.
+from mayavi.core.null_engine import NullEngine
+from mayavi.core.filter import Filter
+from mayavi.core.propagation import propagator
+from mayavi.filters.collection import Collection
+from mayavi.sources.array_source import ArraySource
+
+
+class CountingFilter(Filter):
+    """Passes its first input through and counts its data updates."""
+
+    calls = Int(0)
+
+    def update_pipeline(self):
+        self._set_outputs(self.inputs[0].outputs)
+
+    def update_data(self):
+        self.calls += 1
+        self.data_changed = True
+
+
+class RaisingFilter(CountingFilter):
+    """A filter whose data updates fail."""
+
+    def update_data(self):
+        self.calls += 1
+        raise ValueError('update failed')
+
+
+class TestPropagation(unittest.TestCase):
+
+    def setUp(self):
+        e = NullEngine()
+        e.start()
+        e.new_scene()
+        self.e = e
+        self.src = ArraySource(scalar_data=numpy.ones((3, 3, 3)))
+        e.add_source(self.src)
+
+    def tearDown(self):
+        self.e.stop()
+
+    def test_diamond_updates_once(self):
+        """Test if a filter fed twice by a source updates once."""
+        e, src = self.e, self.src
+        a, b, c = CountingFilter(), CountingFilter(), CountingFilter()
+        e.add_filter(a, src)
+        e.add_filter(b, src)
+        e.add_filter(c, a)
+        c.inputs.append(b)
+
+        propagator.reset_counts()
+        src.data_changed = True
+        self.assertEqual(a.calls, 1)
+        self.assertEqual(b.calls, 1)
+        self.assertEqual(c.calls, 1)
+        self.assertEqual(propagator.avoided_updates, 1)
+
+        # Removing the second path stops the duplicate notification.
+        c.inputs.remove(b)
+        propagator.reset_counts()
+        src.data_changed = True
+        self.assertEqual(c.calls, 2)
+        self.assertEqual(propagator.avoided_updates, 0)
+
+    def test_error_does_not_stop_updates(self):
+        """Test if an update raising does not stop the other updates."""
+        e, src = self.e, self.src
+        a, b, c = RaisingFilter(), CountingFilter(), CountingFilter()
+        e.add_filter(a, src)
+        e.add_filter(b, src)
+        e.add_filter(c, b)
+        src.data_changed = True
+        self.assertEqual(a.calls, 1)
+        self.assertEqual(b.calls, 1)
+        self.assertEqual(c.calls, 1)
+        # Nothing is left dirty.
+        src.data_changed = True
+        self.assertEqual((a.calls, b.calls, c.calls), (2, 2, 2))
+
+    def test_collection_updates_once(self):
+        """Test if a collection is updated once, after its filters."""
+        e, src = self.e, self.src
+        inner = CountingFilter()
+        col = Collection(filters=[inner])
+        e.add_filter(col, src)
+        c = CountingFilter()
+        e.add_filter(c, col)
+
+        propagator.reset_counts()
+        src.data_changed = True
+        self.assertEqual(inner.calls, 1)
+        self.assertEqual(c.calls, 1)
+        self.assertEqual(propagator.avoided_updates, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
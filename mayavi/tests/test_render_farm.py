@@ -0,0 +1,90 @@
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import os
+import shutil
+import tempfile
+import unittest
+
+# Enthought library imports
+from mayavi.core.null_engine import NullEngine
+from mayavi.core.render_farm import resolve, set_parameter, \
+     RenderReport, RenderFarm
+from mayavi.sources.parametric_surface import ParametricSurface
+from mayavi.modules.surface import Surface
+
+
+def make_pipeline(engine):
+    """Builds the visualization rendered by the farm."""
+    engine.add_source(ParametricSurface())
+    engine.add_module(Surface())
+
+
+class TestRenderFarm(unittest.TestCase):
+
+    def setUp(self):
+        e = NullEngine()
+        e.start()
+        e.new_scene()
+        self.src = ParametricSurface()
+        e.add_source(self.src)
+        self.surface = Surface()
+        e.add_module(self.surface)
+        self.e = e
+
+    def tearDown(self):
+        self.e.stop()
+
+    def test_parameters(self):
+        "Test if the job parameters are set from the scene"
+        scene = self.e.current_scene
+        self.assertTrue(resolve(scene, 'children[0]') is self.src)
+        path = 'children[0].children[0].children[-1].actor.property.opacity'
+        set_parameter(scene, path, 0.5)
+        self.assertEqual(self.surface.actor.property.opacity, 0.5)
+        set_parameter(scene, 'children[0].function', 'dini')
+        self.assertEqual(self.src.function, 'dini')
+        for path in ['', 'children[0]x', 'children.[0]', '[a]']:
+            self.assertRaises(ValueError, resolve, scene, path)
+
+    def test_report(self):
+        "Test the summary of the timings"
+        report = RenderReport(timings=[(0, 'a.png', 0.5, 10),
+                                       (2, 'c.png', 1.0, 11),
+                                       (1, 'b.png', 1.5, 10)],
+                              wall_time=1.5)
+        self.assertEqual(report.throughput, 2.0)
+        lines = report.summary().splitlines()
+        self.assertEqual(lines[2].split(), ['10', '2', '2.000', '1000.000',
+                                            '1500.000'])
+        self.assertEqual(lines[3].split()[:2], ['11', '1'])
+        self.assertEqual(lines[-1], '3 images in 1.500 s: 2.00 images/s')
+
+    def test_run(self):
+        "Test if the jobs are rendered in this process"
+        root = tempfile.mkdtemp()
+        try:
+            farm = RenderFarm(pipeline=make_pipeline, n_processes=0,
+                              size=(60, 40),
+                              file_name=os.path.join(root, 'f%d.png'))
+            jobs = [{'camera': {'azimuth': 30}},
+                    {'camera': {'azimuth': 60},
+                     'parameters': {'children[0].function': 'dini'}}]
+            done = []
+            report = farm.run(jobs, lambda *args: done.append(args))
+            for i in range(2):
+                self.assertTrue(os.path.isfile(os.path.join(root,
+                                                            'f%d.png'%i)))
+            self.assertEqual(done, [(1, 2), (2, 2)])
+            self.assertEqual([t[0] for t in report.timings], [0, 1])
+            self.assertEqual(set(t[3] for t in report.timings),
+                             set([os.getpid()]))
+            self.assertTrue(report.wall_time > 0.0)
+            self.assertTrue(report.summary().endswith('images/s'))
+        finally:
+            shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+# Enthought library imports
+from tvtk.api import tvtk
+from mayavi.core.null_engine import NullEngine
+from mayavi.core.session import BLOB_DIR
+from mayavi.sources.vtk_data_source import VTKDataSource
+from mayavi.sources.array_source import ArraySource
+from mayavi.modules.outline import Outline
+
+
+class TestSession(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        e = NullEngine()
+        e.start()
+        e.new_scene()
+        self.e = e
+
+        # A triangle with point scalars.
+        pd = tvtk.PolyData(points=[[0, 0, 0], [1, 0, 0], [0, 1, 0]],
+                           polys=[[0, 1, 2]])
+        pd.point_data.scalars = numpy.array([1.0, 2.0, 3.0])
+        pd.point_data.scalars.name = 'temperature'
+        self.poly = VTKDataSource(data=pd)
+        e.add_source(self.poly)
+        e.add_module(Outline())
+
+        data = numpy.arange(24.).reshape(2, 3, 4)
+        self.array = ArraySource(scalar_data=data)
+        e.add_source(self.array)
+
+    def tearDown(self):
+        self.e.stop()
+        shutil.rmtree(self.root)
+
+    def _blobs(self):
+        blobs = os.path.join(self.root, BLOB_DIR)
+        return dict((name, os.stat(os.path.join(blobs, name)).st_mtime)
+                    for name in os.listdir(blobs))
+
+    def test_save_load(self):
+        "Test if a session is saved and loaded"
+        self.e.save_session(self.root)
+        blobs = self._blobs()
+        # The points, the triangle, the point scalars and the array.
+        self.assertEqual(len(blobs), 4)
+
+        e = NullEngine()
+        e.start()
+        e.load_session(self.root)
+        sources = e.scenes[0].children
+        self.assertEqual(len(sources), 2)
+        pd = sources[0].data
+        self.assertTrue(numpy.all(pd.points.to_array() ==
+                                  self.poly.data.points.to_array()))
+        self.assertEqual(pd.number_of_cells, 1)
+        self.assertEqual(pd.point_data.scalars.name, 'temperature')
+        self.assertTrue(numpy.all(pd.point_data.scalars.to_array() ==
+                                  [1, 2, 3]))
+        self.assertTrue(numpy.all(sources[1].scalar_data ==
+                                  self.array.scalar_data))
+        e.stop()
+
+    def test_incremental_save(self):
+        "Test if only the changed arrays are written again"
+        self.e.save_session(self.root)
+        blobs = self._blobs()
+        self.e.save_session(self.root)
+        self.assertEqual(self._blobs(), blobs)
+
+        self.array.scalar_data = self.array.scalar_data*2
+        self.e.save_session(self.root)
+        new_blobs = self._blobs()
+        self.assertEqual(len(new_blobs), 4)
+        self.assertEqual(len(set(new_blobs) - set(blobs)), 1)
+        for name in set(new_blobs) & set(blobs):
+            self.assertEqual(new_blobs[name], blobs[name])
+
+    def test_field_data(self):
+        "Test if field data and non numeric arrays are saved"
+        fd = self.poly.data.field_data
+        times = tvtk.DoubleArray(name='time')
+        times.from_array(numpy.array([0.5]))
+        fd.add_array(times)
+        self.e.save_session(self.root)
+        self.assertEqual(len(self._blobs()), 5)
+
+        labels = tvtk.StringArray(name='labels')
+        for label in ('a', 'b', 'c'):
+            labels.insert_next_value(label)
+        self.poly.data.point_data.add_array(labels)
+        # The dataset is saved as a whole since its string array can
+        # not be stored as a blob.
+        self.e.save_session(self.root)
+        self.assertEqual(len(self._blobs()), 1)
+
+        e = NullEngine()
+        e.start()
+        e.load_session(self.root)
+        pd = e.scenes[0].children[0].data
+        self.assertEqual(pd.field_data.get_array('time').to_array(), [0.5])
+        labels = pd.point_data.get_abstract_array('labels')
+        self.assertEqual([labels.get_value(i) for i in range(3)],
+                         ['a', 'b', 'c'])
+        e.stop()
+
+        # Without the string array the field data is stored as a blob.
+        self.poly.data.point_data.remove_array('labels')
+        self.e.save_session(self.root)
+        e = NullEngine()
+        e.start()
+        e.load_session(self.root)
+        pd = e.scenes[0].children[0].data
+        self.assertEqual(pd.field_data.get_array('time').to_array(), [0.5])
+        e.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -59,6 +59,16 @@ class TestThresholdFilter(unittest.TestCase):
                             threshold.outputs[0].point_data.scalars.to_array()
                          ))
 
+    def test_auto_reset_all_nan(self):
+        src = ArraySource(scalar_data=np.nan*np.ones((3, 3, 3)))
+        self.e.add_source(src)
+        threshold = Threshold()
+        self.e.add_filter(threshold)
+        # Without a range the thresholds are left alone.
+        for value in (False, True):
+            threshold.auto_reset_lower = value
+            threshold.auto_reset_upper = value
+
 
     def test_threshold_filter_threhsold(self):
         src = self.make_src()
@@ -72,6 +82,35 @@ class TestThresholdFilter(unittest.TestCase):
                          ))
         return
 
+    def test_sorted_method(self):
+        src = self.make_src()
+        self.e.add_source(src)
+        threshold = Threshold(method='sorted', filter_type='points')
+        self.e.add_filter(threshold)
+        threshold.set(lower_threshold=5., upper_threshold=20.)
+        output = threshold.outputs[0]
+        self.assertEqual(output.number_of_points, 16)
+        s = output.point_data.scalars.to_array()
+        self.assertTrue(np.all((s >= 5) & (s <= 20)))
+        counts, edges = threshold.get_histogram(bins=13)
+        self.assertEqual(counts.sum(), 27)
+
+        # Cells are thresholded on the mean of their point scalars,
+        # which is one of 6.5, 7.5, 9.5, 10.5, 15.5, 16.5, 18.5, 19.5.
+        threshold.filter_type = 'cells'
+        threshold.set(lower_threshold=10., upper_threshold=17.)
+        self.assertEqual(threshold.outputs[0].number_of_cells, 3)
+        threshold.upper_threshold = 26.
+        self.assertEqual(threshold.outputs[0].number_of_cells, 5)
+
+        # The VTK filter uses the thresholds set in sorted mode.
+        threshold.filter_type = 'points'
+        threshold.set(lower_threshold=5., upper_threshold=20.)
+        threshold.method = 'vtk'
+        output = threshold.outputs[0]
+        self.assertTrue(output is threshold.threshold_filter.output)
+        self.assertEqual(output.number_of_points, 16)
+
 
 
 if __name__ == '__main__':
@@ -0,0 +1,68 @@
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import unittest
+
+import numpy as np
+
+# Enthought library imports
+from tvtk.api import tvtk
+from mayavi.tools.camera import world_to_display_points, \
+     display_to_world_points, _get_projection
+
+
+class Holder(object):
+    pass
+
+
+class TestWorldToDisplay(unittest.TestCase):
+
+    def setUp(self):
+        renwin = tvtk.RenderWindow(size=(400, 300))
+        ren = tvtk.Renderer(viewport=(0.1, 0.0, 0.9, 1.0))
+        renwin.add_renderer(ren)
+        cam = ren.active_camera
+        cam.set(position=(3, 4, 10), focal_point=(0, 0, 0),
+                view_up=(0, 1, 0), clipping_range=(1, 30))
+        # A figure with just what the conversions need.
+        self.figure = Holder()
+        self.figure.scene = Holder()
+        self.figure.scene.renderer = ren
+        self.ren = ren
+        self.points = np.random.RandomState(0).randn(20, 3)
+
+    def test_world_to_display(self):
+        "Test if the points are converted like the renderer does"
+        ren = self.ren
+        result = world_to_display_points(self.points, figure=self.figure)
+        self.assertEqual(result.shape, (20, 3))
+        for point, display in zip(self.points, result):
+            ren.world_point = list(point) + [1.0]
+            ren.world_to_display()
+            self.assertTrue(np.allclose(ren.display_point, display))
+
+    def test_display_to_world(self):
+        "Test if the inverse conversion gives the points back"
+        display = world_to_display_points(self.points, figure=self.figure)
+        world = display_to_world_points(display, figure=self.figure)
+        self.assertTrue(np.allclose(world, self.points))
+        # Without a depth the points are on the near clipping plane.
+        ren = self.ren
+        ren.display_point = (100, 150, 0)
+        ren.display_to_world()
+        x, y, z, w = ren.world_point
+        world = display_to_world_points([[100, 150]], figure=self.figure)
+        self.assertTrue(np.allclose(world, [[x/w, y/w, z/w]]))
+
+    def test_cache(self):
+        "Test if the matrix is only computed again when the camera moves"
+        scene = self.figure.scene
+        matrix = _get_projection(scene)[0]
+        self.assertTrue(_get_projection(scene)[0] is matrix)
+        self.ren.active_camera.azimuth(30)
+        self.assertFalse(_get_projection(scene)[0] is matrix)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,12 +5,21 @@ Simple utility code for animations.
 # Copyright (c) 2009, Enthought, Inc.
 # License: BSD Style.
 
+import sys
 import types
+import threading
+from collections import deque
+from Queue import Queue, Empty, Full
+from timeit import default_timer as clock
 
 from pyface.timer.api import Timer
-from traits.api import HasTraits, Button, Instance, Range
+from traits.api import HasTraits, Button, Instance, Range, Bool, Float, \
+     Int, Any
 from traitsui.api import View, Group, Item
 
+# Marks the end of the frames in the queue of a `ThreadedAnimator`.
+_DONE = object()
+
 ################################################################################
 # `Animator` class.
 ################################################################################
@@ -103,11 +112,248 @@ class Animator(HasTraits):
             t.Start(value)
 
 
+################################################################################
+# `ThreadedAnimator` class.
+################################################################################
+class ThreadedAnimator(HasTraits):
+
+    """ Runs an animation whose frames are computed by a worker thread
+        and shown by the UI.  The `producer` is called repeatedly on the
+        worker thread and returns the data of the next frame.  It may
+        raise `StopIteration` to end the animation, so the `next` method
+        of a generator can be used.  The frames are queued and the
+        `consumer` is called on the UI thread with the most recent
+        frame.  Older frames are dropped if the UI falls behind.  Here
+        is a simple example::
+
+            >>> import numpy as np
+            >>> from mayavi import mlab
+            >>> x, y = np.mgrid[-3:3:100j, -3:3:100j]
+            >>> s = mlab.surf(x, y, np.sin(x*y))
+            >>> def frames():
+            ...     t = 0.0
+            ...     while 1:
+            ...         t += 0.1
+            ...         yield np.sin(x*y + t)
+            ...
+            >>> a = ThreadedAnimator(50, frames().next,
+            ...                      lambda z: s.mlab_source.set(scalars=z))
+
+        The producer should only compute data and not touch the
+        pipeline or the scene, which must be done by the consumer.  The
+        animation only runs faster if the producer spends its time in
+        code that releases the GIL, such as large NumPy operations.
+    """
+
+    ########################################
+    # Traits.
+
+    start = Button('Start Animation')
+    stop = Button('Stop Animation')
+    delay = Range(10, 100000, 500,
+                  desc='the minimum delay in milliseconds between frames')
+
+    # Lengthen the delay when showing a frame takes longer than it.
+    adaptive = Bool(True, desc='if the delay adapts to the time taken '\
+                               'to show a frame')
+
+    # The maximum number of frames computed ahead of the one shown.
+    queue_size = Range(1, 100, 2,
+                       desc='the maximum number of frames computed ahead')
+
+    # Is the animation running?
+    running = Bool(False)
+
+    # The number of frames shown.
+    frames = Int(0)
+
+    # The number of frames dropped since the UI fell behind.
+    dropped_frames = Int(0)
+
+    # The achieved number of frames shown per second.
+    fps = Float(0.0)
+
+    # The average time in seconds taken by the consumer to show a
+    # frame.
+    frame_time = Float(0.0)
+
+    # The internal timer we manage.
+    timer = Instance(Timer)
+
+    ########################################
+    # Private traits.
+
+    # The delay currently used by the timer.
+    _interval = Int(0)
+
+    # The times at which the last frames were shown.
+    _frame_times = Any
+
+    ######################################################################
+    # User interface view
+
+    traits_view = View(Group(Item('start'),
+                             Item('stop'),
+                             show_labels = False
+                             ),
+                             Item('_'),
+                       Item(name = 'delay'),
+                       Item(name = 'adaptive'),
+                       Item(name = 'fps', style='readonly'),
+                       Item(name = 'dropped_frames', style='readonly'),
+                       title = 'Animation Controller',
+                       buttons = ['OK'])
+
+    ######################################################################
+    # Initialize object
+    def __init__(self, millisec, producer, consumer, **traits):
+        """Constructor.  The animation is started right away.
+
+        **Parameters**
+
+          :millisec: int specifying the minimum delay in milliseconds
+                     between frames.
+
+          :producer: callable returning the data of the next frame.
+                     It is called on a worker thread.
+
+          :consumer: callable showing the data of a frame.  It is called
+                     on the UI thread.
+
+        """
+        HasTraits.__init__(self, **traits)
+        self.delay = millisec
+        self.producer = producer
+        self.consumer = consumer
+        self._queue = None
+        self._stop_event = None
+        self._error = None
+        self._worker = None
+        # Only one worker at a time may call the producer: a stopped
+        # worker may still be computing a frame when the animation is
+        # restarted.
+        self._producer_lock = threading.Lock()
+        self._frame_times = deque(maxlen=30)
+        self._start_fired()
+
+    ######################################################################
+    # Non-public methods, Event handlers
+    def _start_fired(self):
+        if self.running:
+            return
+        self.running = True
+        self._error = None
+        self._frame_times.clear()
+        self._queue = Queue(self.queue_size)
+        self._stop_event = threading.Event()
+        worker = threading.Thread(target=self._produce,
+                                  args=(self._stop_event, self._queue))
+        worker.daemon = True
+        worker.start()
+        self._worker = worker
+        self._interval = self._get_interval()
+        if self.timer is None:
+            self.timer = Timer(self._interval, self._show_frame)
+        else:
+            self.timer.Start(self._interval)
+
+    def _stop_fired(self):
+        if not self.running:
+            return
+        self.running = False
+        self._stop_event.set()
+        self.timer.Stop()
+
+    def _delay_changed(self):
+        self._restart_timer()
+
+    def _adaptive_changed(self):
+        self._restart_timer()
+
+    def _produce(self, stop, queue):
+        """Computes the frames.  This runs on the worker thread and must
+        not touch any traits.
+        """
+        while not stop.is_set():
+            with self._producer_lock:
+                if stop.is_set():
+                    return
+                try:
+                    frame = self.producer()
+                except StopIteration:
+                    frame = _DONE
+                except:
+                    self._error = sys.exc_info()
+                    frame = _DONE
+            while not stop.is_set():
+                try:
+                    queue.put(frame, timeout=0.1)
+                    break
+                except Full:
+                    pass
+            if frame is _DONE:
+                return
+
+    def _show_frame(self):
+        """Shows the most recent frame.  Called by the timer."""
+        if not self.running:
+            return
+        frames = []
+        try:
+            while True:
+                frames.append(self._queue.get_nowait())
+        except Empty:
+            pass
+        done = len(frames) > 0 and frames[-1] is _DONE
+        if done:
+            frames.pop()
+        if len(frames) > 0:
+            self.dropped_frames += len(frames) - 1
+            self._show(frames[-1])
+        if done:
+            self._stop_fired()
+            error = self._error
+            if error is not None:
+                self._error = None
+                raise error[0], error[1], error[2]
+
+    def _show(self, frame):
+        start = clock()
+        self.consumer(frame)
+        end = clock()
+        if self.frames == 0:
+            self.frame_time = end - start
+        else:
+            self.frame_time = 0.8*self.frame_time + 0.2*(end - start)
+        self.frames += 1
+        times = self._frame_times
+        times.append(end)
+        if len(times) > 1:
+            self.fps = (len(times) - 1)/max(times[-1] - times[0], 1e-6)
+        if self.adaptive:
+            interval = self._get_interval()
+            if abs(interval - self._interval) > 0.2*self._interval:
+                self._restart_timer()
+
+    def _get_interval(self):
+        """Returns the delay to use between frames in milliseconds."""
+        if self.adaptive:
+            # Leave some time for the UI to handle other events.
+            return max(self.delay, int(1250*self.frame_time))
+        return self.delay
+
+    def _restart_timer(self):
+        t = self.timer
+        self._interval = self._get_interval()
+        if t is not None and t.IsRunning():
+            t.Stop()
+            t.Start(self._interval)
+
 
 ################################################################################
 # Decorators.
 
-def animate(func=None, delay=500, ui=True):
+def animate(func=None, delay=500, ui=True, consumer=None):
     """ A convenient decorator to animate a generator that performs an
         animation.  The `delay` parameter specifies the delay (in
         milliseconds) between calls to the decorated function. If `ui` is
@@ -125,9 +371,16 @@ def animate(func=None, delay=500, ui=True):
         :ui: bool specifying if a UI controlling the animation is to be
              provided.
 
+        :consumer: optional callable.  If given, the generator is run
+                   on a worker thread, should only compute data and
+                   yield it.  The consumer is called on the UI thread
+                   with the most recent data to update the
+                   visualization, stale data being dropped.
+
         **Returns**
 
-        The decorated function returns an `Animator` instance.
+        The decorated function returns an `Animator` instance, or a
+        `ThreadedAnimator` if a `consumer` is given.
 
         **Examples**
 
@@ -157,6 +410,22 @@ def animate(func=None, delay=500, ui=True):
             ...
             >>> a = anim() # Starts the animation without a UI.
 
+        To compute the data on a worker thread while the UI shows the
+        previous frame (with `x`, `y` and `s` as in the example of
+        `ThreadedAnimator`)::
+
+            >>> def show(z):
+            ...     s.mlab_source.set(scalars=z)
+            ...
+            >>> @mlab.animate(delay=50, consumer=show)
+            ... def anim():
+            ...     t = 0.0
+            ...     while 1:
+            ...         t += 0.1
+            ...         yield np.sin(x*y + t)
+            ...
+            >>> a = anim()
+
         **Notes**
 
         If you want to modify the data plotted by an `mlab` function call,
@@ -169,10 +438,14 @@ def animate(func=None, delay=500, ui=True):
             self.func = function
             self.ui = ui
             self.delay = delay
+            self.consumer = consumer
         def __call__(self, *args, **kw):
             f = self.func(*args, **kw)
             if isinstance(f, types.GeneratorType):
-                a = Animator(self.delay, f.next)
+                if self.consumer is None:
+                    a = Animator(self.delay, f.next)
+                else:
+                    a = ThreadedAnimator(self.delay, f.next, self.consumer)
                 if self.ui:
                     a.edit_traits()
                 return a
@@ -8,6 +8,7 @@ Controlling the camera.
 
 # Standard library imports.
 import warnings
+import weakref
 
 try:
     import numpy as np
@@ -20,10 +21,17 @@ http://numpy.scipy.org
 
 from numpy import pi
 
+from tvtk.pyface.picker import get_world_to_display_matrix, \
+     apply_homogeneous_matrix
+
 # We can't use gcf, as it creates a circular import in camera management
 # routines.
 from engine_manager import get_engine
 
+# The world to display matrices of the scenes and their inverses, with
+# the state of the camera and of the window they were computed for.
+_projections = weakref.WeakKeyDictionary()
+
 def world_to_display(x, y, z, figure=None):
     """ Converts 3D world coordinates to screenshot pixel coordinates.
 
@@ -44,6 +52,10 @@ def world_to_display(x, y, z, figure=None):
             Screenshot x coordinate
         :y: float
             Screenshot y coordinate
+
+        **See also**
+
+        :world_to_display_points: convert many points at once
     """
     if figure is None:
         f = get_engine().current_scene
@@ -58,6 +70,91 @@ def world_to_display(x, y, z, figure=None):
     return x, y
 
 
+def _get_projection(scene):
+    """ Return the world to display matrix of the TVTK scene and its
+        inverse.  They are only computed again when the camera, the
+        size of the window or the viewport changed.
+    """
+    ren = scene.renderer
+    cam = ren.active_camera
+    key = (cam, cam.m_time, tuple(ren.render_window.size),
+           tuple(ren.viewport))
+    cached = _projections.get(scene)
+    if cached is None or cached[0] != key:
+        matrix = get_world_to_display_matrix(ren)
+        cached = (key, matrix, np.linalg.inv(matrix))
+        _projections[scene] = cached
+    return cached[1], cached[2]
+
+
+def world_to_display_points(points, figure=None):
+    """ Converts many 3D world coordinates to screenshot pixel
+        coordinates at once.
+
+        **Parameters**
+
+        :points: array_like
+            An (N, 3) array of world coordinates.
+        :figure: Mayavi figure or None
+            The figure to use for the conversion. If None, the
+            current one is used.
+
+        **Output**
+        :points: array
+            An (N, 3) array of the screenshot x and y coordinates and
+            of the depth of the points, which is between 0 and 1 for
+            the points between the near and far clipping planes.
+
+        **See also**
+
+        :world_to_display: convert a single point
+        :display_to_world_points: the inverse conversion
+    """
+    if figure is None:
+        f = get_engine().current_scene
+    else:
+        f = figure
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    if f is None or f.scene is None:
+        return np.zeros_like(points)
+    matrix = _get_projection(f.scene)[0]
+    return apply_homogeneous_matrix(matrix, points)
+
+
+def display_to_world_points(points, figure=None):
+    """ Converts many screenshot pixel coordinates to 3D world
+        coordinates at once.
+
+        **Parameters**
+
+        :points: array_like
+            An (N, 2) array of screenshot x and y coordinates, or an
+            (N, 3) array also giving the depth of the points (0 on the
+            near clipping plane and 1 on the far one).  The points are
+            on the near clipping plane if no depth is given.
+        :figure: Mayavi figure or None
+            The figure to use for the conversion. If None, the
+            current one is used.
+
+        **Output**
+        :points: array
+            An (N, 3) array of world coordinates.
+    """
+    if figure is None:
+        f = get_engine().current_scene
+    else:
+        f = figure
+    points = np.asarray(points, dtype=float)
+    if points.shape[-1] == 2:
+        points = points.reshape(-1, 2)
+        points = np.column_stack((points, np.zeros(len(points))))
+    points = points.reshape(-1, 3)
+    if f is None or f.scene is None:
+        return np.zeros_like(points)
+    inverse = _get_projection(f.scene)[1]
+    return apply_homogeneous_matrix(inverse, points)
+
+
 def roll(roll=None, figure=None):
     """ Sets or returns the absolute roll angle of the camera.
 
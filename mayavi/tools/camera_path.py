@@ -0,0 +1,303 @@
+"""
+Fly-throughs: rendering a scene along a path of camera keyframes.
+
+A `CameraPath` holds keyframes of the camera (position, focal point,
+view up and view angle at given times).  The frames in between are
+interpolated for all frames at once: the positions and focal points
+along Catmull-Rom splines (or straight lines) and the orientation of
+the camera by spherical interpolation of quaternions, so that the
+camera turns smoothly even when the view up changes a lot between
+keyframes.  The clipping ranges of all the frames are computed from
+the bounds of the scene, measured once.  Every frame is then rendered
+exactly once and handed to a frame sink, for example::
+
+    >>> from mayavi import mlab
+    >>> from mayavi.tools.camera_path import CameraPath, image_writer
+    >>> mlab.test_plot3d()
+    >>> path = CameraPath()
+    >>> path.add_view(0, 60, 20, (0, 0, 0))
+    >>> path.add_view(90, 80, 10, (0, 0, 0))
+    >>> path.add_view(180, 60, 20, (0, 0, 0))
+    >>> path.render(100, image_writer('frame_%04d.png'))
+
+Unlike calling `mlab.view` for every frame, this does not trigger a
+render for each change of the camera nor compute the bounds of the
+scene again.
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import os
+
+import numpy as np
+
+# Enthought library imports.
+from traits.api import HasTraits, List, Bool
+from tvtk.api import tvtk
+
+# Local imports.
+from mayavi.tools.engine_manager import get_engine
+
+# The writers of the image sinks, by file extension.
+WRITERS = {'.png': 'PNGWriter', '.jpg': 'JPEGWriter',
+           '.jpeg': 'JPEGWriter', '.bmp': 'BMPWriter',
+           '.tif': 'TIFFWriter', '.tiff': 'TIFFWriter'}
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def _normalize(v):
+    """Returns the (N, 3) vectors `v` scaled to unit length."""
+    norm = np.sqrt((v*v).sum(axis=-1))
+    return v/np.where(norm > 0, norm, 1.0)[..., None]
+
+def orthogonal_view_ups(directions, view_ups):
+    """Returns the (N, 3) `view_ups` made orthogonal to the (N, 3)
+    unit `directions` of projection, and normalized.
+    """
+    dot = (view_ups*directions).sum(axis=1)
+    return _normalize(view_ups - dot[:, None]*directions)
+
+def quaternions(directions, view_ups):
+    """Returns the (N, 4) quaternions (w, x, y, z) of the orientations
+    of cameras looking along the (N, 3) unit `directions` with the
+    (N, 3) unit orthogonal `view_ups`.
+    """
+    # The axes of the camera are the columns of the rotation.
+    right = np.cross(directions, view_ups)
+    m = np.concatenate((right[:, :, None], view_ups[:, :, None],
+                        -directions[:, :, None]), axis=2)
+    m00, m11, m22 = m[:, 0, 0], m[:, 1, 1], m[:, 2, 2]
+    trace = m00 + m11 + m22
+    # Use the largest of the diagonal terms for accuracy.
+    case = np.argmax(np.column_stack((trace, m00, m11, m22)), axis=1)
+    q = np.empty((len(m), 4))
+    i = case == 0
+    s = 2.0*np.sqrt(1.0 + trace[i])
+    q[i] = np.column_stack((0.25*s, (m[i, 2, 1] - m[i, 1, 2])/s,
+                            (m[i, 0, 2] - m[i, 2, 0])/s,
+                            (m[i, 1, 0] - m[i, 0, 1])/s))
+    i = case == 1
+    s = 2.0*np.sqrt(1.0 + m00[i] - m11[i] - m22[i])
+    q[i] = np.column_stack(((m[i, 2, 1] - m[i, 1, 2])/s, 0.25*s,
+                            (m[i, 0, 1] + m[i, 1, 0])/s,
+                            (m[i, 0, 2] + m[i, 2, 0])/s))
+    i = case == 2
+    s = 2.0*np.sqrt(1.0 + m11[i] - m00[i] - m22[i])
+    q[i] = np.column_stack(((m[i, 0, 2] - m[i, 2, 0])/s,
+                            (m[i, 0, 1] + m[i, 1, 0])/s, 0.25*s,
+                            (m[i, 1, 2] + m[i, 2, 1])/s))
+    i = case == 3
+    s = 2.0*np.sqrt(1.0 + m22[i] - m00[i] - m11[i])
+    q[i] = np.column_stack(((m[i, 1, 0] - m[i, 0, 1])/s,
+                            (m[i, 0, 2] + m[i, 2, 0])/s,
+                            (m[i, 1, 2] + m[i, 2, 1])/s, 0.25*s))
+    return q
+
+def slerp(q0, q1, t):
+    """Spherical linear interpolation between the (N, 4) unit
+    quaternions `q0` and `q1` at the (N,) fractions `t`.
+    """
+    dot = (q0*q1).sum(axis=1)
+    # q and -q are the same rotation, take the shortest way.
+    q1 = np.where(dot[:, None] < 0, -q1, q1)
+    dot = np.clip(np.abs(dot), 0.0, 1.0)
+    theta = np.arccos(dot)
+    sin_theta = np.sin(theta)
+    near = sin_theta < 1e-6
+    sin_theta[near] = 1.0
+    a = np.where(near, 1.0 - t, np.sin((1.0 - t)*theta)/sin_theta)
+    b = np.where(near, t, np.sin(t*theta)/sin_theta)
+    return _normalize(a[:, None]*q0 + b[:, None]*q1)
+
+def rotated_y_axes(q):
+    """Returns the (N, 3) images of the y axis by the rotations of the
+    (N, 4) unit quaternions `q`.
+    """
+    w, x, y, z = q.T
+    return np.column_stack((2.0*(x*y - w*z), 1.0 - 2.0*(x*x + z*z),
+                            2.0*(y*z + w*x)))
+
+def clipping_ranges(positions, directions, bounds, tolerance=0.001):
+    """Returns the (N, 2) near and far clipping distances that enclose
+    the box `bounds` (xmin, xmax, ymin, ymax, zmin, zmax) for cameras
+    at the (N, 3) `positions` looking along the (N, 3) unit
+    `directions`.  The near distance is at least `tolerance` times the
+    far one.
+    """
+    b = np.asarray(bounds, float)
+    corners = np.array([[x, y, z] for x in b[0:2] for y in b[2:4]
+                        for z in b[4:6]])
+    # The distance of each corner along the direction of projection.
+    depth = np.dot(corners, directions.T) - \
+            (positions*directions).sum(axis=1)
+    far = np.maximum(depth.max(axis=0), 0.0)*1.01 + 1e-12
+    near = np.maximum(depth.min(axis=0)*0.99, far*tolerance)
+    return np.column_stack((near, far))
+
+def image_writer(file_name):
+    """Returns a frame sink writing the frames to the files named by
+    formatting `file_name` with the frame number.  The format of the
+    images is given by the extension of `file_name`.
+    """
+    ext = os.path.splitext(file_name)[1].lower()
+    if ext not in WRITERS:
+        raise ValueError('Unable to find suitable image type for given '
+                         'file extension.')
+    writer = getattr(tvtk, WRITERS[ext])()
+
+    def sink(index, image):
+        ny, nx = image.shape[:2]
+        data = tvtk.ImageData(dimensions=(nx, ny, 1))
+        data.point_data.scalars = image[::-1].reshape(nx*ny, -1)
+        data.point_data.scalars.name = 'frame'
+        writer.input = data
+        writer.file_name = file_name%index
+        writer.write()
+    return sink
+
+
+######################################################################
+# `CameraPath` class.
+######################################################################
+class CameraPath(HasTraits):
+    """A path of the camera through keyframes, interpolated and
+    rendered for many frames at once.
+    """
+
+    # The keyframes as (time, position, focal point, view up, view
+    # angle) tuples, sorted by time.
+    keyframes = List
+
+    # Move the camera along Catmull-Rom splines through the positions
+    # and focal points of the keyframes rather than along straight
+    # lines.
+    smooth = Bool(True)
+
+    ######################################################################
+    # `CameraPath` interface.
+    ######################################################################
+    def add_keyframe(self, position, focal_point, view_up=(0, 0, 1),
+                     view_angle=30.0, time=None):
+        """Adds a keyframe of the camera at `time`, by default one after
+        the last keyframe.
+        """
+        if time is None:
+            time = len(self.keyframes) and self.keyframes[-1][0] + 1.0
+        key = (float(time), np.array(position, float),
+               np.array(focal_point, float), np.array(view_up, float),
+               float(view_angle))
+        self.keyframes.append(key)
+        self.keyframes.sort(key=lambda k: k[0])
+
+    def add_view(self, azimuth, elevation, distance, focalpoint,
+                 view_angle=30.0, time=None):
+        """Adds a keyframe viewing `focalpoint` as `mlab.view` would
+        with the given `azimuth`, `elevation` (in degrees) and
+        `distance`.
+        """
+        phi, theta = np.radians(azimuth), np.radians(elevation)
+        direction = np.array([np.cos(phi)*np.sin(theta),
+                              np.sin(phi)*np.sin(theta), np.cos(theta)])
+        view_up = [0, 0, 1]
+        if abs(elevation) < 5. or abs(elevation) > 175.:
+            view_up = [np.sin(phi), np.cos(phi), 0]
+        focalpoint = np.asarray(focalpoint, float)
+        self.add_keyframe(focalpoint + distance*direction, focalpoint,
+                          view_up, view_angle, time)
+
+    def add_current(self, figure=None, time=None):
+        """Adds a keyframe with the current camera of the figure."""
+        if figure is None:
+            figure = get_engine().current_scene
+        cam = figure.scene.camera
+        self.add_keyframe(cam.position, cam.focal_point, cam.view_up,
+                          cam.view_angle, time)
+
+    def interpolate(self, n_frames):
+        """Returns the positions, focal points, view ups (three (N, 3)
+        arrays) and view angles (an (N,) array) of the camera for
+        `n_frames` frames evenly spaced in time from the first
+        keyframe to the last.
+        """
+        keys = self.keyframes
+        if len(keys) < 2:
+            raise ValueError('A camera path needs at least two keyframes')
+        times = np.array([k[0] for k in keys])
+        positions = np.array([k[1] for k in keys])
+        focal_points = np.array([k[2] for k in keys])
+        directions = _normalize(focal_points - positions)
+        view_ups = orthogonal_view_ups(directions,
+                                       np.array([k[3] for k in keys]))
+        view_angles = np.array([k[4] for k in keys])
+
+        t = np.linspace(times[0], times[-1], n_frames)
+        n = len(keys)
+        seg = np.clip(np.searchsorted(times, t, 'right') - 1, 0, n - 2)
+        span = times[seg + 1] - times[seg]
+        u = (t - times[seg])/np.where(span > 0, span, 1.0)
+
+        q = quaternions(directions, view_ups)
+        pos = self._interpolate_points(positions, seg, u)
+        fp = self._interpolate_points(focal_points, seg, u)
+        up = rotated_y_axes(slerp(q[seg], q[seg + 1], u))
+        up = orthogonal_view_ups(_normalize(fp - pos), up)
+        angles = view_angles[seg] + u*(view_angles[seg + 1] -
+                                       view_angles[seg])
+        return pos, fp, up, angles
+
+    def render(self, n_frames, sink, figure=None):
+        """Renders `n_frames` frames along the path in the figure
+        (the current one if None) and calls `sink(index, image)` with
+        the number of each frame and its (ny, nx, 3) RGB image.  See
+        `image_writer` for a sink writing the frames to files.
+        """
+        if figure is None:
+            figure = get_engine().current_scene
+        scene = figure.scene
+        pos, fp, up, angles = self.interpolate(n_frames)
+        # The bounds of the scene do not change while flying around.
+        bounds = scene.renderer.compute_visible_prop_bounds()
+        if bounds[0] <= bounds[1]:
+            clipping = clipping_ranges(pos, _normalize(fp - pos), bounds)
+        else:
+            clipping = None
+
+        cam = scene.camera
+        rw = scene.render_window
+        nx, ny = tuple(scene.get_size())
+        out = tvtk.UnsignedCharArray()
+        scene._lift()
+        for i in range(n_frames):
+            cam.position = pos[i]
+            cam.focal_point = fp[i]
+            cam.view_up = up[i]
+            cam.view_angle = angles[i]
+            cam.compute_view_plane_normal()
+            if clipping is not None:
+                cam.clipping_range = clipping[i]
+            rw.render()
+            rw.get_pixel_data(0, 0, nx - 1, ny - 1, 1, out)
+            image = out.to_array().reshape(ny, nx, 3)
+            sink(i, np.flipud(image).copy())
+
+    ######################################################################
+    # Non-public interface.
+    ######################################################################
+    def _interpolate_points(self, points, seg, u):
+        """Interpolates the (N, 3) `points` of the keyframes in the
+        segments `seg` at the fractions `u`.
+        """
+        p1, p2 = points[seg], points[seg + 1]
+        u = u[:, None]
+        if not self.smooth:
+            return p1 + u*(p2 - p1)
+        # The end points are repeated for the first and last segments.
+        last = len(points) - 1
+        p0 = points[np.maximum(seg - 1, 0)]
+        p3 = points[np.minimum(seg + 2, last)]
+        return 0.5*(2.0*p1 + (p2 - p0)*u +
+                    (2.0*p0 - 5.0*p1 + 4.0*p2 - p3)*u**2 +
+                    (3.0*p1 - p0 - 3.0*p2 + p3)*u**3)
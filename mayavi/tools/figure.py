@@ -302,6 +302,8 @@ def screenshot(figure=None, mode='rgb', antialiased=False):
 
     # Try to lift the window
     figure.scene._lift()
+    # The pixels of a coalesced render still pending would be stale.
+    figure.scene.flush_render()
     if mode == 'rgb':
         out = tvtk.UnsignedCharArray()
         shape = (y, x, 3)
@@ -323,6 +325,7 @@ def screenshot(figure=None, mode='rgb', antialiased=False):
 
         figure.scene.render_window.aa_frames = figure.scene.anti_aliasing_frames
         figure.scene.render()
+        figure.scene.flush_render()
         pixel_getter(*pg_args)
         figure.scene.render_window.aa_frames = old_aa
         figure.scene.render()
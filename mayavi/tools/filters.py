@@ -14,7 +14,7 @@ helper functions.
 import new
 
 from traits.api import Instance, CFloat, CInt, CArray, Trait, \
-            Enum, Property, Any, String
+            Enum, Property, Any, String, Callable, Dict
 from tvtk.common import camel2enthought
 from tvtk.api import tvtk
 import mayavi.filters.api as filters
@@ -23,7 +23,7 @@ from pipe_base import PipeFactory, make_function
 
 # This the list is dynamically populated further down below at the end.
 __all__ = [ 'tube', 'warp_scalar', 'threshold', 'elevation_filter',
-            'set_active_attribute', 'user_defined'
+            'set_active_attribute', 'user_defined', 'array_function'
           ]
 
 
@@ -171,6 +171,41 @@ class UserDefinedFactory(PipeFactory):
 user_defined = make_function(UserDefinedFactory)
 
 
+##############################################################################
+class ArrayFunctionFactory(PipeFactory):
+    """Applies the ArrayFunction mayavi filter to the given VTK object."""
+
+    _target = Instance(filters.ArrayFunction, ())
+
+    function = Callable(adapts='function',
+                    help="""the function computing the new arrays.  It
+                    is called as function(arrays, **parameters) with a
+                    dictionary of NumPy arrays and returns a dictionary
+                    of arrays or a single array.""")
+
+    parameters = Dict(adapts='parameters',
+                    help="the keyword arguments passed to the function")
+
+    attribute = Enum('point', 'cell', adapts='attribute',
+                    help="if the function operates on point or cell data")
+
+    output_name = String('result', adapts='output_name',
+                    help="the name of a single array returned")
+
+    n_threads = CInt(1, adapts='n_threads',
+                    help="the number of threads to split the work across")
+
+    def __init__(self, parent, **kwargs):
+        # Set the function and its parameters before the filter is
+        # added so that it is only evaluated once.
+        for name in ('function', 'parameters'):
+            if name in kwargs:
+                setattr(self._target, name, kwargs[name])
+        super(ArrayFunctionFactory, self).__init__(parent, **kwargs)
+
+array_function = make_function(ArrayFunctionFactory)
+
+
 ############################################################################
 # Automatically generated filters from registry.
 ############################################################################
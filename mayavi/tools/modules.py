@@ -417,6 +417,12 @@ class IsoSurfaceFactory(ContourModuleFactory):
     """
     _target = Instance(modules.IsoSurface, ())
 
+    span_space = Bool(False, adapts='contour.span_space',
+                      desc="""if only the parts of structured data
+                      spanning a contour value are contoured.  This
+                      speeds up contouring data with sparse
+                      features.""")
+
 
 iso_surface = make_function(IsoSurfaceFactory)
 
@@ -8,11 +8,19 @@ pipeline.
 # Copyright (c) 2007-2009, Enthought, Inc.
 # License: BSD Style.
 
-from modules import *
-from sources import *
-from filters import *
-from tools import add_dataset, set_extent, add_module_manager, \
-    get_vtk_src
-from probe_data import probe_data
-from tools import _traverse as traverse
+import sys
+
+# The functions are imported when first used: making a source does not
+# import all the modules and filters.
+from tvtk.common import LazyModule as _LazyModule
+
+sys.modules[__name__] = _LazyModule(__name__, [
+    ('mayavi.tools.sources', '*'),
+    ('mayavi.tools.modules', '*'),
+    ('mayavi.tools.filters', '*'),
+    ('mayavi.tools.tools', ['add_dataset', 'set_extent',
+                            'add_module_manager', 'get_vtk_src',
+                            ('traverse', '_traverse')]),
+    ('mayavi.tools.probe_data', ['probe_data']),
+    ], globals())
 
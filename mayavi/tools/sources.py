@@ -15,6 +15,8 @@ from traits.api import (HasTraits, Instance, CArray, Either,
             Bool, on_trait_change, NO_COMPARE)
 from tvtk.api import tvtk
 from tvtk.common import camel2enthought
+from tvtk.growable_array import GrowablePolyLine
+from tvtk.topology import get_triangle_cells
 
 from mayavi.sources.array_source import ArraySource
 from mayavi.core.registry import registry
@@ -454,7 +456,9 @@ class MArraySource(MlabSource):
 class MLineSource(MlabSource):
     """
     This class represents a line data source for Mlab objects and
-    allows the user to set the x, y, z, scalar attributes.
+    allows the user to set the x, y, z, scalar attributes.  Points can
+    be added to the line with `append` in amortized constant time,
+    which is useful to display growing trajectories.
     """
 
     # The x, y, z and points of the glyphs.
@@ -466,6 +470,12 @@ class MLineSource(MlabSource):
     # The scalars shown on the glyphs.
     scalars = ArrayOrNone
 
+    ########################################
+    # Private traits.
+
+    # The growable buffers holding the points, scalars and the line.
+    _line = Instance(GrowablePolyLine)
+
     ######################################################################
     # `MlabSource` interface.
     ######################################################################
@@ -480,44 +490,58 @@ class MLineSource(MlabSource):
         scalars = self.scalars
         x, y, z = self.x, self.y, self.z
 
-        if 'points' in traits:
-            x=points[:,0].ravel()
-            y=points[:,1].ravel()
-            z=points[:,2].ravel()
-            self.set(x=x,y=y,z=z,trait_change_notify=False)
-
-        else:
+        if 'points' not in traits:
             points = np.c_[x.ravel(), y.ravel(), z.ravel()].ravel()
             points.shape = (len(x), 3)
-            self.set(points=points, trait_change_notify=False)
-
 
         # Create the dataset.
-        n_pts = len(points) - 1
-        lines  = np.zeros((n_pts, 2), 'l')
-        lines[:,0] = np.arange(0, n_pts-0.5, 1, 'l')
-        lines[:,1] = np.arange(1, n_pts+0.5, 1, 'l')
         if self.dataset is None:
             pd = tvtk.PolyData()
         else:
             pd = self.dataset
-        # Avoid lines refering to non existing points: First set the
-        # lines to None, then set the points, then set the lines
-        # refering to the new points.
-        pd.set(lines=None)
-        pd.set(points=points)
-        pd.set(lines=lines)
+        if self._line is None or self._line.polydata is not pd:
+            self._line = GrowablePolyLine(pd)
 
         if scalars is not None and len(scalars) > 0:
-            assert len(x) == len(scalars)
-            pd.point_data.scalars = np.ravel(scalars)
-            pd.point_data.scalars.name = 'scalars'
+            assert len(points) == len(scalars)
+            self._line.set(points, np.ravel(scalars))
+        else:
+            self._line.set(points)
+        self._update_traits()
 
         self.dataset = pd
 
+    ######################################################################
+    # `MLineSource` interface.
+    ######################################################################
+    def append(self, x, y, z, scalars=None):
+        """Appends points, given by numbers or arrays of coordinates,
+        to the line.  Scalars must be given for the new points if the
+        line has scalars.
+        """
+        points = np.c_[np.ravel(x), np.ravel(y), np.ravel(z)]
+        if scalars is not None:
+            scalars = np.ravel(scalars)
+        self._line.extend(points, scalars)
+        self._update_traits()
+        self.update()
+
     ######################################################################
     # Non-public interface.
     ######################################################################
+    def _update_traits(self):
+        """Sets the traits to views of the buffers of the line."""
+        line = self._line
+        points = line.points.to_array()
+        scalars = None
+        if line.scalars is not None:
+            scalars = line.scalars.to_array()
+        # Not using our `set` as that would enable updates again when
+        # called from a trait handler.
+        HasTraits.set(self, trait_change_notify=False, points=points,
+                      x=points[:,0], y=points[:,1], z=points[:,2],
+                      scalars=scalars)
+
     def _x_changed(self, x):
         self.points[:,0] = x
         self.update()
@@ -531,12 +555,17 @@ class MLineSource(MlabSource):
         self.update()
 
     def _points_changed(self, p):
-        self.dataset.points = p
+        line = self._line
+        if line.scalars is not None:
+            line.set(p, line.scalars.to_array().copy())
+        else:
+            line.set(p)
+        self._update_traits()
         self.update()
 
     def _scalars_changed(self, s):
-        self.dataset.point_data.scalars = s.ravel()
-        self.dataset.point_data.scalars.name = 'scalars'
+        self._line.set(self.points.copy(), s.ravel())
+        self._update_traits()
         self.update()
 
 ################################################################################
@@ -789,12 +818,12 @@ class MTriangularMeshSource(MlabSource):
         points.shape = (points.size/3, 3)
         self.set(points=points, trait_change_notify=False)
 
-        triangles = self.triangles
-        assert triangles.shape[1] == 3, \
-            "The shape of the triangles array must be (X, 3)"
-        assert triangles.max() < len(points), \
+        # The cell array is cached on the triangles, so animations that
+        # only change the points do not convert the triangles again.
+        polys, min_id, max_id = get_triangle_cells(self.triangles)
+        assert max_id < len(points), \
             "The triangles indices must be smaller that the number of points"
-        assert triangles.min() >= 0, \
+        assert min_id >= 0, \
             "The triangles indices must be positive or null"
 
         if self.dataset is None:
@@ -804,7 +833,7 @@ class MTriangularMeshSource(MlabSource):
         # Set the points first, and the triangles after: so that the
         # polygone can refer to the right points, in the polydata.
         pd.set(points=points)
-        pd.set(polys=triangles)
+        pd.set(polys=polys)
 
         if (not 'scalars' in traits
                     and scalars is not None
@@ -851,12 +880,13 @@ class MTriangularMeshSource(MlabSource):
         self.update()
 
     def _triangles_changed(self, triangles):
-        if triangles.min() < 0:
+        polys, min_id, max_id = get_triangle_cells(triangles)
+        if min_id < 0:
             raise ValueError, 'The triangles array has negative values'
-        if triangles.max() > self.x.size:
+        if max_id > self.x.size:
             raise ValueError, 'The triangles array has values larger than' \
                                         'the number of points'
-        self.dataset.polys = triangles
+        self.dataset.polys = polys
         self.update()
 
 
@@ -326,12 +326,15 @@ def set_extent(module, extents):
 def start_recording(ui=True):
     """Start automatic script recording.  If the `ui` parameter is
     `True`, it creates a recorder with a user interface, if not it
-    creates a vanilla recorder without a UI.
+    creates a vanilla recorder without a UI.  The recorded events are
+    turned into code when the recording is stopped or the script is
+    saved, keeping only the last of consecutive changes of a trait or
+    of the camera.
 
     **Returns**
-        The `Recorder` instance created.
+        The `BufferedRecorder` instance created.
     """
-    from apptools.scripting.api import start_recording as start
+    from mayavi.core.recorder import start_recording as start
     e = get_engine()
     msg = "Current engine, %s, is already being recorded."%(e)
     assert e.recorder is None, msg
@@ -3,15 +3,18 @@
 
 # The external API for tvtk.
 
+import sys
+
+from tvtk.common import LazyModule as _LazyModule
 
 # The version of TVTK that is installed
 from tvtk.version import version, version as __version__
 
-# The TVTK pseudo-module.
-from tvtk.tvtk_access import tvtk
-
-# Handy colors from VTK.
-from vtk.util import colors
-
-# Some miscellaneous functionality.
-from tvtk.misc import write_data
+# The TVTK pseudo-module (`tvtk`), handy colors from VTK (`colors`) and
+# some miscellaneous functionality (`write_data`) are imported when
+# first used.
+sys.modules[__name__] = _LazyModule(__name__, [
+    ('tvtk.tvtk_access', ['tvtk']),
+    ('vtk.util.colors', None),
+    ('tvtk.misc', ['write_data']),
+    ], globals())
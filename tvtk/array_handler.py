@@ -45,6 +45,11 @@ elif VTK_LONG_TYPE_SIZE == 8:
 
 BASE_REFERENCE_COUNT = vtk.vtkObject().GetReferenceCount()
 
+# A callable invoked as `conversion_hook(function_name, nbytes)` after
+# every conversion by `array2vtk` and `vtk2array`.  This is used for
+# profiling and is None when not needed.
+conversion_hook = None
+
 
 ######################################################################
 # The array cache.
@@ -85,8 +90,10 @@ class ArrayCache(object):
         # `lambda` function is necessary because the callback will not
         # receive the object (it will receive `None`) and thus there
         # is no way to know which array reference one has to remove.
-        vtk_arr.AddObserver('DeleteEvent', lambda o, e, key=key: \
-                            self._remove_array(key))
+        # Arrays that are already cached have the callback already.
+        if key not in cache:
+            vtk_arr.AddObserver('DeleteEvent', lambda o, e, key=key: \
+                                self._remove_array(key))
 
         # Cache the array
         cache[key] = np_arr
@@ -314,6 +321,8 @@ def array2vtk(num_array, vtk_array=None):
         global _array_cache
         _array_cache.add(result_array, z_flat)
 
+    if conversion_hook is not None:
+        conversion_hook('array2vtk', z_flat.nbytes)
     return result_array
 
 
@@ -352,6 +361,8 @@ def vtk2array(vtk_array):
         if shape[1] == 1:
             shape = (shape[0], )
         arr = numpy.reshape(arr, shape)
+        if conversion_hook is not None:
+            conversion_hook('vtk2array', arr.nbytes)
         return arr
 
     # If VTK's new numpy support is available, use the buffer interface.
@@ -361,6 +372,8 @@ def vtk2array(vtk_array):
         if shape[1] == 1:
             shape = (shape[0], )
         result.shape = shape
+        if conversion_hook is not None:
+            conversion_hook('vtk2array', result.nbytes)
         return result
 
     # Setup an imaging pipeline to export the array.
@@ -406,6 +419,8 @@ def vtk2array(vtk_array):
     if shape[1] == 1:
         shape = (shape[0], )
     im_arr = numpy.reshape(im_arr, shape)
+    if conversion_hook is not None:
+        conversion_hook('vtk2array', im_arr.nbytes)
     return im_arr
 
 
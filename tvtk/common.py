@@ -8,6 +8,9 @@ dependencies (apart from the standard library of course).
 
 import string
 import re
+import sys
+import types
+from importlib import import_module
 
 ######################################################################
 # Utility functions.
@@ -75,3 +78,96 @@ class _Camel2Enthought:
 
 # Instantiate a converter.
 camel2enthought = _Camel2Enthought()
+
+
+######################################################################
+# `LazyModule` class.
+######################################################################
+class LazyModule(types.ModuleType):
+    """A module whose attributes are imported when they are first used,
+    so that importing it is fast.  A module replaces itself with a lazy
+    module by doing::
+
+        sys.modules[__name__] = LazyModule(__name__, imports, globals())
+
+    `imports` is a list of `(module_name, names)` pairs, where `names`
+    is either:
+
+      - a list of the names of the attributes taken from the module,
+        a name can also be a `(name, name_in_module)` pair,
+      - None, to make the module itself an attribute, named by the
+        last component of its name,
+      - '*', for all the names in the `__all__` of the module.  These
+        modules are imported in turn when an unknown name is looked up,
+        and by `dir()` to list their names.
+
+    The attributes of the `namespace` dictionary are copied to the lazy
+    module, the module it was taken from is kept alive (in Python 2 the
+    globals of a module are cleared when it is deleted).
+    """
+
+    def __init__(self, name, imports, namespace=None):
+        super(LazyModule, self).__init__(name)
+        lazy = {}
+        wildcards = []
+        for module_name, names in imports:
+            if names is None:
+                lazy[module_name.split('.')[-1]] = (module_name, None)
+            elif names == '*':
+                wildcards.append(module_name)
+            else:
+                for attr in names:
+                    if isinstance(attr, tuple):
+                        attr, attr_in_module = attr
+                    else:
+                        attr_in_module = attr
+                    lazy[attr] = (module_name, attr_in_module)
+        self.__dict__['_lazy'] = lazy
+        self.__dict__['_wildcards'] = wildcards
+        if namespace is not None:
+            for key, value in namespace.items():
+                if key not in ('__builtins__', '__all__'):
+                    self.__dict__[key] = value
+            self.__dict__['_module'] = sys.modules.get(name)
+
+    def __getattr__(self, name):
+        if name == '__all__':
+            value = self._get_all()
+        elif name.startswith('__'):
+            raise AttributeError(name)
+        else:
+            value = self._import(name)
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        names = set(self.__dict__) | set(self._lazy)
+        for module_name in self._wildcards:
+            names.update(import_module(module_name).__all__)
+        return sorted(names)
+
+    def _import(self, name):
+        """Imports the attribute `name`."""
+        if name in self._lazy:
+            module_name, attr = self._lazy[name]
+            module = import_module(module_name)
+            if attr is None:
+                return module
+            return getattr(module, attr)
+        for module_name in self._wildcards:
+            module = import_module(module_name)
+            if name in module.__all__:
+                return getattr(module, name)
+        raise AttributeError("'module' object has no attribute '%s'"%name)
+
+    def _get_all(self):
+        """Returns the public names of the module, importing the
+        wildcard modules."""
+        names = set(n for n in self._lazy if not n.startswith('_'))
+        for key, value in self.__dict__.items():
+            if not key.startswith('_') and \
+                   not isinstance(value, types.ModuleType):
+                names.add(key)
+        for module_name in self._wildcards:
+            names.update(import_module(module_name).__all__)
+        return sorted(names)
@@ -0,0 +1,205 @@
+"""
+Arrays that can be appended to in amortized constant time and that
+share their data with VTK.
+
+`GrowableArray` keeps its data in a NumPy buffer whose capacity is
+doubled when it runs out of room.  A VTK data array points at the
+filled part of the buffer, so appending does not copy the existing
+data and VTK never holds a copy either.  `GrowablePolyLine` uses these
+to maintain a poly data holding a single poly line that grows as
+points are appended, which is handy for live trajectories.
+
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+import numpy
+import vtk
+
+from tvtk.api import tvtk
+from tvtk.array_handler import _array_cache, create_vtk_array, \
+     get_vtk_array_type, ID_TYPE_CODE
+
+
+######################################################################
+# `GrowableArray` class.
+######################################################################
+class GrowableArray(object):
+    """An array of `n_components` values per row that grows as rows are
+    appended.  The `vtk_array` attribute is a VTK data array sharing
+    the data.
+    """
+
+    def __init__(self, n_components=1, dtype=float, capacity=16,
+                 vtk_array=None):
+        self.n_components = n_components
+        self.dtype = numpy.dtype(dtype)
+        self.size = 0
+        self._data = numpy.empty((max(capacity, 1), n_components),
+                                 self.dtype)
+        if vtk_array is None:
+            vtk_array = create_vtk_array(get_vtk_array_type(self.dtype))
+        vtk_array.SetNumberOfComponents(n_components)
+        self.vtk_array = vtk_array
+        self._update_vtk_array()
+
+    def __len__(self):
+        return self.size
+
+    def _get_capacity(self):
+        return len(self._data)
+
+    capacity = property(_get_capacity, None, None,
+                        "The number of rows that fit without growing.")
+
+    def to_array(self):
+        """Returns a view of the filled part of the buffer.  The view
+        has one dimension when there is a single component.
+        """
+        data = self._data[:self.size]
+        if self.n_components == 1:
+            return data[:, 0]
+        return data
+
+    def append(self, value):
+        """Appends a single row."""
+        self.extend([value])
+
+    def extend(self, values):
+        """Appends the given rows and returns the index of the first
+        one.
+        """
+        values = numpy.asarray(values, self.dtype)
+        values = values.reshape(-1, self.n_components)
+        start = self.size
+        end = start + len(values)
+        if end > self.capacity:
+            self._grow(end)
+        self._data[start:end] = values
+        self.size = end
+        self._update_vtk_array()
+        return start
+
+    def set(self, values):
+        """Replaces all the rows with the given ones."""
+        self.size = 0
+        self.extend(values)
+
+    def clear(self):
+        """Removes all the rows."""
+        self.size = 0
+        self._update_vtk_array()
+
+    ######################################################################
+    # Non-public interface.
+    ######################################################################
+    def _grow(self, size):
+        """Grows the buffer so at least `size` rows fit, at least
+        doubling its capacity so appends are amortized constant time.
+        """
+        capacity = max(size, 2*self.capacity)
+        data = numpy.empty((capacity, self.n_components), self.dtype)
+        data[:self.size] = self._data[:self.size]
+        self._data = data
+
+    def _update_vtk_array(self):
+        # Point the VTK array at the filled rows.  The last argument
+        # (1) tells the array not to deallocate.  The array cache keeps
+        # the buffer alive while the VTK array lives, and lets
+        # `vtk2array` return a view of it.
+        flat = self._data[:self.size].reshape(-1)
+        self.vtk_array.SetVoidArray(numpy.getbuffer(self._data),
+                                    len(flat), 1)
+        _array_cache.add(self.vtk_array, flat)
+        self.vtk_array.Modified()
+
+
+######################################################################
+# `GrowablePolyLine` class.
+######################################################################
+class GrowablePolyLine(object):
+    """Maintains the points, an optional point scalar and a single poly
+    line through all the points of a poly data.  Points can be appended
+    in amortized constant time.
+    """
+
+    def __init__(self, polydata=None, capacity=16):
+        if polydata is None:
+            polydata = tvtk.PolyData()
+        self.polydata = polydata
+        self.points = GrowableArray(3, float, capacity)
+        # The scalars, created when first given.
+        self.scalars = None
+        # The connectivity of the poly line: the number of points
+        # followed by their ids.
+        self._ids = GrowableArray(1, ID_TYPE_CODE, capacity + 1,
+                                  vtk_array=vtk.vtkIdTypeArray())
+        self._ids.append(0)
+        self._lines = vtk.vtkCellArray()
+        self._no_lines = vtk.vtkCellArray()
+        pd = tvtk.to_vtk(polydata)
+        self._vtk_points = vtk.vtkPoints()
+        self._vtk_points.SetData(self.points.vtk_array)
+        pd.SetPoints(self._vtk_points)
+        self._update()
+
+    def __len__(self):
+        return len(self.points)
+
+    def extend(self, points, scalars=None):
+        """Appends the given points (and their scalars) to the line."""
+        points = numpy.asarray(points, float).reshape(-1, 3)
+        self._check_scalars(len(points), scalars)
+        start = self.points.extend(points)
+        self._ids.extend(numpy.arange(start, start + len(points)))
+        if scalars is not None:
+            self.scalars.extend(numpy.ravel(scalars))
+        self._update()
+
+    def set(self, points, scalars=None):
+        """Replaces the points (and scalars) of the line."""
+        self.clear()
+        self.extend(points, scalars)
+
+    def clear(self):
+        """Removes all the points."""
+        self.points.clear()
+        self._ids.set([0])
+        if self.scalars is not None:
+            self.scalars.clear()
+        self._update()
+
+    ######################################################################
+    # Non-public interface.
+    ######################################################################
+    def _check_scalars(self, n, scalars):
+        with_scalars = self.scalars is not None and len(self.scalars) > 0
+        if len(self.points) > 0 and with_scalars != (scalars is not None):
+            raise ValueError("Scalars must be given for all or none "
+                             "of the points.")
+        pd = tvtk.to_vtk(self.polydata)
+        if scalars is None:
+            if self.scalars is not None:
+                pd.GetPointData().SetScalars(None)
+                self.scalars = None
+            return
+        if numpy.size(scalars) != n:
+            raise ValueError("There must be one scalar per point.")
+        if self.scalars is None:
+            self.scalars = GrowableArray(1, float, self.points.capacity)
+            self.scalars.vtk_array.SetName('scalars')
+            pd.GetPointData().SetScalars(self.scalars.vtk_array)
+
+    def _update(self):
+        n = len(self.points)
+        ids = self._ids
+        ids.to_array()[0] = n
+        pd = tvtk.to_vtk(self.polydata)
+        if n > 1:
+            self._lines.SetCells(1, ids.vtk_array)
+            self._lines.Modified()
+            pd.SetLines(self._lines)
+        else:
+            pd.SetLines(self._no_lines)
+        self._vtk_points.Modified()
+        pd.Modified()
@@ -0,0 +1,161 @@
+"""Levels of detail for the actors of a scene while the user interacts
+with it.
+
+While the scene is rotated, panned or zoomed, the actors with many
+cells are replaced by simplified stand-ins: a decimated copy of their
+data, a cloud of some of their points or their bounding box.  The
+stand-ins share the property, the lookup table and the transform of the
+actor they replace, and are removed when the interaction ends.  The
+simplified data is cached until the data of the actor changes.
+
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+from traits.api import HasTraits, Int, Dict, List, Any
+from tvtk.api import tvtk
+
+# The levels of detail, from the finest to the coarsest.
+LEVELS = ['decimated', 'points', 'bounding_box']
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def make_lod(data, level, n_cells):
+    """Returns a `tvtk.PolyData` simplifying the poly data `data` for
+    the `level` of detail, with about `n_cells` cells.
+    """
+    if level == 'decimated':
+        if data.point_data.scalars is not None:
+            # The clustering only keeps the cell data.
+            p2c = tvtk.PointDataToCellData(input=data)
+            p2c.update()
+            data = p2c.output
+        # A closed surface clustered on a grid of n**3 divisions has
+        # roughly 8*n**2 triangles.
+        n = max(4, int((n_cells/8.0)**0.5))
+        f = tvtk.QuadricClustering(input=data, number_of_divisions=(n, n, n),
+                                   auto_adjust_number_of_divisions=True,
+                                   copy_cell_data=True)
+    elif level == 'points':
+        ratio = max(1, data.number_of_points//n_cells)
+        f = tvtk.MaskPoints(input=data, on_ratio=ratio,
+                            maximum_number_of_points=n_cells,
+                            generate_vertices=True,
+                            single_vertex_per_cell=True)
+    elif level == 'bounding_box':
+        f = tvtk.OutlineSource(bounds=data.bounds)
+    else:
+        raise ValueError('Unknown level of detail: %s'%level)
+    f.update()
+    result = tvtk.PolyData()
+    result.shallow_copy(f.output)
+    return result
+
+
+######################################################################
+# `InteractionLOD` class.
+######################################################################
+class InteractionLOD(HasTraits):
+    """Swaps the large actors of a renderer with simplified stand-ins
+    and back.
+    """
+
+    # The actors with fewer cells are not simplified.
+    min_cells = Int(100000)
+
+    # The number of cells of a simplified actor.
+    n_cells = Int(20000)
+
+    # The current level of detail, None when the actors are shown.
+    level = Any
+
+    # The simplified data of the actors, keyed on the address of the
+    # actors.  The values are the modification time of the data and
+    # the simplified data for each level.
+    _cache = Dict
+
+    # The actors replaced and their stand-ins.
+    _stand_ins = List
+
+    ######################################################################
+    # `InteractionLOD` interface.
+    ######################################################################
+    def get_actors(self, renderer):
+        """Returns the visible actors of `renderer` with poly data of at
+        least `min_cells` cells.
+        """
+        result = []
+        for actor in renderer.actors:
+            mapper = actor.mapper
+            if not actor.visibility or \
+                   not isinstance(mapper, tvtk.PolyDataMapper):
+                continue
+            data = mapper.input
+            if data is not None and data.number_of_cells >= self.min_cells:
+                result.append(actor)
+        return result
+
+    def update(self, renderer, level):
+        """Makes the simplified data of the actors of `renderer` for
+        `level` and forgets the actors no longer in the renderer.
+        """
+        actors = self.get_actors(renderer)
+        addresses = set(_get_address(a) for a in actors)
+        for key in self._cache.keys():
+            if key not in addresses:
+                del self._cache[key]
+        for actor in actors:
+            self._get_lod(actor, level)
+
+    def set_level(self, renderer, level):
+        """Replaces the actors of `renderer` by their stand-ins for
+        `level`, or restores them if `level` is None.
+        """
+        self.restore(renderer)
+        if level is None:
+            return
+        for actor in self.get_actors(renderer):
+            mapper = tvtk.PolyDataMapper()
+            # Use the same colors as the actor.
+            mapper.shallow_copy(actor.mapper)
+            mapper.input = self._get_lod(actor, level)
+            if level == 'bounding_box':
+                mapper.scalar_visibility = False
+            stand_in = tvtk.Actor()
+            stand_in.shallow_copy(actor)
+            stand_in.mapper = mapper
+            # The actors are removed rather than hidden so that their
+            # traits do not change.
+            renderer.remove_actor(actor)
+            renderer.add_actor(stand_in)
+            self._stand_ins.append((actor, stand_in))
+        self.level = level
+
+    def restore(self, renderer):
+        """Puts the actors replaced by `set_level` back."""
+        for actor, stand_in in self._stand_ins:
+            renderer.remove_actor(stand_in)
+            renderer.add_actor(actor)
+        self._stand_ins = []
+        self.level = None
+
+    ######################################################################
+    # Non-public interface.
+    ######################################################################
+    def _get_lod(self, actor, level):
+        """Returns the simplified data of `actor` for `level`."""
+        data = actor.mapper.input
+        key = _get_address(actor)
+        entry = self._cache.get(key)
+        if entry is None or entry[0] != data.m_time:
+            entry = self._cache[key] = (data.m_time, {})
+        lods = entry[1]
+        if level not in lods:
+            lods[level] = make_lod(data, level, self.n_cells)
+        return lods[level]
+
+
+def _get_address(obj):
+    return tvtk.to_vtk(obj).GetAddressAsString('vtkObject')
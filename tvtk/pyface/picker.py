@@ -16,13 +16,20 @@ can interactively select a point and/or a cell in the data.  One can
 also can use a world point picker (i.e. a generic point in space) and
 probe for the data at that point.
 
+Repeated picks (for example while hovering) may be accelerated by
+caching a cell locator per picked dataset; the locators are only
+rebuilt when the dataset is modified.  Points or cells inside a
+rectangle of the window may also be selected in one go.
+
 """
 # Author: Prabhu Ramachandran <prabhu_r@users.sf.net>
 # Copyright (c) 2004, Enthought, Inc.
 # License: BSD Style.
 
+import numpy
+
 from traits.api import HasTraits, Trait, Long, Array, Any, Float, \
-                                 Instance, Range, true, Str
+                                 Instance, Range, true, false, Str
 from traitsui.api import View, Group, Item, Handler
 from tvtk.api import tvtk
 from tvtk.tvtk_base import TraitRevPrefixMap, false_bool_trait
@@ -46,6 +53,129 @@ def get_last_input(data):
     return inp
 
 
+def get_world_to_display_matrix(renderer):
+    """Returns the 4x4 matrix (as a numpy array) that maps homogeneous
+    world coordinates to homogeneous display coordinates of the given
+    renderer.  This is the composite of the camera's view and
+    projection transforms and the renderer's viewport mapping.
+    """
+    width, height = renderer.render_window.size
+    vp = renderer.viewport
+    vp_width = width*(vp[2] - vp[0])
+    vp_height = height*(vp[3] - vp[1])
+    aspect = float(vp_width)/max(vp_height, 1)
+    camera = renderer.active_camera
+    proj = camera.get_composite_projection_transform_matrix(aspect, 0, 1)
+    viewport = numpy.array([[0.5*vp_width, 0, 0, 0.5*vp_width + width*vp[0]],
+                            [0, 0.5*vp_height, 0, 0.5*vp_height + height*vp[1]],
+                            [0, 0, 1, 0],
+                            [0, 0, 0, 1]], dtype=float)
+    return numpy.dot(viewport, proj.to_array())
+
+
+def apply_homogeneous_matrix(matrix, points):
+    """Transforms the (N, 3) array of points with the 4x4 homogeneous
+    `matrix` and returns the (N, 3) array of transformed points.
+    """
+    points = numpy.asarray(points, dtype=float)
+    result = numpy.dot(points, matrix[:3, :3].T) + matrix[:3, 3]
+    w = numpy.dot(points, matrix[3, :3]) + matrix[3, 3]
+    result /= w[:, numpy.newaxis]
+    return result
+
+
+def get_points_array(dataset):
+    """Returns the coordinates of the points of any dataset as an
+    (N, 3) array.  For point sets this is a view of the data.
+    """
+    if isinstance(dataset, tvtk.ImageData):
+        nx, ny, nz = dataset.dimensions
+        origin = numpy.asarray(dataset.origin)
+        spacing = numpy.asarray(dataset.spacing)
+        k, j, i = numpy.mgrid[:nz, :ny, :nx]
+        ijk = numpy.column_stack((i.ravel(), j.ravel(), k.ravel()))
+        return origin + ijk*spacing
+    elif isinstance(dataset, tvtk.RectilinearGrid):
+        x = dataset.x_coordinates.to_array()
+        y = dataset.y_coordinates.to_array()
+        z = dataset.z_coordinates.to_array()
+        points = numpy.empty((len(z), len(y), len(x), 3))
+        points[..., 0] = x
+        points[..., 1] = y[:, numpy.newaxis]
+        points[..., 2] = z[:, numpy.newaxis, numpy.newaxis]
+        return points.reshape(-1, 3)
+    points = dataset.points
+    if points is None:
+        return numpy.zeros((0, 3))
+    return points.to_array()
+
+
+######################################################################
+# `PickLocators` class.
+######################################################################
+class PickLocators(object):
+    """Builds and caches a cell locator for every pickable dataset of
+    a renderer.  A locator is rebuilt only when its dataset has been
+    modified.  Attaching the locators to a `tvtk.CellPicker` lets it
+    find the picked cell without scanning the whole dataset.
+    """
+
+    def __init__(self):
+        # Maps the address of the VTK dataset to a tuple of the
+        # dataset's modification time and its locator.
+        self._locators = {}
+        # The number of locators built so far.
+        self.builds = 0
+
+    def get_locator(self, dataset):
+        """Returns an up to date cell locator for the dataset."""
+        key = dataset._vtk_obj.__this__
+        mtime = dataset.m_time
+        entry = self._locators.get(key)
+        if entry is None or entry[0] != mtime:
+            locator = tvtk.CellLocator(data_set=dataset)
+            locator.build_locator()
+            self.builds += 1
+            entry = (mtime, locator)
+            self._locators[key] = entry
+        return entry[1]
+
+    def get_datasets(self, renderer):
+        """Returns the datasets of the visible and pickable actors of
+        the renderer.
+        """
+        datasets = []
+        for actor in renderer.actors:
+            if not (actor.visibility and actor.pickable):
+                continue
+            mapper = actor.mapper
+            if mapper is None or mapper.input is None:
+                continue
+            datasets.append(mapper.input)
+        return datasets
+
+    def attach(self, picker, renderer):
+        """Attaches the locators of the datasets of `renderer` to the
+        cell picker.  Locators of datasets that are no longer shown
+        are discarded.
+        """
+        if not hasattr(picker, 'add_locator'):
+            # Old versions of VTK do not support locators.
+            return
+        picker.remove_all_locators()
+        old = self._locators
+        self._locators = {}
+        for dataset in self.get_datasets(renderer):
+            key = dataset._vtk_obj.__this__
+            if key in old:
+                self._locators[key] = old[key]
+            picker.add_locator(self.get_locator(dataset))
+
+    def clear(self):
+        """Discards all the locators."""
+        self._locators.clear()
+
+
 ######################################################################
 # `PickedData` class.
 ######################################################################
@@ -222,6 +352,11 @@ class Picker(HasTraits):
     # Raise the GUI on pick ?
     auto_raise = true(desc = "whether to raise the picker GUI on pick")
 
+    # Build and cache locators to speed up repeated picks ?  With this
+    # on, point picks pick the closest point of the picked cell.
+    use_locators = false(desc="whether locators are cached to speed up "
+                              "repeated picks")
+
     default_view = View(Group(Group(Item(name='pick_type'),
                                     Item(name='tolerance'), show_border=True),
                               Group(Item(name='pick_handler', style='custom'),
@@ -243,6 +378,9 @@ class Picker(HasTraits):
         self.pointpicker = tvtk.PointPicker()
         self.cellpicker = tvtk.CellPicker()
         self.worldpicker = tvtk.WorldPointPicker()
+        self.locators = PickLocators()
+        # Cached cell centers used by `select_area`.
+        self._cell_centers = {}
         self.probe_data = tvtk.PolyData()
         self._tolerance_changed(self.tolerance)
 
@@ -266,7 +404,8 @@ class Picker(HasTraits):
 
     def __get_pure_state__(self):
         d = self.__dict__.copy()
-        for x in ['renwin', 'ui', 'pick_handler', '__sync_trait__', '__traits_listener__']:
+        for x in ['renwin', 'ui', 'pick_handler', 'locators',
+                  '_cell_centers', '__sync_trait__', '__traits_listener__']:
             d.pop(x, None)
         return d
 
@@ -315,6 +454,9 @@ class Picker(HasTraits):
 
     def pick_point(self, x, y):
         """ Picks the nearest point. Returns a `PickedData` instance."""
+        if self.use_locators:
+            return self._pick_point_with_locators(x, y)
+
         self.pointpicker.pick((float(x), float(y), 0.0), self.renwin.renderer)
 
         pp = self.pointpicker
@@ -340,13 +482,7 @@ class Picker(HasTraits):
 
     def pick_cell (self, x, y):
         """ Picks the nearest cell. Returns a `PickedData` instance."""
-        try:
-            self.cellpicker.pick(float(x), float(y), 0.0,
-                                 self.renwin.renderer)
-        except TypeError:
-            # On old versions of VTK, the signature used to be different
-            self.cellpicker.pick((float(x), float(y), 0.0),
-                                 self.renwin.renderer)
+        self._cell_pick(x, y)
 
         cp = self.cellpicker
         id = cp.cell_id
@@ -375,7 +511,7 @@ class Picker(HasTraits):
         self.worldpicker.pick((float(x), float(y), 0.0), self.renwin.renderer)
 
         # Use the cell picker to get the data that needs to be probed.
-        self.cellpicker.pick( (float(x), float(y), 0.0), self.renwin.renderer)
+        self._cell_pick(x, y)
 
         wp = self.worldpicker
         cp = self.cellpicker
@@ -407,6 +543,54 @@ class Picker(HasTraits):
         self.renwin.render()
         return picked_data
 
+    def update_locators(self):
+        """Attaches up to date cell locators for the pickable datasets
+        of the scene to the cell picker.  Locators are only rebuilt for
+        datasets modified since the last call.
+        """
+        self.locators.attach(self.cellpicker, self.renwin.renderer)
+
+    def select_area(self, x0, y0, x1, y1, field='points'):
+        """Selects all the points (or cells, if `field` is 'cells') of
+        the visible and pickable actors that lie inside the given
+        rectangle of the window.  Occluded points are selected too.
+        Cells are selected by their centers.
+
+        Returns a list of (actor, ids) tuples where `ids` is an array
+        of the selected ids of the actor's dataset.  Actors with no
+        selected ids are omitted.
+
+        Note that the origin of the window coordinates must be at the
+        left bottom corner of the window.
+        """
+        renderer = self.renwin.renderer
+        xmin, xmax = min(x0, x1), max(x0, x1)
+        ymin, ymax = min(y0, y1), max(y0, y1)
+        world_to_display = get_world_to_display_matrix(renderer)
+        result = []
+        for actor in renderer.actors:
+            if not (actor.visibility and actor.pickable):
+                continue
+            mapper = actor.mapper
+            if mapper is None or mapper.input is None:
+                continue
+            dataset = mapper.input
+            if field == 'cells':
+                points = self._get_cell_centers(dataset)
+            else:
+                points = get_points_array(dataset)
+            if len(points) == 0:
+                continue
+            matrix = numpy.dot(world_to_display, actor.matrix.to_array())
+            xyz = apply_homogeneous_matrix(matrix, points)
+            inside = (xyz[:, 0] >= xmin) & (xyz[:, 0] <= xmax) & \
+                     (xyz[:, 1] >= ymin) & (xyz[:, 1] <= ymax) & \
+                     (xyz[:, 2] >= 0.0) & (xyz[:, 2] <= 1.0)
+            ids = numpy.flatnonzero(inside)
+            if len(ids) > 0:
+                result.append((actor, ids))
+        return result
+
     def on_ui_close(self):
         """This method makes the picker actor invisible when the GUI
         dialog is closed."""
@@ -417,6 +601,68 @@ class Picker(HasTraits):
     #################################################################
     # Non-public interface.
     #################################################################
+    def _cell_pick(self, x, y):
+        """Picks with the cell picker, using the cached locators if
+        `use_locators` is on.
+        """
+        if self.use_locators:
+            self.update_locators()
+        try:
+            self.cellpicker.pick(float(x), float(y), 0.0,
+                                 self.renwin.renderer)
+        except TypeError:
+            # On old versions of VTK, the signature used to be different
+            self.cellpicker.pick((float(x), float(y), 0.0),
+                                 self.renwin.renderer)
+
+    def _pick_point_with_locators(self, x, y):
+        """Picks the point of the picked cell closest to the pick
+        position.  Returns a `PickedData` instance.
+        """
+        self._cell_pick(x, y)
+
+        cp = self.cellpicker
+        picked_data = PickedData()
+        coord = cp.pick_position
+        picked_data.coordinate = coord
+
+        if cp.cell_id > -1:
+            dataset = cp.mapper.input
+            cell = dataset.get_cell(cp.cell_id)
+            ids = numpy.array([cell.point_ids.get_id(i)
+                               for i in range(cell.number_of_points)])
+            points = numpy.array([dataset.get_point(i) for i in ids])
+            dist = ((points - numpy.asarray(coord))**2).sum(axis=1)
+
+            picked_data.valid = 1
+            picked_data.point_id = int(ids[dist.argmin()])
+            picked_data.data = dataset.point_data
+
+            self._update_actor(coord, dataset.bounds)
+        else:
+            self.p_actor.visibility = 0
+
+        self.renwin.render()
+        return picked_data
+
+    def _get_cell_centers(self, dataset):
+        """Returns the (cached) centers of the cells of the dataset."""
+        key = (dataset._vtk_obj.__this__, dataset.m_time)
+        cache = self._cell_centers
+        if key not in cache:
+            cc = tvtk.CellCenters(input=dataset)
+            cc.update()
+            cache.clear()
+            cache[key] = cc.output.points.to_array()
+        return cache[key]
+
+    def _use_locators_changed(self, value):
+        # This may be called before __init__ has created the pickers.
+        if not value and hasattr(self, 'locators'):
+            if hasattr(self.cellpicker, 'remove_all_locators'):
+                self.cellpicker.remove_all_locators()
+            self.locators.clear()
+
     def _tolerance_changed(self, val):
         """ Trait handler for the tolerance trait."""
         self.pointpicker.tolerance = val
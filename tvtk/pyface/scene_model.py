@@ -121,6 +121,12 @@ class SceneModel(TVTKScene):
 
         self.do_render = True
 
+    def flush_render(self):
+        """ Perform any pending coalesced render of the scene editor
+        right away."""
+        if self.scene_editor is not None:
+            self.scene_editor.flush_render()
+
     def add_actors(self, actors):
         """ Adds a single actor or a tuple or list of actors to the
         renderer."""
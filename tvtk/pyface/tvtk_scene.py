@@ -12,6 +12,7 @@ functionality. See the class docs for more details.
 
 
 import os.path
+import time
 
 from apptools.persistence import state_pickler
 from tvtk.api import tvtk
@@ -19,14 +20,29 @@ from tvtk import messenger
 from tvtk.tvtk_base import vtk_color_trait
 
 from traits.api import HasPrivateTraits, HasTraits, Any, Int, \
-     Property, Instance, Event, Range, Bool, Trait, Str
+     Property, Instance, Event, Range, Bool, Trait, Str, Float, Enum
+from traits.etsconfig.api import ETSConfig
 
 from tvtk.pyface import light_manager
+from tvtk.pyface.interaction_lod import InteractionLOD, LEVELS
 
 VTK_VER = tvtk.Version().vtk_version
 
 
 
+######################################################################
+# Utility functions.
+######################################################################
+def _camera_script(sid, state):
+    """Returns the code setting the camera of the scene `sid` to the
+    camera `state`.
+    """
+    lines = ['%s.camera.%s = %r'%(sid, key, value) for key, value in state]
+    lines.append('%s.camera.compute_view_plane_normal()'%sid)
+    lines.append('%s.render()'%sid)
+    return '\n'.join(lines)
+
+
 ######################################################################
 # `TVTKScene` class.
 ######################################################################
@@ -53,6 +69,11 @@ class TVTKScene(HasPrivateTraits):
 
     - One can disable rendering by setting `disable_render` to True.
 
+    - Render requests may be coalesced into at most one render per
+      iteration of the event loop (or per `render_interval`) by
+      setting `coalesce_renders` to True.  Scripts may force a pending
+      render with `flush_render`.
+
     """
 
     # The version of this class.  Used for persistence.
@@ -89,6 +110,41 @@ class TVTKScene(HasPrivateTraits):
     # Disable rendering.
     disable_render = Bool(False, desc='if rendering is to be disabled')
 
+    # Coalesce render requests.  When this is on, `render` only
+    # schedules a render and any number of requests made before it
+    # happens result in a single render.  The render happens on a later
+    # iteration of the GUI event loop or, when there is none, when
+    # `flush_render` is called.
+    coalesce_renders = Bool(False, desc='if render requests are coalesced')
+
+    # The minimum time in seconds between two coalesced renders.
+    render_interval = Float(0.0, desc='the minimum time between '\
+                            'coalesced renders')
+
+    # The number of renders requested via `render`.
+    render_requests = Int(0, record=False)
+
+    # The number of renders actually performed.
+    render_count = Int(0, record=False)
+
+    # The time in seconds taken by the last render.
+    last_render_time = Float(0.0, record=False)
+
+    # Level of detail of the large actors while the scene is rotated,
+    # panned or zoomed with the mouse.  With 'auto' the actors are
+    # simplified only as much as needed to render at
+    # `desired_frame_rate`.  The other values always use the given
+    # representation during the interaction.  Full detail is restored
+    # when the interaction ends.
+    interaction_lod = Enum('off', 'auto', 'decimated', 'points',
+                           'bounding_box',
+                           desc='the level of detail of large actors '\
+                           'while interacting')
+
+    # The frame rate aimed at by the 'auto' `interaction_lod`.
+    desired_frame_rate = Float(15.0, desc='the frames per second aimed '\
+                               'at while interacting')
+
     # Enable off-screen rendering.  This allows a user to render the
     # scene to an image without the need to have the window active.
     # For example, the application can be minimized and the saved
@@ -176,7 +232,6 @@ class TVTKScene(HasPrivateTraits):
     recorder = Instance(HasTraits, record=False, transient=True)
     # Cached last camera state.
     _last_camera_state = Any(transient=True)
-    _camera_observer_id = Int(transient=True)
     _script_id = Str(transient=True)
 
     # The renderer instance.
@@ -186,6 +241,15 @@ class TVTKScene(HasPrivateTraits):
     _camera = Instance(tvtk.Camera)
     _busy_count = Int(0)
 
+    # Is a coalesced render pending?
+    _render_pending = Bool(False)
+
+    # The time at which the last render was started.
+    _last_render_start = Float(0.0)
+
+    # The stand-ins of the actors used while interacting.
+    _lod = Instance(InteractionLOD, ())
+
     ###########################################################################
     # 'object' interface.
     ###########################################################################
@@ -200,6 +264,7 @@ class TVTKScene(HasPrivateTraits):
 
         self.control = self._create_control(parent)
         self._renwin.update_traits()
+        self._setup_interaction_observers()
 
     def __get_pure_state__(self):
         """Allows us to pickle the scene."""
@@ -208,8 +273,10 @@ class TVTKScene(HasPrivateTraits):
         d = self.__dict__.copy()
         for x in ['control', '_renwin', '_interactor', '_camera',
                   '_busy_count', '__sync_trait__', 'recorder',
-                  '_last_camera_state', '_camera_observer_id',
-                  '_script_id', '__traits_listener__']:
+                  '_last_camera_state', '_script_id',
+                  '__traits_listener__', 'render_requests',
+                  'render_count', 'last_render_time', '_render_pending',
+                  '_last_render_start', '_lod']:
             d.pop(x, None)
         # Additionally pickle these.
         d['camera'] = self.camera
@@ -231,9 +298,20 @@ class TVTKScene(HasPrivateTraits):
     ###########################################################################
     def render(self):
         """ Force the scene to be rendered. Nothing is done if the
-        `disable_render` trait is set to True."""
-        if not self.disable_render:
-            self._renwin.render()
+        `disable_render` trait is set to True.  If `coalesce_renders`
+        is set the render is only scheduled."""
+        self.render_requests += 1
+        if self.disable_render:
+            return
+        if self.coalesce_renders:
+            self._schedule_render()
+        else:
+            self._render()
+
+    def flush_render(self):
+        """ Perform any pending coalesced render right away."""
+        if self._render_pending:
+            self._render()
 
     def add_actors(self, actors):
         """ Adds a single actor or a tuple or list of actors to the
@@ -817,6 +895,46 @@ class TVTKScene(HasPrivateTraits):
         image."""
         return
 
+    def _do_render(self):
+        """Actually renders the scene.  Toolkit specific scenes
+        override this."""
+        self._renwin.render()
+
+    def _render(self):
+        """Renders the scene right away and updates the render
+        statistics."""
+        self._render_pending = False
+        if self.disable_render or self._renwin is None:
+            return
+        start = time.time()
+        self._last_render_start = start
+        self._do_render()
+        self.last_render_time = time.time() - start
+        self.render_count += 1
+
+    def _schedule_render(self):
+        """Schedules a render unless one is already pending."""
+        if self._render_pending:
+            return
+        self._render_pending = True
+        elapsed = time.time() - self._last_render_start
+        delay = max(0.0, self.render_interval - elapsed)
+        self._invoke_later(self._render_if_pending, delay)
+
+    def _render_if_pending(self):
+        """Performs the scheduled render unless `flush_render` already
+        did."""
+        if self._render_pending:
+            self._render()
+
+    def _invoke_later(self, callable, delay):
+        """Calls the callable after `delay` seconds from the GUI event
+        loop.  Without a GUI the call is left to `flush_render`."""
+        if ETSConfig.toolkit in ('null', ''):
+            return
+        from pyface.timer.api import do_after
+        do_after(max(1, int(delay*1000)), callable)
+
     def _exporter_write(self, ex):
         """Abstracts the exporter's write method."""
         # Bumps up the anti-aliasing frames when the image is saved so
@@ -828,7 +946,7 @@ class TVTKScene(HasPrivateTraits):
         ex.write()
         # Set the frames back to original setting.
         rw.aa_frames = aa_frames
-        rw.render()
+        self.render()
 
     def _update_view(self, x, y, z, vx, vy, vz):
         """Used internally to set the view."""
@@ -843,6 +961,10 @@ class TVTKScene(HasPrivateTraits):
         if not val and self._renwin is not None:
             self.render()
 
+    def _coalesce_renders_changed(self, val):
+        if not val:
+            self.flush_render()
+
     def _record_methods(self, calls):
         """A method to record a simple method called on self.  We need a
         more powerful and less intrusive way like decorators to do this.
@@ -864,10 +986,15 @@ class TVTKScene(HasPrivateTraits):
             if state != lcs:
                 self._last_camera_state = state
                 sid = self._script_id
-                for key, value in state:
-                    r.record('%s.camera.%s = %r'%(sid, key, value))
-                r.record('%s.camera.compute_view_plane_normal()'%sid)
-                r.record('%s.render()'%sid)
+                record_later = getattr(r, 'record_later', None)
+                if record_later is not None:
+                    # Only the last of consecutive camera moves is
+                    # written to the script.
+                    record_later((self, 'camera'), _camera_script, sid,
+                                 state)
+                else:
+                    for line in _camera_script(sid, state).split('\n'):
+                        r.record(line)
 
     def _get_camera_state(self):
         c = self.camera
@@ -883,22 +1010,81 @@ class TVTKScene(HasPrivateTraits):
         """When the recorder is set we add an event handler so we can
         record the change to the camera position after the interaction.
         """
-        iren = self._interactor
+        i_vtk = tvtk.to_vtk(self._interactor)
         if r is not None:
             self._script_id = r.get_script_id(self)
-            id = iren.add_observer('EndInteractionEvent',
-                                   messenger.send)
-            self._camera_observer_id = id
-            i_vtk = tvtk.to_vtk(iren)
             messenger.connect(i_vtk, 'EndInteractionEvent',
                               self._record_camera_position)
         else:
             self._script_id = ''
-            iren.remove_observer(self._camera_observer_id)
-            i_vtk = tvtk.to_vtk(iren)
             messenger.disconnect(i_vtk, 'EndInteractionEvent',
                                  self._record_camera_position)
 
+    def _setup_interaction_observers(self):
+        """Sends the interaction events of the interactor through the
+        messenger and handles them to set the level of detail."""
+        iren = self._interactor
+        i_vtk = tvtk.to_vtk(iren)
+        for event, handler in [('StartInteractionEvent',
+                                self._on_start_interaction),
+                               ('InteractionEvent', self._on_interaction),
+                               ('EndInteractionEvent',
+                                self._on_end_interaction)]:
+            iren.add_observer(event, messenger.send)
+            messenger.connect(i_vtk, event, handler)
+
+    def _on_start_interaction(self, vtk_obj=None, event=None):
+        """Replaces the large actors by simplified ones if needed."""
+        mode = self.interaction_lod
+        if mode == 'off':
+            return
+        if mode == 'auto':
+            renderer = self._renderer
+            if renderer.last_render_time_in_seconds*self.desired_frame_rate \
+                   <= 1.0:
+                return
+            mode = LEVELS[0]
+        self._lod.set_level(self._renderer, mode)
+
+    def _on_interaction(self, vtk_obj=None, event=None):
+        """Uses a coarser level of detail when rendering is still too
+        slow."""
+        lod = self._lod
+        if self.interaction_lod != 'auto' or lod.level is None:
+            return
+        index = LEVELS.index(lod.level)
+        frame_time = self._renderer.last_render_time_in_seconds
+        if index + 1 < len(LEVELS) and \
+               frame_time*self.desired_frame_rate > 1.5:
+            lod.set_level(self._renderer, LEVELS[index + 1])
+
+    def _on_end_interaction(self, vtk_obj=None, event=None):
+        """Restores the actors replaced during the interaction."""
+        lod = self._lod
+        if lod.level is not None:
+            # The interactor style renders the scene after this.
+            lod.restore(self._renderer)
+            self._invoke_later(self._update_lod, 0.5)
+
+    def _update_lod(self):
+        """Prepares the simplified actors ahead of the next
+        interaction."""
+        mode = self.interaction_lod
+        if mode == 'off' or self._lod.level is not None or \
+               self._renderer is None:
+            return
+        if mode == 'auto':
+            mode = LEVELS[0]
+        self._lod.update(self._renderer, mode)
+
+    def _interaction_lod_changed(self, mode):
+        if mode != 'off':
+            self._invoke_later(self._update_lod, 0.5)
+
+    def _actor_added_fired(self):
+        if self.interaction_lod != 'off':
+            self._invoke_later(self._update_lod, 0.5)
+
 ######################################################################
 # `TVTKScene` class.
 ######################################################################
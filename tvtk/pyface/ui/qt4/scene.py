@@ -410,12 +410,6 @@ class Scene(TVTKScene, Widget):
     ###########################################################################
     # 'Scene' interface.
     ###########################################################################
-    def render(self):
-        """ Force the scene to be rendered. Nothing is done if the
-        `disable_render` trait is set to True."""
-        if not self.disable_render:
-            self._vtk_control.Render()
-
     def get_size(self):
         """Return size of the render window."""
         sz = self._vtk_control.size()
@@ -449,6 +443,10 @@ class Scene(TVTKScene, Widget):
     ###########################################################################
     # Non-public interface.
     ###########################################################################
+    def _do_render(self):
+        """ Actually renders the scene."""
+        self._vtk_control.Render()
+
     def _create_control(self, parent):
         """ Create the toolkit-specific control that represents the widget. """
 
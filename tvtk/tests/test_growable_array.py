@@ -0,0 +1,56 @@
+"""
+Tests for growable_array.py.
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+import unittest
+import numpy
+
+from tvtk import array_handler
+from tvtk.growable_array import GrowableArray, GrowablePolyLine
+
+
+class TestGrowableArray(unittest.TestCase):
+    def test_extend(self):
+        """Test if appending grows the array and updates VTK."""
+        a = GrowableArray(3, float, capacity=2)
+        expect = numpy.arange(30, dtype=float).reshape(10, 3)
+        for row in expect[:7]:
+            a.append(row)
+        self.assertEqual(a.extend(expect[7:]), 7)
+        self.assertEqual(len(a), 10)
+        self.assertTrue(a.capacity >= 10)
+        self.assertTrue(numpy.all(a.to_array() == expect))
+
+        vtk_arr = a.vtk_array
+        self.assertEqual(vtk_arr.GetNumberOfTuples(), 10)
+        self.assertEqual(vtk_arr.GetTuple3(9), tuple(expect[9]))
+        # VTK sees the NumPy data without a copy.
+        arr = array_handler.vtk2array(vtk_arr)
+        self.assertTrue(numpy.all(arr == expect))
+        a.to_array()[0, 0] = -1
+        self.assertEqual(vtk_arr.GetTuple3(0)[0], -1)
+
+        a.clear()
+        self.assertEqual(vtk_arr.GetNumberOfTuples(), 0)
+
+    def test_poly_line(self):
+        """Test if the poly line follows the appended points."""
+        line = GrowablePolyLine()
+        pd = line.polydata
+        line.extend([[0, 0, 0]], [0])
+        self.assertEqual(pd.number_of_lines, 0)
+        for i in range(1, 50):
+            line.extend([[i, 0, 0]], [i])
+        self.assertEqual(pd.number_of_points, 50)
+        self.assertEqual(pd.number_of_lines, 1)
+        ids = pd.lines.to_array()
+        self.assertTrue(numpy.all(ids == numpy.r_[50, numpy.arange(50)]))
+        scalars = pd.point_data.scalars.to_array()
+        self.assertTrue(numpy.all(scalars == numpy.arange(50)))
+        self.assertRaises(ValueError, line.extend, [[0, 0, 0]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+"""Tests for the levels of detail used while interacting with a scene."""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+import unittest
+
+from tvtk.api import tvtk
+from tvtk.pyface.interaction_lod import InteractionLOD, LEVELS, make_lod
+
+
+class TestInteractionLOD(unittest.TestCase):
+
+    def setUp(self):
+        src = tvtk.SphereSource(theta_resolution=300, phi_resolution=300)
+        elev = tvtk.ElevationFilter(input=src.output)
+        elev.update()
+        self.data = elev.output
+        self.actor = tvtk.Actor(mapper=tvtk.PolyDataMapper(input=self.data))
+        self.small = tvtk.Actor(mapper=tvtk.PolyDataMapper(
+            input=tvtk.SphereSource().output))
+        self.renderer = tvtk.Renderer()
+        self.renderer.add_actor(self.actor)
+        self.renderer.add_actor(self.small)
+
+    def test_make_lod(self):
+        "Test if the simplified data is much smaller"
+        n = self.data.number_of_cells
+        for level in LEVELS:
+            lod = make_lod(self.data, level, 5000)
+            self.assertTrue(0 < lod.number_of_cells < n/10)
+        lod = make_lod(self.data, 'decimated', 5000)
+        self.assertTrue(lod.cell_data.scalars is not None)
+        self.assertRaises(ValueError, make_lod, self.data, 'cube', 5000)
+
+    def test_set_level(self):
+        "Test if the large actors are swapped and restored"
+        lod = InteractionLOD(min_cells=10000, n_cells=5000)
+        renderer = self.renderer
+        lod.set_level(renderer, 'points')
+        actors = list(renderer.actors)
+        self.assertEqual(len(actors), 2)
+        self.assertFalse(self.actor in actors)
+        self.assertTrue(self.small in actors)
+        stand_in = [a for a in actors if a != self.small][0]
+        self.assertTrue(stand_in.property is self.actor.property)
+        self.assertEqual(lod.level, 'points')
+
+        lod.restore(renderer)
+        actors = list(renderer.actors)
+        self.assertEqual(len(actors), 2)
+        self.assertTrue(self.actor in actors)
+        self.assertEqual(lod.level, None)
+
+    def test_cache(self):
+        "Test if the simplified data is reused until the data changes"
+        lod = InteractionLOD(min_cells=10000, n_cells=5000)
+        lod.update(self.renderer, 'decimated')
+        first = lod._get_lod(self.actor, 'decimated')
+        self.assertTrue(lod._get_lod(self.actor, 'decimated') is first)
+        self.data.modified()
+        self.assertFalse(lod._get_lod(self.actor, 'decimated') is first)
+
+
+if __name__ == '__main__':
+    unittest.main()
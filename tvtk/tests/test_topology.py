@@ -0,0 +1,70 @@
+"""
+Tests for topology.py.
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+import unittest
+import numpy
+
+from tvtk import topology
+
+
+class TestTopology(unittest.TestCase):
+    def setUp(self):
+        topology.clear_cache()
+
+    def test_grid_triangles(self):
+        """Test if the triangles of a grid are cached on its shape."""
+        t = topology.grid_triangles(3, 4)
+        self.assertEqual(t.shape, (12, 3))
+        self.assertEqual(t.max(), 11)
+        self.assertTrue(t is topology.grid_triangles(3, 4))
+        self.assertFalse(t.flags.writeable)
+        self.assertFalse(t is topology.grid_triangles(4, 3))
+
+    def test_triangle_cells(self):
+        """Test if cell arrays are cached on the triangles."""
+        t = numpy.array([[0, 1, 2], [1, 2, 3]])
+        cells, min_id, max_id = topology.get_triangle_cells(t)
+        self.assertEqual((min_id, max_id), (0, 3))
+        self.assertEqual(cells.number_of_cells, 2)
+        ids = cells.to_array()
+        self.assertTrue(numpy.all(ids == [3, 0, 1, 2, 3, 1, 2, 3]))
+        # Equal triangles share the cell array.
+        self.assertTrue(topology.get_triangle_cells(t.copy())[0] is cells)
+        t[1, 2] = 0
+        self.assertFalse(topology.get_triangle_cells(t)[0] is cells)
+
+        g = topology.grid_triangles(5, 5)
+        cells = topology.get_triangle_cells(g)[0]
+        self.assertTrue(topology.get_triangle_cells(g)[0] is cells)
+
+    def test_identity(self):
+        """Test if only read-only arrays are recognized by identity."""
+        hashed = []
+        md5 = topology.hashlib.md5
+        def counting_md5(data):
+            hashed.append(data)
+            return md5(data)
+        topology.hashlib.md5 = counting_md5
+        try:
+            t = numpy.array([[0, 1, 2], [1, 2, 3]], 'i4')
+            t.flags.writeable = False
+            cells = topology.get_triangle_cells(t)[0]
+            self.assertTrue(topology.get_triangle_cells(t)[0] is cells)
+            self.assertEqual(len(hashed), 1)
+            # A writable array changed in place gives new cells.
+            t = numpy.array([[0, 1, 2], [1, 2, 3]], 'i4')
+            self.assertTrue(topology.get_triangle_cells(t)[0] is cells)
+            t[1, 2] = 0
+            cells = topology.get_triangle_cells(t)[0]
+            ids = cells.to_array()
+            self.assertTrue(numpy.all(ids == [3, 0, 1, 2, 3, 1, 2, 0]))
+            self.assertEqual(len(hashed), 3)
+        finally:
+            topology.hashlib.md5 = md5
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""Tests for the render coalescing of the TVTKScene."""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+import unittest
+
+from traits.etsconfig.api import ETSConfig
+from tvtk.pyface.tvtk_scene import TVTKScene
+
+
+class CountingScene(TVTKScene):
+    """A scene keeping the calls scheduled with `_invoke_later` instead
+    of running them from an event loop."""
+    def __init__(self, **traits):
+        self.scheduled = []
+        super(CountingScene, self).__init__(**traits)
+
+    def _invoke_later(self, callable, delay):
+        self.scheduled.append(callable)
+
+
+class TestTVTKScene(unittest.TestCase):
+
+    def setUp(self):
+        self.scene = CountingScene(off_screen_rendering=True)
+        self.count = self.scene.render_count
+
+    def tearDown(self):
+        self.scene.close()
+
+    def renders(self):
+        return self.scene.render_count - self.count
+
+    def test_render(self):
+        "Test if renders happen right away when not coalescing"
+        scene = self.scene
+        requests = scene.render_requests
+        scene.render()
+        scene.render()
+        self.assertEqual(self.renders(), 2)
+        self.assertEqual(scene.render_requests - requests, 2)
+        self.assertTrue(scene.last_render_time >= 0.0)
+
+    def test_coalesce(self):
+        "Test if coalesced requests result in a single render"
+        scene = self.scene
+        scene.coalesce_renders = True
+        requests = scene.render_requests
+        for i in range(5):
+            scene.render()
+        self.assertEqual(scene.render_requests - requests, 5)
+        self.assertEqual(self.renders(), 0)
+        self.assertEqual(len(scene.scheduled), 1)
+        scene.scheduled.pop()()
+        self.assertEqual(self.renders(), 1)
+
+    def test_flush_render(self):
+        "Test if a flushed render is not done again by the timer"
+        scene = self.scene
+        scene.coalesce_renders = True
+        scene.render()
+        scene.flush_render()
+        self.assertEqual(self.renders(), 1)
+        # Nothing is pending any more.
+        scene.flush_render()
+        self.assertEqual(self.renders(), 1)
+        scene.scheduled.pop()()
+        self.assertEqual(self.renders(), 1)
+        # Turning coalescing off flushes a pending render.
+        scene.render()
+        scene.coalesce_renders = False
+        self.assertEqual(self.renders(), 2)
+
+    def test_null_toolkit(self):
+        "Test if renders are left to flush_render without an event loop"
+        orig_tk = ETSConfig.toolkit
+        ETSConfig._toolkit = 'null'
+        try:
+            scene = TVTKScene(off_screen_rendering=True,
+                              coalesce_renders=True)
+            count = scene.render_count
+            scene.render()
+            scene.render()
+            self.assertEqual(scene.render_count, count)
+            scene.flush_render()
+            self.assertEqual(scene.render_count, count + 1)
+            scene.close()
+        finally:
+            ETSConfig._toolkit = orig_tk
+
+
+if __name__ == '__main__':
+    unittest.main()
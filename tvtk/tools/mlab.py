@@ -101,6 +101,7 @@ from pyface.api import GUI
 
 from tvtk.api import tvtk
 from tvtk.tvtk_base import TVTKBase, vtk_color_trait
+from tvtk.topology import grid_triangles, get_triangle_cells
 
 from tvtk.tools import ivtk
 
@@ -277,13 +278,12 @@ def make_surf_actor(x, y, z, warp=1, scale=[1.0, 1.0, 1.0],
 
 
 def make_triangle_polydata(triangles, points, scalars=None):
-    t = numpy.asarray(triangles, 'l')
-    assert t.shape[1] == 3, "The list of polygons must be Nx3."
+    cells = get_triangle_cells(triangles)[0]
 
     if scalars is not None:
         assert len(points) == len(numpy.ravel(scalars))
 
-    pd = tvtk.PolyData(points=points, polys=t)
+    pd = tvtk.PolyData(points=points, polys=cells)
     if scalars is not None:
         pd.point_data.scalars = numpy.ravel(scalars)
         pd.point_data.scalars.name = 'scalars'
@@ -314,14 +314,8 @@ def make_triangles_points(x, y, z, scalars=None):
     assert y.shape == z.shape, "Arrays y and z must have same shape."
 
     nx, ny = x.shape
-    i, j = numpy.mgrid[0:nx-1,0:ny-1]
-    i, j = numpy.ravel(i), numpy.ravel(j)
-    t1 = i*ny+j, (i+1)*ny+j, (i+1)*ny+(j+1)
-    t2 = (i+1)*ny+(j+1), i*ny+(j+1), i*ny+j
-    nt = len(t1[0])
-    triangles = numpy.zeros((nt*2, 3), 'l')
-    triangles[0:nt,0], triangles[0:nt,1], triangles[0:nt,2] = t1
-    triangles[nt:,0], triangles[nt:,1], triangles[nt:,2] = t2
+    # The cached triangles are shared and read-only.
+    triangles = grid_triangles(nx, ny).copy()
 
     points = numpy.zeros((nx, ny, 3), 'd')
     points[:,:,0], points[:,:,1], points[:,:,2] = x, y, z
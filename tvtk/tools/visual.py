@@ -66,6 +66,7 @@ from tvtk.tools import ivtk
 from pyface.api import GUI
 from pyface.timer.api import Timer
 from tvtk.tvtk_base import TVTKBase, vtk_color_trait
+from tvtk.growable_array import GrowablePolyLine
 
 
 
@@ -558,6 +559,9 @@ class Curve(HasTraits):
 
     viewer = Any
 
+    # The growable buffers holding the points and the poly line.
+    _line = Instance(GrowablePolyLine)
+
     ######################################################################
     # User interface view
 
@@ -575,6 +579,7 @@ class Curve(HasTraits):
 
     def __init__(self, **traits):
         self.property = self.actor.property
+        self._line = GrowablePolyLine(self.polydata)
 
         HasTraits.__init__(self, **traits)
 
@@ -609,14 +614,12 @@ class Curve(HasTraits):
         self.extend([pnt])
 
     def extend(self, pts):
-        if self.points is None:
-            p = pts
-        else:
-            n = self.points.shape[0]
-            p = numpy.resize(self.points, (n+len(pts), 3))
-            p[:n] = self.points
-            p[n:] = pts
-        self.points = p
+        """Appends the given points to the curve.  The points are
+        stored in buffers that grow geometrically, so appending takes
+        amortized constant time per point."""
+        line = self._line
+        line.extend(pts)
+        self.set(points = line.points.to_array(), trait_change_notify = False)
         self.update()
 
     def update(self):
@@ -630,10 +633,8 @@ class Curve(HasTraits):
         the actor, by default it is set to the global origin"""
         p, pi, ax = rotate(axis, angle, origin, self.pos, self.points, numpy.array([0.0, 0.0, 0.0]))
         self.set(pos = p, trait_change_notify = False)
-        self.set(points = pi, trait_change_notify = False)
+        self._set_points(pi)
         self.set(axis = ax, trait_change_notify = False)
-        self.polydata.points = self.points
-        self.polydata.modified()
         self.render()
 
     def render(self):
@@ -644,17 +645,19 @@ class Curve(HasTraits):
 
     ######################################################################
     # Non-public methods, Event handlers
-    def _points_changed(self, value):
-        self.polydata.points = value
-        if value is None:
-            np = 0
-            lines = None
+    def _set_points(self, points):
+        """Copies the points into the buffers of the curve without
+        firing a trait change."""
+        line = self._line
+        if points is None:
+            line.clear()
         else:
-            np = len(self.points) - 1
-            lines = numpy.zeros((np, 2), 'l')
-            lines[:,0] = numpy.arange(0, np-0.5, 1, 'l')
-            lines[:,1] = numpy.arange(1, np+0.5, 1, 'l')
-        self.polydata.lines = lines
+            line.set(points)
+            points = line.points.to_array()
+        self.set(points = points, trait_change_notify = False)
+
+    def _points_changed(self, value):
+        self._set_points(value)
         v = self.viewer
         if v is not None:
             v.scene.render()
@@ -676,15 +679,11 @@ class Curve(HasTraits):
         self.set(y = new[1], trait_change_notify = False)
         self.set(z = new[2], trait_change_notify = False)
         p = translate(old, new, self.points)
-        self.set(points = p, trait_change_notify = False)
-        self.polydata.points = self.points
-        self.polydata.modified()
+        self._set_points(p)
         self.render()
 
     def _axis_changed(self, old, new):
-        self.points = axis_changed(old, new, self.pos, self.points)
-        self.polydata.points = self.points
-        self.polydata.modified()
+        self._set_points(axis_changed(old, new, self.pos, self.points))
         self.render()
 
     def _color_changed(self, value):
@@ -0,0 +1,143 @@
+"""
+Caches of the connectivity of triangle meshes.
+
+Animating a mesh usually changes its points and scalars every frame
+while its triangles stay the same.  The functions in this module cache
+the triangles of structured grids, keyed on the shape of the grid, and
+the `tvtk.CellArray` made from a triangles array, keyed on its
+contents (or on the identity of read-only arrays).  A mesh whose topology does not change is then only converted
+once and the cost of a frame is proportional to the point data.
+
+"""
+# Copyright (c) 2012, Enthought, Inc.
+# License: BSD Style.
+
+import hashlib
+import weakref
+from collections import OrderedDict
+
+import numpy
+
+from tvtk.api import tvtk
+from tvtk.array_handler import ID_TYPE_CODE
+
+# The maximum number of topologies of each kind that are cached.
+CACHE_SIZE = 8
+
+# The triangles of structured grids, keyed on the shape of the grid.
+_grid_triangles = OrderedDict()
+
+# The read-only triangles arrays recently seen, keyed on their id.
+# Writable arrays may be modified in place so they are always hashed.
+# The values
+# are (reference to the array, address of its data, shape, key) tuples
+# where `key` is the key of the triangles in `_cell_arrays`.
+_known_arrays = OrderedDict()
+
+# The cell arrays and the range of the point indices of triangles,
+# keyed on the contents of the triangles.
+_cell_arrays = OrderedDict()
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def _cache_get(cache, key):
+    """Returns the value cached for `key` (or None) and marks it as the
+    most recently used one.
+    """
+    value = cache.pop(key, None)
+    if value is not None:
+        cache[key] = value
+    return value
+
+def _cache_set(cache, key, value):
+    """Caches `value` for `key`, discarding the least recently used
+    value if the cache is full.
+    """
+    cache[key] = value
+    while len(cache) > CACHE_SIZE:
+        cache.popitem(last=False)
+
+def _get_known_key(triangles):
+    """Returns the cache key of the triangles array if it is read-only
+    and was seen recently, or None.
+    """
+    if not isinstance(triangles, numpy.ndarray) or \
+       triangles.flags.writeable:
+        return None
+    value = _cache_get(_known_arrays, id(triangles))
+    if value is None:
+        return None
+    ref, address, shape, key = value
+    if ref() is not triangles or address != triangles.ctypes.data or \
+       shape != triangles.shape:
+        return None
+    return key
+
+def _set_known_key(triangles, key):
+    """Remembers the cache key of the triangles array if it is
+    read-only.
+    """
+    if isinstance(triangles, numpy.ndarray) and \
+       not triangles.flags.writeable:
+        value = (weakref.ref(triangles), triangles.ctypes.data,
+                 triangles.shape, key)
+        _cache_set(_known_arrays, id(triangles), value)
+
+def clear_cache():
+    """Discards all the cached topologies."""
+    _grid_triangles.clear()
+    _known_arrays.clear()
+    _cell_arrays.clear()
+
+def grid_triangles(nx, ny):
+    """Returns the triangles of a structured grid of `nx` by `ny` points
+    numbered along the last axis first, as an (N, 3) array.  The array
+    is cached and read-only.
+    """
+    value = _cache_get(_grid_triangles, (nx, ny))
+    if value is not None:
+        return value
+
+    i, j = numpy.mgrid[0:nx-1,0:ny-1]
+    i, j = numpy.ravel(i), numpy.ravel(j)
+    t1 = i*ny+j, (i+1)*ny+j, (i+1)*ny+(j+1)
+    t2 = (i+1)*ny+(j+1), i*ny+(j+1), i*ny+j
+    nt = len(t1[0])
+    triangles = numpy.zeros((nt*2, 3), ID_TYPE_CODE)
+    triangles[0:nt,0], triangles[0:nt,1], triangles[0:nt,2] = t1
+    triangles[nt:,0], triangles[nt:,1], triangles[nt:,2] = t2
+    triangles.flags.writeable = False
+    _set_known_key(triangles, ('grid', nx, ny))
+    _cache_set(_grid_triangles, (nx, ny), triangles)
+    return triangles
+
+def get_triangle_cells(triangles):
+    """Returns a `tvtk.CellArray` of the given (N, 3) triangles along
+    with the smallest and the largest point index used, as a tuple.
+
+    The cell arrays are cached on the contents of the triangles, so the
+    triangles of a mesh whose topology does not change are only
+    converted once.  Read-only arrays, such as those returned by
+    `grid_triangles`, are recognized by their identity and not hashed
+    again.  The returned cell array is shared and must not be
+    modified.
+    """
+    key = _get_known_key(triangles)
+    t = numpy.ascontiguousarray(triangles, ID_TYPE_CODE)
+    assert t.ndim == 2 and t.shape[1] == 3, \
+           "The shape of the triangles array must be (X, 3)"
+    if key is None:
+        key = (t.shape, hashlib.md5(t).hexdigest())
+        _set_known_key(triangles, key)
+    value = _cache_get(_cell_arrays, key)
+    if value is None:
+        cells = tvtk.CellArray()
+        cells.from_array(t)
+        if t.size > 0:
+            value = (cells, t.min(), t.max())
+        else:
+            value = (cells, 0, -1)
+        _cache_set(_cell_arrays, key, value)
+    return value